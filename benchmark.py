@@ -0,0 +1,349 @@
+"""
+Import time, memory, call and structure creation benchmark of the generated wrappers.
+
+Every measure runs in a new python process, with a stub `libvulkan.so.1` built with the
+C compiler (or the library directory given with `--library`). The results are written as JSON.
+
+    python benchmark.py vk.py
+    python benchmark.py --generate default lazy compact package --xml vk.xml
+"""
+
+import os
+import sys
+import gc
+import json
+import marshal
+import time
+import types
+import shutil
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+import importlib
+
+# Stub of the vulkan loader. Every proc address is a function that does nothing and returns 0 (VK_SUCCESS).
+STUB_SOURCE = r"""
+#include <stdint.h>
+#include <string.h>
+
+static int32_t noop(void) { return 0; }
+
+int32_t vkEnumerateInstanceVersion(uint32_t* version) { *version = (1 << 22) | (1 << 12); return 0; }
+
+void* vkGetDeviceProcAddr(void* device, const char* name) { return (void*)noop; }
+
+void* vkGetInstanceProcAddr(void* instance, const char* name) {
+    return strcmp(name, "vkGetDeviceProcAddr") == 0 ? (void*)vkGetDeviceProcAddr : (void*)noop;
+}
+"""
+
+# Number of calls of each command measured by the `calls` measure, and the number of times it is measured
+CALLS = 100000
+CALL_ROUNDS = 5
+
+# Structures created by the `structs` measure, and the fields set with the constructors and the factories
+STRUCT_FIELDS = {
+    'CommandBufferBeginInfo': {'flags': 1},
+    'SubmitInfo': {'command_buffer_count': 1, 'signal_semaphore_count': 1},
+    'RenderPassBeginInfo': {'clear_value_count': 2},
+    'GraphicsPipelineCreateInfo': {'stage_count': 2, 'subpass': 1},
+}
+
+# Phase of the section comments of the generated wrappers. Everything before the first
+# section of this table is the `base` phase.
+SECTION_PHASES = {
+    "# API constants": 'constants',
+    "# Handles types": 'constants',
+    "# Flags types": 'constants',
+    "# Enums": 'constants',
+    "# Base types": 'constants',
+    "# Allocation callback": 'structs',
+    "# Structures": 'structs',
+    "# Function prototypes": 'prototypes',
+    "# Function families": 'prototypes',
+    "# Dispatch tables": 'prototypes',
+    "# Function requirements": 'prototypes',
+    "# Definitions": 'definitions',
+    "# Extension modules": 'definitions',
+    "# Loading proc": 'loader',
+}
+
+def build_stub(directory):
+    "Build the stub loader in `directory` and return the directory"
+    source = os.path.join(directory, 'stub.c')
+    with open(source, 'w') as outfile:
+        outfile.write(STUB_SOURCE)
+
+    compiler = os.environ.get('CC', 'cc')
+    subprocess.check_call([compiler, '-shared', '-fPIC', '-o', os.path.join(directory, 'libvulkan.so.1'), source])
+    return directory
+
+def module_source(path):
+    "Return the import name, the import directory and the source path of a wrapper module or package"
+    path = os.path.abspath(path)
+    if os.path.isdir(path):
+        return os.path.basename(path), os.path.dirname(path), os.path.join(path, '__init__.py')
+    return os.path.splitext(os.path.basename(path))[0], os.path.dirname(path), path
+
+def split_phases(source):
+    "Split the source of a wrapper in [(phase, source)], following the section comments"
+    phases = [['base', []]]
+    for line in source.splitlines(True):
+        phase = SECTION_PHASES.get(line.rstrip())
+        # The "# Base types" section of the BASE template is part of the base phase
+        if phase == 'constants' and phases[-1][0] == 'base' and line.startswith("# Base types"):
+            phase = None
+        if phase is not None and phase != phases[-1][0]:
+            phases.append([phase, []])
+        phases[-1][1].append(line)
+    return [(phase, ''.join(lines)) for phase, lines in phases]
+
+def count_objects(module):
+    "Count the definitions of a wrapper. The lazy definitions that were not built yet are not counted."
+    from ctypes import Structure, Union, _CFuncPtr
+    values = list(vars(module).values())
+    structs = [v for v in values if isinstance(v, type) and issubclass(v, (Structure, Union))]
+    prototypes = [v for v in values if isinstance(v, type) and issubclass(v, _CFuncPtr)]
+    return {
+        'attributes': len(values),
+        'structs': len(structs),
+        'prototypes': len(prototypes),
+        'prototype_classes': len(set(map(id, prototypes))),
+    }
+
+def run_import(path):
+    "Child measure: wall time of the import, then wall time of the first access of every name"
+    name, directory, _ = module_source(path)
+    sys.path.insert(0, directory)
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    import_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for attribute in dir(module):
+        getattr(module, attribute)
+    access_time = time.perf_counter() - start
+    return {'import': import_time, 'full_access': access_time}
+
+def create_module(path):
+    "Create the empty module of a wrapper, to execute its code phase by phase. Return the module and its source phases."
+    name, directory, source_path = module_source(path)
+    with open(source_path) as infile:
+        source = infile.read()
+
+    sys.path.insert(0, directory)
+    module = types.ModuleType(name)
+    module.__file__ = source_path
+    if source_path.endswith('__init__.py'):
+        module.__path__ = [os.path.dirname(source_path)]
+        module.__package__ = name
+    sys.modules[name] = module
+    return module, split_phases(source)
+
+def run_phases(path):
+    "Child measure: wall time of the compilation and of each phase of the module code"
+    module, phases = create_module(path)
+    result = {'compile': 0.0}
+    for phase, source in phases:
+        start = time.perf_counter()
+        code = compile(source, module.__file__, 'exec')
+        result['compile'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        exec(code, module.__dict__)
+        result[phase] = result.get(phase, 0.0) + time.perf_counter() - start
+    return result
+
+def run_memory(path):
+    "Child measure: peak and retained memory of the import (from the bytecode cache) and the object counts"
+    name, directory, _ = module_source(path)
+    sys.path.insert(0, directory)
+    gc.collect()
+    objects = len(gc.get_objects())
+
+    tracemalloc.start()
+    module = importlib.import_module(name)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    objects = len(gc.get_objects()) - objects
+    counts = count_objects(module)
+    counts['gc_objects'] = objects
+    return {'peak': peak, 'retained': retained, 'objects': counts}
+
+def run_phase_memory(path):
+    "Child measure: retained memory of each phase of the module code"
+    module, phases = create_module(path)
+    # Like an import from the bytecode cache, the code of a phase is loaded from its bytecode, then released after it ran.
+    # The phases are separate code objects, so their sum is not the retained memory of the import.
+    phases = [(phase, marshal.dumps(compile(source, module.__file__, 'exec'))) for phase, source in phases]
+    gc.collect()
+
+    retained_phases = {}
+    tracemalloc.start()
+    for phase, bytecode in phases:
+        before = tracemalloc.get_traced_memory()[0]
+        code = marshal.loads(bytecode)
+        exec(code, module.__dict__)
+        del code
+        retained_phases[phase] = retained_phases.get(phase, 0) + tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return {'retained_phases': retained_phases}
+
+def call_arguments(module, unchecked):
+    "Arguments of the commands measured by `run_calls`. The 64-bit values are converted once for the unchecked functions, which would wrap the python ints on each call."
+    from ctypes import c_uint8, c_uint64
+    command_buffer = 0x7f0000001000
+    layout = 0x1234
+    if unchecked:
+        command_buffer, layout = module.CommandBuffer(command_buffer), c_uint64(layout)
+    descriptor_sets = (c_uint64 * 2)(1, 2)
+    constants = (c_uint8 * 16)()
+    return {
+        'CmdDraw': (command_buffer, 3, 1, 0, 0),
+        'CmdBindDescriptorSets': (command_buffer, 0, layout, 0, 2, descriptor_sets, 0, None),
+        'CmdPushConstants': (command_buffer, layout, 1, 0, 16, constants),
+    }
+
+def run_calls(path):
+    "Child measure: calls per second of a few recording commands, with the checked and the unchecked dispatch tables"
+    name, directory, _ = module_source(path)
+    sys.path.insert(0, directory)
+    module = importlib.import_module(name)
+    result = {}
+    if not hasattr(module, 'UncheckedDeviceDispatch'):
+        return result
+
+    for table_name in ('DeviceDispatch', 'UncheckedDeviceDispatch'):
+        table = module.device_dispatch(module.Instance(0), module.Device(0), dispatch_class=getattr(module, table_name))
+        for command, arguments in call_arguments(module, table_name.startswith('Unchecked')).items():
+            fn = getattr(table, command, None)
+            if fn is None:
+                continue
+            best = None
+            for _ in range(CALL_ROUNDS):
+                start = time.perf_counter()
+                for _ in range(CALLS):
+                    fn(*arguments)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            result.setdefault(command, {})['unchecked' if table_name.startswith('Unchecked') else 'checked'] = round(CALLS / best)
+    return result
+
+def run_structs(path):
+    "Child measure: structures created per second with the constructors and with the factories of `struct_factory`"
+    name, directory, _ = module_source(path)
+    sys.path.insert(0, directory)
+    module = importlib.import_module(name)
+    result = {}
+    if not hasattr(module, 'struct_factory'):
+        return result
+
+    for struct_name, fields in STRUCT_FIELDS.items():
+        struct = getattr(module, struct_name, None)
+        if struct is None:
+            continue
+        factory = module.struct_factory(struct)
+        # The constructors set the `type` that the factories fill in
+        constructor_fields = dict(fields, type=factory().type)
+        for kind, fn, kwargs in (('constructor', struct, constructor_fields), ('factory', factory, fields)):
+            # The fields are written in the call, like in the code using the wrappers. Unpacking a dict is slower.
+            loop = "for _ in range({}):\n    fn({})".format(CALLS, ', '.join('{}={!r}'.format(*item) for item in kwargs.items()))
+            loop = compile(loop, '<structs>', 'exec')
+            best = None
+            for _ in range(CALL_ROUNDS):
+                start = time.perf_counter()
+                exec(loop, {'fn': fn})
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            result.setdefault(struct_name, {})[kind] = round(CALLS / best)
+    return result
+
+CHILD_MEASURES = {'import': run_import, 'phases': run_phases, 'memory': run_memory, 'phase_memory': run_phase_memory, 'calls': run_calls, 'structs': run_structs}
+
+def run_child(measure, path, env):
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', measure, path], env=env)
+    return json.loads(output.decode())
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def summary(samples):
+    "Min and median in milliseconds of every key of the samples"
+    return {key: {'min': round(min(s[key] for s in samples) * 1000, 3), 'median': round(median([s[key] for s in samples]) * 1000, 3)} for key in samples[0]}
+
+def benchmark(path, repeats, env):
+    # A first import writes the bytecode cache, like any real use of the wrapper
+    run_child('import', path, env)
+
+    _, _, source_path = module_source(path)
+    memory = run_child('memory', path, env)
+    memory.update(run_child('phase_memory', path, env))
+    return {
+        'module': path,
+        'source_bytes': os.path.getsize(source_path),
+        'import_ms': summary([run_child('import', path, env) for _ in range(repeats)]),
+        'phases_ms': summary([run_child('phases', path, env) for _ in range(repeats)]),
+        'memory': memory,
+        'calls_per_second': run_child('calls', path, env),
+        'structs_per_second': run_child('structs', path, env),
+    }
+
+def generate(variants, output_dir, generator_args):
+    "Generate one wrapper per variant. A variant is `default` or generator options joined by `+` (ex: `package+lazy`)"
+    generator = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'create_vulkan_wrapper.py')
+    paths = []
+    for variant in variants:
+        options = [] if variant == 'default' else ['--' + option for option in variant.split('+')]
+        path = os.path.join(output_dir, variant.replace('+', '_'), 'vk' if '--package' in options else 'vk.py')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        subprocess.check_call([sys.executable, generator, '--no-cache', '-o', path] + options + generator_args)
+        paths.append(path)
+    return paths
+
+parser = argparse.ArgumentParser(description="Measure the import time and the memory usage of generated vulkan wrappers, as JSON.")
+parser.add_argument('modules', nargs='*', help="Generated wrapper modules or packages (default: vk.py)")
+parser.add_argument('--generate', nargs='+', metavar='VARIANT', help="Generate and measure wrappers. VARIANT is `default` or generator options joined by `+` (ex: `package+lazy`)")
+parser.add_argument('--xml', metavar='PATH', help="Generate the wrappers from this vk.xml registry (see create_vulkan_wrapper.py)")
+parser.add_argument('--library', metavar='DIR', help="Directory of the libvulkan.so.1 to load instead of building the stub")
+parser.add_argument('-n', '--repeats', type=int, default=10, help="Number of processes measuring the import time (default: 10)")
+parser.add_argument('-o', '--output', help="Path of the JSON report (default: standard output)")
+parser.add_argument('--child', nargs=2, metavar=('MEASURE', 'MODULE'), help=argparse.SUPPRESS)
+args = parser.parse_args()
+
+if args.child is not None:
+    measure, path = args.child
+    print(json.dumps(CHILD_MEASURES[measure](path)))
+    sys.exit(0)
+
+work_dir = tempfile.mkdtemp(prefix='vk_benchmark_')
+try:
+    library = args.library or build_stub(work_dir)
+    env = dict(os.environ, LD_LIBRARY_PATH=os.pathsep.join(filter(None, [library, os.environ.get('LD_LIBRARY_PATH')])))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    modules = list(args.modules)
+    if args.generate:
+        modules += generate(args.generate, work_dir, ['--xml', args.xml] if args.xml else [])
+    if not modules:
+        modules = ['vk.py']
+
+    # Not imported by the measuring processes, where it would hide the import time of the wrappers that use it
+    import platform
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': args.repeats,
+        'results': [benchmark(path, args.repeats, env) for path in modules],
+    }
+finally:
+    shutil.rmtree(work_dir)
+
+if args.output:
+    with open(args.output, 'w') as outfile:
+        json.dump(report, outfile, indent=2)
+else:
+    print(json.dumps(report, indent=2))
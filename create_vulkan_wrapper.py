@@ -1,18 +1,23 @@
 import re
 import os
-sdk_path = os.environ["VULKAN_SDK"]
+import argparse
+import hashlib
+import pickle
+from functools import lru_cache
+from xml.etree import ElementTree
 
-def read(path):
-    with open(os.path.join(sdk_path, path), 'r') as infile:
-        return infile.read()
+def read_headers(sdk_path):
+    def read(path):
+        with open(os.path.join(sdk_path, path), 'r') as infile:
+            return infile.read()
 
-src = read("include/vulkan/vulkan_core.h")
+    src = read("include/vulkan/vulkan_core.h")
 
-src_win32 = read("include/vulkan/vulkan_win32.h")
+    src_win32 = read("include/vulkan/vulkan_win32.h")
 
-src_xcb = read("include/vulkan/vulkan_xcb.h")
+    src_xcb = read("include/vulkan/vulkan_xcb.h")
 
-src += "\n\n" + src_win32 + "\n\n" + src_xcb
+    return src + "\n\n" + src_win32 + "\n\n" + src_xcb
 
 
 BASE = r"""
@@ -20,8 +25,8 @@ BASE = r"""
 # Vulkan wrapper generated from Vulkan headers in the installed Vulkan SDK.
 #
 
-from ctypes import c_int8, c_uint16, c_int32, c_uint32, c_uint64, c_size_t, c_float, c_char, c_char_p, c_void_p, POINTER, Structure, Union, cast
-from platform import system
+from ctypes import c_int8, c_uint16, c_int32, c_uint32, c_int64, c_uint64, c_size_t, c_float, c_double, c_char, c_char_p, c_void_p, POINTER, Structure, Union, cast, sizeof, alignment, memmove, memset, addressof, _CFuncPtr, _Pointer
+import sys
 
 # Helper functions
 repr_fn = lambda self: str(dict(self._fields_))
@@ -35,35 +40,603 @@ def define_struct(name, *args):
 def define_union(name, *args):
     return type(name, (Union,), {'_fields_': args, '__repr__': repr_fn})
 
-def load_functions(vk_object, functions_list, loader):
-    functions = []
+def load_function(vk_object, name, prototype, loader):
+    "Load a single function. Return None if it could not be loaded."
+    fn_ptr = cast(loader(vk_object, name), c_void_p)
+    return prototype(fn_ptr.value) if fn_ptr else None
+
+class LoadedFunctions(list):
+    "The (name, function) pairs returned by `load_functions`, with the names of the commands that could not be loaded in `missing`"
+    __slots__ = ('missing',)
+
+def load_functions(vk_object, functions_list, loader, enabled=None, missing=None):
+    "Load the commands of a function family. With `enabled` (see `enabled_commands`), only the enabled commands are looked up, and a promoted command is looked up once for all its enabled names."
+    # The names of the commands that could not be loaded are appended to `missing`, a new list when none is given
+    functions = LoadedFunctions()
+    functions.missing = missing = [] if missing is None else missing
+    addresses = {}
     for name, prototype in functions_list:
         py_name = name.decode()[2::]
-        fn_ptr = loader(vk_object, name)
-        fn_ptr = cast(fn_ptr, c_void_p)
+        if enabled is None:
+            fn_ptr = cast(loader(vk_object, name), c_void_p).value
+        elif py_name in enabled:
+            promoted = _function_aliases.get(py_name, py_name)
+            if promoted not in addresses:
+                lookup = promoted if promoted in enabled else py_name
+                addresses[promoted] = cast(loader(vk_object, ('vk' + lookup).encode()), c_void_p).value
+            fn_ptr = addresses[promoted]
+        else:
+            continue
+
         if fn_ptr:
-            fn = prototype(fn_ptr.value)
-            functions.append((py_name, fn))
-        elif __debug__ == True:
-            print('Function {} could not be loaded. (__debug__ == True)'.format(py_name))
+            functions.append((py_name, prototype(fn_ptr)))
+        else:
+            missing.append(py_name)
     return functions
 
+def enabled_commands(api_version=None, extensions=()):
+    "Return the names of the commands of the core versions up to `api_version` (default: 1.0) and of the `extensions`"
+    api_version = API_VERSION_1_0 if api_version is None else api_version
+    extensions = set(e.decode() if isinstance(e, bytes) else e for e in extensions)
+    names = set()
+    for requirement, commands in _function_requires.items():
+        if _requirement_enabled(requirement, api_version, extensions):
+            names.update(commands.split())
+    return frozenset(names)
+
+def _requirement_enabled(requirement, api_version, extensions):
+    # A core version, an extension, or a dependency expression of vk.xml (ex: `VK_KHR_swapchain+VK_VERSION_1_1`) where
+    # `+` is an and and `,` an or. The registry puts the mixed operators in parentheses, they are read from left to right.
+    for operator in '(),+':
+        requirement = requirement.replace(operator, ' {} '.format(operator))
+    stack = []
+    value, operator = None, None
+    for token in requirement.split():
+        if token == '(':
+            stack.append((value, operator))
+            value, operator = None, None
+            continue
+        elif token in ('+', ','):
+            operator = token
+            continue
+        elif token == ')':
+            enabled = value
+            value, operator = stack.pop()
+        elif token.startswith('VK_VERSION_'):
+            major, minor = token[11:].split('_')
+            enabled = MAKE_VERSION(int(major), int(minor), 0) <= api_version
+        else:
+            enabled = token in extensions
+        value = enabled if operator is None else (value and enabled) if operator == '+' else (value or enabled)
+    return value
+
+def define_dispatch(name, *functions_lists):
+    "Create a dispatch table class with a slot per command of the function families. The commands are loaded by the constructor, or on their first use when `lazy` is true."
+    # The names of the commands that could not be loaded are in the `missing` list of the tables
+    functions, prototypes = [], {}
+    for functions_list in functions_lists:
+        for fn_name, prototype in functions_list:
+            py_name = fn_name.decode()[2::]
+            if py_name not in prototypes:
+                prototypes[py_name] = prototype
+                functions.append((fn_name, prototype))
+
+    def __init__(self, vk_object, loader, lazy=False, enabled=None):
+        self._vk_object = vk_object
+        self._loader = loader if lazy else None
+        self._enabled = enabled
+        self.missing = []
+        if not lazy:
+            # The slots have no __dict__ to update in bulk. Setting them costs a few percent of the lookups of the commands.
+            for fn_name, fn in load_functions(vk_object, functions, loader, enabled, self.missing):
+                setattr(self, fn_name, fn)
+
+    def __getattr__(self, py_name):
+        # Only called for the slots that are not set: the commands that are not loaded yet
+        prototype = prototypes.get(py_name)
+        if prototype is None:
+            raise AttributeError("{!r} object has no attribute {!r}".format(name, py_name))
+        enabled = self._enabled
+        if enabled is not None and py_name not in enabled:
+            raise AttributeError("Function {} is not enabled".format(py_name))
+        if self._loader is not None:
+            promoted = _function_aliases.get(py_name, py_name)
+            lookup = promoted if enabled is not None and promoted in enabled else py_name
+            fn = load_function(self._vk_object, ('vk' + lookup).encode(), prototype, self._loader)
+            if fn is not None:
+                setattr(self, py_name, fn)
+                return fn
+            if py_name not in self.missing:
+                self.missing.append(py_name)
+        raise AttributeError("Function {} could not be loaded".format(py_name))
+
+    slots = tuple(fn_name.decode()[2::] for fn_name, _ in functions) + ('_vk_object', '_loader', '_enabled', 'missing')
+    return type(name, (object,), {'__slots__': slots, '__init__': __init__, '__getattr__': __getattr__, 'functions': tuple(functions)})
+
+_unchecked_types = {}
+_unchecked_calls = {}
+
+def _unchecked_type(prototype):
+    # The C function type with the return type and the calling convention of `prototype`, but without argument types
+    key = (prototype._restype_, prototype._flags_)
+    unchecked = _unchecked_types.get(key)
+    if unchecked is None:
+        unchecked = _unchecked_types[key] = type('UncheckedFunction', (_CFuncPtr,), {'_restype_': prototype._restype_, '_flags_': prototype._flags_})
+    return unchecked
+
+def _argument_conversion(argtype):
+    # Without argument type, a python int is passed as a 32-bit C integer and a python float is not accepted. The ints
+    # given for the 64-bit integers and the pointers, and the ints and floats given for the floats, are wrapped in the
+    # ctypes type of the argument.
+    code = getattr(argtype, '_type_', None)
+    if argtype is None or not isinstance(code, str):
+        return None if argtype is None or not issubclass(argtype, (_Pointer, _CFuncPtr)) else 'c_void_p'
+    if code in 'PzZ':
+        return 'c_void_p'
+    if code in 'fd':
+        return 'c_float' if code == 'f' else 'c_double'
+    if code in 'qQlL' and sizeof(argtype) > 4:
+        return 'c_int64' if code in 'ql' else 'c_uint64'
+    return None
+
+def _unchecked_call(prototype):
+    # The builder of the unchecked calls of a prototype, generated once for the prototypes with the same conversions
+    conversions = tuple(_argument_conversion(argtype) for argtype in prototype._argtypes_ or ())
+    key = (prototype._restype_, prototype._flags_, conversions)
+    make = _unchecked_calls.get(key)
+    if make is None:
+        names = ['a{}'.format(index) for index in range(len(conversions))]
+        arguments = [name if conversion is None else '{0}({1}) if {1}.__class__ {2} else {1}'.format(conversion, name, 'in (int, float)' if conversion in ('c_float', 'c_double') else 'is int') for name, conversion in zip(names, conversions)]
+        source = 'def make(address):\n    fn = unchecked(address)\n    def call({}):\n        return fn({})\n    call._as_parameter_ = fn\n    return call\n'.format(', '.join(names), ', '.join(arguments))
+        namespace = {'unchecked': _unchecked_type(prototype), 'c_void_p': c_void_p, 'c_float': c_float, 'c_double': c_double, 'c_int64': c_int64, 'c_uint64': c_uint64}
+        exec(source, namespace)
+        make = _unchecked_calls[key] = namespace['make']
+    return make
+
+def unchecked_prototype(prototype):
+    "Return a prototype calling the functions of `prototype` without converting their arguments, except the python ints and floats that a C function without argument types would truncate or refuse"
+    # The call is generated when the first function is loaded, not when the family is built
+    built = []
+    def make(address):
+        if not built:
+            built.append(_unchecked_call(prototype))
+        call = built[0](address)
+        call._prototype_ = prototype
+        return call
+    return make
+
+def unchecked_function(fn):
+    "Return the unchecked version of a loaded function (see `unchecked_prototype`)"
+    return unchecked_prototype(type(fn))(cast(fn, c_void_p).value)
+
+def unchecked_functions(functions_list):
+    "Return the function family loading the functions of `functions_list` with their unchecked prototype"
+    return tuple((name, unchecked_prototype(prototype)) for name, prototype in functions_list)
+
+def _needs_conversion(argtype):
+    # Without conversion, a python int is passed as a 32-bit C integer and a python float is not accepted. An int given
+    # as a pointer (ex: an address for `c_void_p`) would be truncated, the pointer types convert it or raise TypeError.
+    if argtype is None:
+        return False
+    pointer = isinstance(getattr(argtype, '_type_', None), str) and argtype._type_ in 'PzZ'
+    return pointer or issubclass(argtype, (c_uint64, c_int64, c_size_t, c_float, c_double, _Pointer, _CFuncPtr))
+
+def prepared_call(fn, *arguments):
+    "Return a call of the loaded function `fn` with its leading `arguments` bound and converted once. It takes the other arguments."
+    from functools import partial
+    prototype = getattr(fn, '_prototype_', None)
+    if prototype is not None:
+        # An unchecked function (see `unchecked_prototype`) has no argument types, its prototype has them
+        fn = prototype(cast(fn, c_void_p).value)
+    argtypes = fn.argtypes or ()
+    bound = tuple(argtype.from_param(value) if argtype is not None else value for argtype, value in zip(argtypes + (None,) * len(arguments), arguments))
+    call = partial(_unchecked_type(type(fn))(cast(fn, c_void_p).value), *bound)
+
+    # Only the arguments that would be passed the wrong way are converted on each call
+    converters = [(index, argtype.from_param) for index, argtype in enumerate(argtypes[len(arguments):]) if _needs_conversion(argtype)]
+    if not converters:
+        return call
+
+    def converting_call(*args):
+        args = list(args)
+        for index, from_param in converters:
+            args[index] = from_param(args[index])
+        return call(*args)
+    return converting_call
+
+_struct_dtypes = {}
+
+def _field_dtype(numpy, ctype):
+    if issubclass(ctype, (Structure, Union)):
+        return struct_dtype(ctype)
+    elif hasattr(ctype, '_length_'):
+        return numpy.dtype((_field_dtype(numpy, ctype._type_), (ctype._length_,)))
+    elif isinstance(getattr(ctype, '_type_', None), str) and ctype._type_ not in 'PzZ':
+        return numpy.dtype(ctype)
+    return numpy.dtype(numpy.uintp)     # Pointers and function pointers, as addresses
+
+def _struct_fields(struct):
+    "Return the [(name, type, offset)] of the fields of a structure or union. The bit fields of a storage unit are one field, named after the first of them."
+    fields = []
+    end = 0
+    union = issubclass(struct, Union)
+    for index, field in enumerate(struct._fields_):
+        name, ctype = field[0], field[1]
+        if any(other[0] == name for other in struct._fields_[index + 1:]):
+            # Only the last field of a name is a ctypes attribute. The other fields are named with their index.
+            name = '{}_{}'.format(name, index)
+            offset = 0 if union else -(-end // alignment(ctype)) * alignment(ctype)
+        else:
+            offset = getattr(struct, name).offset
+        if offset < end and not union:
+            continue    # The next bit fields of a storage unit, whose offset is the offset of the unit
+        fields.append((name, ctype, offset))
+        end = offset + sizeof(ctype)
+    return fields
+
+def struct_dtype(struct):
+    "Return the NumPy structured dtype of a structure or union: the same field names, offsets and size. The pointers are addresses (uintp)."
+    dtype = _struct_dtypes.get(struct)
+    if dtype is None:
+        import numpy
+        names, types, offsets = zip(*_struct_fields(struct)) if struct._fields_ else ((), (), ())
+        formats = [_field_dtype(numpy, ctype) for ctype in types]
+        dtype = _struct_dtypes[struct] = numpy.dtype({'names': list(names), 'formats': formats, 'offsets': list(offsets), 'itemsize': sizeof(struct)}, align=True)
+    return dtype
+
+def struct_array(array, struct):
+    "Return a ctypes array of `struct` sharing the memory of a NumPy array (ex: of `struct_dtype(struct)`). It is passed as a `POINTER(struct)` argument without copy."
+    if array.dtype.itemsize != sizeof(struct) or not array.flags.c_contiguous:
+        raise ValueError("The array must be a contiguous array of items of {} bytes".format(sizeof(struct)))
+    return (struct * len(array)).from_buffer(array)
+
+_struct_packers = {}
+
+def _pack_format(ctype):
+    # Format of the values of a type, flattened, with the padding of the structures
+    if issubclass(ctype, Structure):
+        formats = []
+        end = 0
+        for _, field_type, offset in _struct_fields(ctype):
+            formats.append('{}x'.format(offset - end) if offset > end else '')
+            formats.append(_pack_format(field_type))
+            end = offset + sizeof(field_type)
+        formats.append('{}x'.format(sizeof(ctype) - end) if sizeof(ctype) > end else '')
+        return ''.join(formats)
+    elif hasattr(ctype, '_length_'):
+        if ctype._type_ is c_char:
+            return '{}s'.format(ctype._length_)
+        return _pack_format(ctype._type_) * ctype._length_
+    elif issubclass(ctype, Union):
+        return '{}s'.format(sizeof(ctype))    # The bytes of the largest member
+    elif isinstance(getattr(ctype, '_type_', None), str) and ctype._type_ in 'fdc?':
+        return ctype._type_
+    elif isinstance(getattr(ctype, '_type_', None), str) and ctype._type_ not in 'PzZ' and ctype._type_.islower():
+        return {1: 'b', 2: 'h', 4: 'i', 8: 'q'}[sizeof(ctype)]
+    return {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}[sizeof(ctype)]  # Unsigned integers, pointers and function pointers as addresses
+
+def struct_packer(struct):
+    "Return the `struct.Struct` packing a structure as its values, in the order of the fields. The nested structures and arrays are flattened, the pointers are addresses."
+    # The format has the padding and the size of the ctypes type, so consecutive items are an array of the structure
+    packer = _struct_packers.get(struct)
+    if packer is None:
+        from struct import Struct
+        packer = _struct_packers[struct] = Struct('=' + _pack_format(struct))
+    return packer
+
+def pack_structs(struct, buffer, items, offset=0):
+    "Pack the values of the `items` (sequences of values, see `struct_packer`) as consecutive structures in a writable `buffer`. Return the offset after the last item."
+    # Packing the items in a single bytes object and copying it once is faster than a `pack_into` per item
+    from itertools import starmap
+    data = b''.join(starmap(struct_packer(struct).pack, items))
+    memoryview(buffer).cast('B')[offset:offset + len(data)] = data
+    return offset + len(data)
+
+def unpack_structs(struct, buffer, count=None, offset=0):
+    "Return an iterator over the values of the consecutive structures of a `buffer`: `count` structures, or up to the end of the buffer"
+    packer = struct_packer(struct)
+    view = memoryview(buffer).cast('B')[offset:]
+    if count is None:
+        count = len(view) // packer.size
+    return packer.iter_unpack(view[:count * packer.size])
+
+class StructArray(object):
+    "Growable array of a structure, passed as a `POINTER(struct)` argument without copy. Its storage is kept when it shrinks."
+    # The slices are views of the same storage, and cannot be resized
+
+    __slots__ = ('struct', '_storage', '_start', '_length', '_is_view', '_parameter')
+
+    def __init__(self, struct, length=0, capacity=0):
+        self.struct = struct
+        self._storage = (struct * max(length, capacity))()
+        self._start = 0
+        self._length = length
+        self._is_view = False
+        self._parameter = None
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self):
+        return self._length if self._is_view else len(self._storage)
+
+    def resize(self, length):
+        "Set the number of items. The new items are zeroed, and the storage only grows (by doubling its capacity) when it is too small."
+        if self._is_view:
+            raise ValueError("A view of a StructArray cannot be resized")
+        if length == self._length:
+            return
+        size = sizeof(self.struct)
+        if length > len(self._storage):
+            storage = (self.struct * max(length, 2 * len(self._storage)))()
+            memmove(storage, self._storage, self._length * size)
+            self._storage = storage
+        elif length > self._length:
+            memset(addressof(self._storage) + (self._start + self._length) * size, 0, (length - self._length) * size)
+        self._length = length
+        self._parameter = None
+
+    def clear(self):
+        self.resize(0)
+
+    def append(self, item=None):
+        "Add an item, a copy of the structure `item` or zeroed, and return it. The returned structure shares the memory of the array."
+        self.resize(self._length + 1)
+        if item is not None:
+            self[self._length - 1] = item
+        return self._storage[self._start + self._length - 1]
+
+    def _index(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("StructArray index out of range")
+        return self._start + index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                raise ValueError("A StructArray slice cannot have a step")
+            view = StructArray(self.struct)
+            view._storage, view._start, view._length, view._is_view = self._storage, self._start + start, max(stop - start, 0), True
+            return view
+        return self._storage[self._index(index)]
+
+    def __setitem__(self, index, item):
+        self._storage[self._index(index)] = item
+
+    def __iter__(self):
+        storage = self._storage
+        return (storage[index] for index in range(self._start, self._start + self._length))
+
+    @property
+    def _as_parameter_(self):
+        # A pointer to the first item, cached until the array is resized. It keeps a reference to the storage.
+        parameter = self._parameter
+        if parameter is None:
+            items = (self.struct * self._length).from_buffer(self._storage, self._start * sizeof(self.struct))
+            parameter = self._parameter = cast(items, POINTER(self.struct))
+        return parameter
+
+    def numpy(self):
+        "Return a NumPy array of the items (see `struct_dtype`) sharing the memory of the array, until the array grows"
+        import numpy
+        return numpy.frombuffer(self._storage, struct_dtype(self.struct), self._length, self._start * sizeof(self.struct))
+
+    def set(self, field, values):
+        "Set the field `field` of every item from a sequence (or a single value), with a vectorized NumPy assignment"
+        self.numpy()[field] = values
+
+class StructArena(object):
+    "Bump allocator of the transient structures of a frame in one ctypes buffer. `reset` frees all the structures at once."
+    # The memory after the last structure is always zero: `reset` zeroes the used memory once, instead of every new structure.
+    # The structure objects are kept in allocation order, and the frames that allocate the same structures reuse the same objects.
+
+    __slots__ = ('_buffer', '_address', '_offset', '_count', '_structs', '_retired')
+
+    def __init__(self, size=65536):
+        self._buffer = None
+        self._retired = []
+        self._count = 0
+        self._allocate(size)
+
+    def _allocate(self, size):
+        if self._buffer is not None:
+            self._retired.append(self._buffer)
+        self._buffer = (c_char * size)()
+        self._address = addressof(self._buffer)
+        self._offset = 0
+        # [(type, structure, end offset)] of the allocations in this buffer, the first `_count` are in use
+        self._structs = []
+
+    @property
+    def size(self):
+        return len(self._buffer)
+
+    @property
+    def used(self):
+        return self._offset
+
+    def new(self, struct, **fields):
+        "Return a zeroed structure allocated in the arena, with the `fields` set. It is valid until the arena is reset."
+        count = self._count
+        structs = self._structs
+        if count < len(structs) and structs[count][0] is struct:
+            _, value, self._offset = structs[count]
+        else:
+            align = alignment(struct)
+            offset = -(-self._offset // align) * align
+            if offset + sizeof(struct) > len(self._buffer):
+                # The full buffer is kept until the reset, for the structures allocated in it
+                self._allocate(max(2 * len(self._buffer), sizeof(struct) + align))
+                self._count = 0
+                return self.new(struct, **fields)
+            value = struct.from_address(self._address + offset)
+            self._offset = offset + sizeof(struct)
+            # The frame diverges from the previous one, the next objects cannot be reused
+            del structs[count:]
+            structs.append((struct, value, self._offset))
+
+        self._count = count + 1
+        for name, field in fields.items():
+            setattr(value, name, field)
+        return value
+
+    def array(self, struct, count):
+        "Return a zeroed array of `count` structures allocated in the arena, valid until the arena is reset"
+        return self.new(struct * count)
+
+    def reset(self):
+        "Free every structure of the arena. The structures allocated before must not be used anymore."
+        memset(self._address, 0, self._offset)
+        self._offset = 0
+        self._count = 0
+        # The arena keeps its largest buffer, and the next frames do not need to grow it
+        self._retired = []
+
+_struct_factories = {}
+_structure_types = {}
+
+def _structure_type(struct):
+    # The STRUCTURE_TYPE value of a structure is named after the structure (ex: `PhysicalDeviceVulkan11Features`
+    # and `STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_1_FEATURES`), without the underscores the names are the same
+    if not _structure_types:
+        for name, value in list(globals().items()):
+            if name.startswith('STRUCTURE_TYPE_'):
+                _structure_types[name[15:].replace('_', '')] = value
+    return _structure_types.get(struct.__name__.upper())
+
+def struct_factory(struct):
+    "Return a callable creating `struct` structures with their STRUCTURE_TYPE set, and the other fields given as keywords"
+    factory = _struct_factories.get(struct)
+    if factory is not None:
+        return factory
+
+    fields = struct._fields_
+    structure_type = _structure_type(struct) if fields[:1] and fields[0][0] == 'type' else None
+    if structure_type is None:
+        # Nothing to fill in
+        factory = struct
+    elif any(field[0] == 'type' for field in fields[1:]):
+        # A few structures have a second `type` field (ex: the image type of `PhysicalDeviceImageFormatInfo2`), that is
+        # the one set by name. The structure type is written at its offset.
+        def factory(**fields):
+            value = struct(**fields)
+            c_uint32.from_buffer(value).value = structure_type
+            return value
+        factory.__name__ = factory.__qualname__ = struct.__name__
+    else:
+        # The ctypes constructor sets the fields in C, a partial of it runs at the same speed. A positional value would
+        # also set `type`, which the constructor refuses.
+        from functools import partial
+        factory = partial(struct, type=structure_type)
+
+    _struct_factories[struct] = factory
+    return factory
+
+def device_dispatch(instance, device, lazy=False, dispatch_class=None, enabled=None):
+    "Create a dispatch table (`DeviceDispatch` by default) of the commands of `device`, loaded with its `GetDeviceProcAddr` instead of the loader trampolines"
+    module = sys.modules[__name__]
+    get_device_proc_addr = load_function(instance, b"vkGetDeviceProcAddr", module.FnGetDeviceProcAddr, GetInstanceProcAddr)
+    if get_device_proc_addr is None:
+        raise RuntimeError("Function vkGetDeviceProcAddr could not be loaded")
+    return (dispatch_class or module.DeviceDispatch)(device, get_device_proc_addr, lazy, enabled)
+
+def dispatch_trampolines(instance, dispatch):
+    "Return the names of the loaded commands of a dispatch table that are the loader trampolines returned by `GetInstanceProcAddr`"
+    trampolines = []
+    dispatch_class = type(dispatch)
+    for fn_name, _ in dispatch_class.functions:
+        py_name = fn_name.decode()[2::]
+        try:
+            # Read the slot directly: the commands of a lazy table must not be loaded here
+            fn = getattr(dispatch_class, py_name).__get__(dispatch, dispatch_class)
+        except AttributeError:
+            continue
+        if cast(fn, c_void_p).value == cast(GetInstanceProcAddr(instance, fn_name), c_void_p).value:
+            trampolines.append(py_name)
+    return trampolines
+
 API_VERSION_1_0 = MAKE_VERSION(1,0,0)
 
 # System initialization
-system_name = system()
+system_name = 'Windows' if sys.platform == 'win32' else 'Linux' if sys.platform.startswith('linux') else sys.platform
 if system_name == 'Windows':
     from ctypes import WINFUNCTYPE, windll
     FUNCTYPE = WINFUNCTYPE
-    vk = windll.LoadLibrary('vulkan-1')
+    LoadLibrary = windll.LoadLibrary
+    LIBRARY_NAME = 'vulkan-1'
 elif system_name == 'Linux':
     from ctypes import CFUNCTYPE, cdll
     FUNCTYPE = CFUNCTYPE
-    vk = cdll.LoadLibrary('libvulkan.so.1')
+    LoadLibrary = cdll.LoadLibrary
+    LIBRARY_NAME = 'libvulkan.so.1'
+
+# Library loading. The vulkan library is only loaded by the first call of a loader function, or by `load_library`.
+vk = None
+_loader_functions = {}
+
+def load_library(name=None):
+    "Load the vulkan library, or the library `name` (ex: a specific loader or a test stub). The loader functions are resolved again on their next call."
+    global vk
+    vk = LoadLibrary(name or LIBRARY_NAME)
+    module_namespace = globals()
+    for fn_name, loader_function in _loader_functions.items():
+        loader_function.function = None
+        loader_function.missing = False
+        module_namespace[fn_name] = loader_function
+    return vk
+
+def _load_loader_function(name):
+    prototype = getattr(sys.modules[__name__], 'Fn' + name)
+    library = vk if vk is not None else load_library()
+    if name == 'GetInstanceProcAddr':
+        return prototype((b"vkGetInstanceProcAddr", library))
+    return load_function(Instance(0), b'vk' + name.encode(), prototype, _loader_functions['GetInstanceProcAddr'])
+
+class _LoaderFunction(object):
+    "Loader function resolved on its first call or truth test. The resolved function then replaces it in the module namespace."
+    # A function the loader does not have (ex: `EnumerateInstanceVersion` with a Vulkan 1.0 loader) is false
+    __slots__ = ('name', 'function', 'missing')
+
+    def __init__(self, name):
+        self.name = name
+        self.function = None
+        self.missing = False
+
+    def _resolve(self):
+        if self.function is None and not self.missing:
+            function = self.function = _load_loader_function(self.name)
+            self.missing = function is None
+            if function is not None:
+                globals()[self.name] = function
+        return self.function
+
+    def __call__(self, *args):
+        function = self.function or self._resolve()
+        if function is None:
+            raise RuntimeError("Function vk{} could not be loaded".format(self.name))
+        return function(*args)
+
+    def __bool__(self):
+        return self._resolve() is not None
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        state = '' if self.function is not None else ' (missing)' if self.missing else ' (not loaded)'
+        return '<vulkan loader function vk{}{}>'.format(self.name, state)
+
+def _define_loader_functions(names):
+    module_namespace = globals()
+    for name in names.split():
+        module_namespace[name] = _loader_functions[name] = _LoaderFunction(name)
 
 # System types
 HINSTANCE = c_size_t
 HWND = c_size_t
+HMONITOR = c_size_t
 HANDLE = c_size_t
 DWORD = c_uint32
 BOOL = c_uint32
@@ -120,54 +693,260 @@ MAX_DRIVER_INFO_SIZE_KHR = 256
 
 """[1:]
 
+# Names defined by BASE. The front-ends do not add them to the model again.
+BASE_NAMES = frozenset(re.findall(r"^(\w+) =", BASE, re.M))
+
+# Builder of the constants of the compact wrapper and of the extension modules of a package
+COMPACT_BUILDER = r"""
+def _build_constants(namespace, handles, non_dispatchable_handles, flags, enums):
+    namespace.update(dict.fromkeys(handles.split(), c_size_t))
+    namespace.update(dict.fromkeys(non_dispatchable_handles.split(), c_uint64))
+    namespace.update(dict.fromkeys(flags.split(), Flags))
+    for enum_name, names, values in enums:
+        namespace[enum_name] = c_uint32
+        namespace.update(zip(names.split(), values))
+"""[1:]
+
+# Runtime of the table wrappers (lazy or compact). Written after the `_definitions` table.
+LAZY_LOADER = r"""
+from threading import RLock as _RLock
+
+_lazy_lock = _RLock()
+
+class _LazyScope(object):
+    "Mapping used when evaluating the type expressions of a definition. Lazy names are built on demand."
+
+    def __getitem__(self, name):
+        if name in _definitions:
+            return _materialize(name)
+        raise KeyError(name)
+
+_lazy_scope = _LazyScope()
+
+def _resolve(expr):
+    "Return the type described by a type expression of `_definitions`"
+    namespace = globals()
+    if expr in namespace:
+        return namespace[expr]
+    elif expr in _definitions:
+        return _materialize(expr)
+    elif expr == 'None':
+        return None
+    elif expr.startswith('POINTER(') and expr.endswith(')'):
+        return POINTER(_resolve(expr[8:-1]))
+    elif expr.count('*') == 1:
+        item, length = expr.split('*')
+        return _resolve(item) * (int(length) if length.isdigit() else _resolve(length))
+    return eval(expr, namespace, _lazy_scope)
+
+class _TypeCache(dict):
+    "Types of the type expressions of `_definitions`, resolved once: the fields of many definitions use the same types"
+
+    def __missing__(self, expr):
+        value = self[expr] = _resolve(expr)
+        return value
+
+_types = _TypeCache()
+
+def _materialize(name):
+    namespace = globals()
+    with _lazy_lock:
+        if name in namespace:
+            return namespace[name]
+
+        kind, data = _definitions[name]
+        if kind == 'struct' or kind == 'union':
+            # `names;types`, or `names;types;bits` with the bits of every field (0 for a field that is not a bit field)
+            parts = data.split(';')
+            fields = zip(parts[0].split(), map(_types.__getitem__, parts[1].split()))
+            if len(parts) == 3:
+                fields = [(fname, ftype, int(bits)) if bits != '0' else (fname, ftype) for (fname, ftype), bits in zip(fields, parts[2].split())]
+            define = define_struct if kind == 'struct' else define_union
+            value = define(name, *fields)
+        elif kind == 'function':
+            value = FUNCTYPE(*map(_types.__getitem__, data.split()))
+        elif kind == 'alias':
+            value = _resolve(data)
+        elif kind == 'dispatch':
+            value = define_dispatch(name, *[_resolve(family) for family in data.split()])
+        elif kind == 'unchecked':
+            value = unchecked_functions(_resolve(data))
+        else:
+            value = _function_family(data)
+
+        namespace[name] = value
+        return value
+
+def _function_family(data):
+    return tuple((('vk' + fn_name[2:]).encode(), _types[fn_name]) for fn_name in data.split())
+
+def __getattr__(name):
+    if name in _definitions:
+        return _materialize(name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(_definitions))
+
+"""[1:]
+
+# Runtime of the package wrapper. Written in `__init__.py` after LAZY_LOADER and the extensions tables.
+# The extension modules only hold data tables: when imported, they add their definitions to the package.
+PACKAGE_LOADER = r"""
+from importlib import import_module as _import_module
+
+_extension_index = {}
+
+def _find_extension(name):
+    "Return the name of the extension module that defines `name`, or None"
+    if not _extension_index:
+        for module_name, names in _extension_names.items():
+            _extension_index.update(dict.fromkeys(names.split(), module_name))
+    return _extension_index.get(name)
+
+def _import_definition(name):
+    "Import the extension module defining `name`. Return True if the name is now defined."
+    module_name = _find_extension(name)
+    if module_name is None:
+        return False
+    _import_module('.' + module_name, __name__)
+    return name in globals() or name in _definitions
+
+def extension_module(extension_name):
+    "Import the module of an extension (ex: 'VK_KHR_swapchain') and return it"
+    if isinstance(extension_name, bytes):
+        extension_name = extension_name.decode()
+    return _import_module('.' + _extensions[extension_name], __name__)
+
+def _add_extension(module_namespace, handles, non_dispatchable_handles, flags, enums, base_types, definitions, families):
+    "Add the definitions of an extension module to the package. Called by the extension modules."
+    namespace = globals()
+    _build_constants(namespace, handles, non_dispatchable_handles, flags, enums)
+    _definitions.update(definitions)
+    for name, expr in base_types:
+        namespace[name] = _resolve(expr)
+
+    # The function families of the extension are module attributes, built on first access
+    def module_getattr(name):
+        if name in families:
+            module_namespace[name] = value = _function_family(families[name])
+            return value
+        raise AttributeError("module {!r} has no attribute {!r}".format(module_namespace['__name__'], name))
+
+    module_namespace['__getattr__'] = module_getattr
+
+class _PackageScope(_LazyScope):
+
+    def __getitem__(self, name):
+        if name not in _definitions and name not in globals() and _import_definition(name) and name in globals():
+            return globals()[name]
+        return _LazyScope.__getitem__(self, name)
+
+_lazy_scope = _PackageScope()
+
+def __getattr__(name):
+    if name in _definitions or _import_definition(name):
+        return globals()[name] if name in globals() else _materialize(name)
+    elif name in _extensions.values():
+        return _import_module('.' + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+def __dir__():
+    _find_extension('')
+    return sorted(set(globals()) | set(_definitions) | set(_extension_index))
+
+"""[1:]
+
+# Header of the extension modules of a package
+EXTENSION_HEADER = r"""
+#
+# {0} definitions of the Vulkan wrapper. Imported by the package when one of its definitions is used.
+#
+
+from . import _add_extension
+
+"""[1:]
+
+# Build the whole definitions table at import. Used by the package wrapper when it is not lazy, after PACKAGE_LOADER:
+# a definition can use a type of an extension, whose module adds its own definitions to the table when it is imported.
+DEFINITIONS_BUILDER = r"""
+for _name in list(_definitions):
+    _materialize(_name)
+    del _definitions[_name]
+del _name
+"""[1:]
+
+# Function families that have a dispatch table class (see `define_dispatch`)
+DISPATCH_GROUPS = ('Instance', 'Device')
+
+# Function families that also have an unchecked family and dispatch table (see `unchecked_functions`)
+UNCHECKED_GROUPS = ('Device',)
+
+# Callbacks that are hardcoded in `parse_allocation_callback`
+ALLOCATION_CALLBACKS = ('FnAllocationFunction', 'FnReallocationFunction', 'FnFreeFunction', 'FnInternalAllocationNotification', 'FnInternalFreeNotification', 'FnDebugReportCallbackEXT')
+
+# Struct names that are not redefined automatically by the headers front-end
+STRUCT_ALIASES = {"MemoryRequirements2": ("MemoryRequirements2KHR",)}
+
 def no_vk(t):
     t = t.replace('Vk', '')
     t = t.replace('PFN_vk', 'Fn')
     t = t.replace('VK_', '')
     return t
 
+TYPES_TABLE = { 
+    "float": 'c_float',
+    "uint32_t": 'c_uint32', 
+    "uint64_t": 'c_uint64',
+    "size_t": 'c_size_t',
+    "float": 'c_float',
+    'int32_t': 'c_int32',
+    'int64_t': 'c_int64',
+    'double': 'c_double',
+    'int': 'c_int32',
+    'uint8_t': 'c_int8',
+    "uint16_t": 'c_uint16',
+    "Flags64": 'c_uint64',
+    "char": "c_char",
+    "void": "None", 
+    "void*": "c_void_p", 
+    "const void*": 'c_void_p',
+    "const char*": 'c_char_p',
+    "const char* const*": 'POINTER(c_char_p)',
+    "struct wl_display*": "POINTER(wl_display)",
+    "struct wl_surface*": "POINTER(wl_surface)",
+    "const ObjectTableEntryNVX* const*": "POINTER(POINTER(ObjectTableEntryNVX))",
+    "BaseOutStructure*": 'c_void_p',
+    "const BaseInStructure*": 'c_void_p',
+    'v': ''
+}
+
 def translate_type(t):
-    table = { 
-        "float": 'c_float',
-        "uint32_t": 'c_uint32', 
-        "uint64_t": 'c_uint64',
-        "size_t": 'c_size_t',
-        "float": 'c_float',
-        'int32_t': 'c_int32',
-        'int': 'c_int32',
-        'uint8_t': 'c_int8',
-        "uint16_t": 'c_uint16',
-        "char": "c_char",
-        "void": "None", 
-        "void*": "c_void_p", 
-        "const void*": 'c_void_p',
-        "const char*": 'c_char_p',
-        "const char* const*": 'POINTER(c_char_p)',
-        "struct wl_display*": "POINTER(wl_display)",
-        "struct wl_surface*": "POINTER(wl_surface)",
-        "const ObjectTableEntryNVX* const*": "POINTER(POINTER(ObjectTableEntryNVX))",
-        'v': ''
-     }
-     
+    table = TYPES_TABLE
+
     if t in table.keys():
         return table[t]
 
     if t.endswith("*"):
         if t.startswith("const"):
             ttype = t[6:len(t)-1]
-            ttype = table[ttype] if ttype in table else ttype
-            return "POINTER({})".format(ttype)
         else:
             ttype = t[:len(t)-1]
-            ttype = table[ttype] if ttype in table else ttype
-            return "POINTER({})".format(ttype)
+
+        # Pointers to pointers, such as `const AccelerationStructureGeometryKHR* const*`
+        ttype = ttype.rstrip()
+        if ttype.endswith(" const"):
+            ttype = ttype[:len(ttype)-6]
+        return "POINTER({})".format(translate_type(ttype))
     
     return t
 
 def parse_array(n, t):
-    name, length = n.split('[')
-    length = no_vk(length[0:len(length)-1])
-    type_ = "{} * {}".format(do_type(t), length)
+    name, lengths = n.split('[', 1)
+    type_ = do_type(t)
+    # Multidimensional arrays: `float matrix[3][4]` is `c_float * 4 * 3`
+    for length in reversed(lengths[0:len(lengths)-1].split('][')):
+        type_ = "{} * {}".format(type_, no_vk(length))
     return name, type_
 
 def to_snake_case(name):
@@ -185,6 +964,7 @@ def to_snake_case(name):
         
     return name
 
+@lru_cache(maxsize=None)
 def fix_arg(arg):
     name = to_snake_case(arg)
 
@@ -195,100 +975,659 @@ def fix_arg(arg):
 
     return name
 
+@lru_cache(maxsize=None)
 def do_type(t):
     return translate_type(no_vk(t))
 
-def parse_handles_def(f):
+# Every construct of the headers that the generator cares about. The headers are
+# scanned once with this pattern, see `parse_headers`
+TOKENS = re.compile(r"""
+    VK_DEFINE_HANDLE\(Vk(?P<handle>\w+)\)
+  | VK_DEFINE_NON_DISPATCHABLE_HANDLE\(Vk(?P<non_dispatchable_handle>\w+)\)
+  | typedef\ VkFlags\ Vk(?P<flags>\w+?);
+  | typedef\ (?P<base_c_type>u?int(?:8|16|32|64)_t|size_t|void\*|VkFlags64)\ Vk(?P<base_type>\w+);
+  | typedef\ enum\ Vk(?P<enum>\w+)\ {(?P<enum_body>.+?)}\ \w+;
+  | typedef\ (?P<struct_kind>struct|union)\ Vk(?P<struct>\w+?)\ {(?P<struct_body>.+?)}\ \w+?;
+  | typedef\ (?P<return_type>\w+\*?)\ \(\w+\ \*(?P<function>\w+)\)\((?P<params>.+?)\);
+  | static\ const\ Vk(?P<flag_bits>\w+)\ VK_(?P<flag_bit>\w+)\ =\ (?P<flag_value>0x[0-9A-Fa-f]+|\d+|[A-Za-z_]\w*)(?:ULL|UL|U|LL|L)?;
+  | \#define\ (?P<section>VK_VERSION_[0-9_]+|VK_[A-Z]+_[a-z0-9_]+)\ 1\n
+""", re.S | re.X)
+
+FIELD_NAME = re.compile(r"[_a-zA-Z0-9[\]]+$")
+
+# Bit field members, ex: `uint32_t instanceCustomIndex:24`
+BIT_FIELD = re.compile(r"\s*:\s*(\d+)$")
+
+class Model(object):
+    "Intermediate representation of the Vulkan API, shared by all the emitters"
+
+    def __init__(self):
+        self.handles = []
+        self.handles_non_dispatchable = []
+        self.flags = []
+        self.base_types = []    # (name, type), the base types of BASE are not included
+        self.constants = []     # (name, value), the constants of BASE are not included
+        self.enums = []         # (name, [(value name, value expression)])
+        self.structs = []       # (struct or union, name, [(field name, type) or (field name, type, bits)])
+        self.struct_aliases = {}  # {struct name: (alias, ...)}
+        self.functions = []     # (name, return type, [argument types])
+
+        self.requires = {}      # {type or function name: name of the feature or extension requiring it}
+        self.command_aliases = {}  # {function name: name of the function it was promoted to}
+        # {function name: [feature, extension or dependency expression requiring it]}, only filled by the vk.xml front-end:
+        # a command can be required by several features and extensions (see `enabled_commands`)
+        self.command_requires = {}
+        self.callbacks = set()  # Names of the function pointers that are not vulkan commands
+
+        # Only filled by the vk.xml front-end, for the tools using the model: the writers do not use them yet
+        self.lengths = {}       # {struct or function name: {field or parameter name: (length, ...)}}
+        self.optional = {}      # {struct or function name: {field or parameter name: optional attribute}}
+        self.features = {}      # {feature name: version number}
+        self.extensions = {}    # {extension name: {'number', 'type', 'platform', 'depends', 'promoted_to'}}
+
+def strip_comments(body):
+    return '\n'.join(line.partition('//')[0] for line in body.splitlines())
+
+def parse_enum_body(body):
+    values = []
+    # The last item (the MAX_ENUM value) is not followed by a comma and is not exported
+    for item in strip_comments(body).split(',')[:-1]:
+        name, _, value = item.strip().partition(' = ')
+        if name.startswith('VK_') and value:
+            values.append((name[3:], no_vk(value)))
+    return values
+
+def parse_struct_body(body):
+    "Return the fields of a struct or union body. Raise ValueError on a member that cannot be parsed, the layout would be wrong without it."
+    fields = []
+    for member in strip_comments(body).split(';')[:-1]:
+        if not member.strip():
+            continue
+        # A few members of vk.xml have no space after the pointer (ex: `void*pNext`)
+        member = member.replace('*', '* ')
+        bits = BIT_FIELD.search(member)
+        words = member[:bits.start()].split() if bits else member.split()
+        if len(words) < 2 or not FIELD_NAME.match(words[-1]):
+            raise ValueError("Cannot parse the struct member {!r}".format(' '.join(member.split())))
+
+        type_, fname = ' '.join(words[:-1]), words[-1]
+        if '[' in fname:
+            fname, type_ = parse_array(fname, type_)
+        else:
+            type_ = do_type(type_)
+        fields.append((fix_arg(fname), type_) + ((int(bits.group(1)),) if bits else ()))
+    return fields
+
+def parse_params(params):
+    args = []
+    for param in params.split(','):
+        param = param.split()
+        if len(param) < 2:
+            continue    # (void)
+
+        type_, pname = ' '.join(param[:-1]), param[-1]
+        if pname.endswith(']'):
+            type_ += '*'    # Array parameters decay to pointers
+        args.append(do_type(type_))
+    return args
+
+def parse_headers(src):
+    "Build the model of the API defined in the headers source, in a single pass over the source"
+    model = Model()
+    model.struct_aliases.update(STRUCT_ALIASES)
+    section = None      # The core version or the extension being read (ex: `#define VK_KHR_surface 1`)
+    flag_bits = {}      # {64-bit flag bits type: [(value name, value)]}
+
+    for m in TOKENS.finditer(src):
+        kind = m.lastgroup
+        if kind == 'section':
+            section = m.group('section')
+            continue
+        elif kind == 'handle':
+            name = m.group('handle')
+            model.handles.append(name)
+        elif kind == 'non_dispatchable_handle':
+            name = m.group('non_dispatchable_handle')
+            model.handles_non_dispatchable.append(name)
+        elif kind == 'flags':
+            name = m.group('flags')
+            model.flags.append(name)
+        elif kind == 'base_type':
+            name = m.group('base_type')
+            if name not in BASE_NAMES:
+                model.base_types.append((name, do_type(m.group('base_c_type'))))
+        elif kind == 'enum_body':
+            name = m.group('enum')
+            model.enums.append((name, parse_enum_body(m.group('enum_body'))))
+        elif kind == 'struct_body':
+            name = m.group('struct')
+            # Structures that are not parsed correctly and not used anywhere else
+            if name in ("BaseOutStructure", "BaseInStructure"):
+                continue
+            model.structs.append((m.group('struct_kind'), name, parse_struct_body(m.group('struct_body'))))
+        elif kind == 'params':
+            name = no_vk(m.group('function'))
+            model.functions.append((name, do_type(m.group('return_type')), parse_params(m.group('params'))))
+        elif kind == 'flag_value':
+            # The 64-bit flag bits (ex: `VK_PIPELINE_STAGE_2_*`) are constants of a `VkFlags64` typedef. They are
+            # written as an enum, and the typedef, a base type, keeps c_uint64 as the type like with vk.xml.
+            name = m.group('flag_bits')
+            if name not in flag_bits:
+                flag_bits[name] = []
+                model.enums.append((name, flag_bits[name]))
+            flag_bits[name].append((m.group('flag_bit'), no_vk(m.group('flag_value'))))
+
+        if section is not None:
+            model.requires[name] = section
+
+    # The headers do not tell the callbacks from the commands: the function pointers used by the structures are callbacks
+    functions = set(name for name, _, _ in model.functions)
+    for _, _, fields in model.structs:
+        model.callbacks.update(field[1] for field in fields if field[1] in functions)
+
+    find_command_aliases(model)
+    return model
+
+def find_command_aliases(model):
+    "The headers do not mark the promoted commands: find the commands with a vendor suffix and the same prototype as a command without it"
+    types = canonical_types(model)
+    for name, aliases in model.struct_aliases.items():
+        types.update(dict.fromkeys(aliases, name))
+    signatures = dict((name, tuple(canonical_type(t, types) for t in [rt] + args)) for name, rt, args in model.functions)
+    for name in signatures:
+        m = re.match(r"(\w+?)[A-Z]{2,}$", name)
+        if m is not None and signatures.get(m.group(1)) == signatures[name]:
+            model.command_aliases[name] = m.group(1)
+
+# Platforms of the extensions kept by the vk.xml front-end. The same platforms as the headers read in the SDK.
+XML_PLATFORMS = (None, 'win32', 'xcb')
+
+def is_vulkan_api(elem):
+    api = elem.get('api')
+    return api is None or 'vulkan' in api.split(',')
+
+def element_text(elem):
+    "Return the C declaration of a vk.xml element, without its comments"
+    text = [elem.text or '']
+    for child in elem:
+        if child.tag != 'comment':
+            text.append(element_text(child))
+        text.append(child.tail or '')
+    return ''.join(text)
+
+def xml_enum_value(enum, extnumber=None):
+    "Return the value expression of an <enum> element, with the same formatting as the headers"
+    if enum.get('alias') is not None:
+        return no_vk(enum.get('alias'))
+    elif enum.get('bitpos') is not None:
+        return '0x{:08X}'.format(1 << int(enum.get('bitpos')))
+    elif enum.get('offset') is not None:
+        extnumber = int(enum.get('extnumber', extnumber))
+        value = 1000000000 + (extnumber - 1) * 1000 + int(enum.get('offset'))
+        return str(-value if enum.get('dir') == '-' else value)
+    return enum.get('value')
+
+def xml_lengths(length, altlen):
+    "Return the items of a len attribute, with the references to other fields or parameters using their python names"
+    if altlen is not None:
+        return (altlen,)
+    return tuple(fix_arg(item) if re.match(r"[a-zA-Z]\w*$", item) and item != 'null' else item for item in length.split(','))
+
+def sort_enum_aliases(values):
+    "Move the aliases after the value they reference. Extensions can alias a value added by a later extension."
+    names = set(vname for vname, _ in values)
+    done = set()
+    ordered = []
+    while values:
+        pending = []
+        for vname, value in values:
+            if value in names and value not in done:
+                pending.append((vname, value))
+            else:
+                done.add(vname)
+                ordered.append((vname, value))
+        if len(pending) == len(values):
+            raise ValueError("Circular enum aliases: {}".format(pending))
+        values = pending
+    return ordered
+
+def parse_xml(source):
+    "Build the model of the API from vk.xml (a path or a binary file object), streaming over the document with iterparse"
+    types = {}          # {C name: (category, element data)}
+    type_order = []
+    enum_values = {}    # {enum C name: [(value name, value expression)]}
+    bitwidth64 = set()
+    api_constants = []
+    commands = {}       # {C name: (return type, [param declarations], [param names], [param type names], params metadata)}
+    command_aliases = {}
+    type_aliases = {}
+    required = []       # [(feature or extension name, kind, C name)]
+    command_requires = {}   # {command C name: [feature, extension or dependency expression]}
+    model = Model()
+
+    def extend_enum(enum, extnumber):
+        values = enum_values.setdefault(enum.get('extends'), [])
+        name = enum.get('name')[3:]
+        if name not in (vname for vname, _ in values):
+            values.append((name, xml_enum_value(enum, extnumber)))
+
+    def read_requires(elem, owner, extnumber=None):
+        for require in elem.iter('require'):
+            if not is_vulkan_api(require):
+                continue
+            for item in require:
+                if not is_vulkan_api(item):
+                    continue
+                if item.tag == 'enum' and item.get('extends') is not None:
+                    extend_enum(item, extnumber)
+                elif item.tag in ('type', 'command'):
+                    required.append((owner, item.tag, item.get('name')))
+                if item.tag == 'command':
+                    # The dependencies of a require block are added to its owner, ex: `VK_KHR_swapchain+VK_VERSION_1_1`
+                    depends = require.get('depends')
+                    if depends is not None:
+                        depends = '{}+({})'.format(owner, depends) if ',' in depends else '{}+{}'.format(owner, depends)
+                    requirements = command_requires.setdefault(item.get('name'), [])
+                    if (depends or owner) not in requirements:
+                        requirements.append(depends or owner)
+
+    path = []
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+
+        path.pop()
+        parent = path[-1] if path else None
+        if parent == 'types' and elem.tag == 'type':
+            name = elem.get('name') or elem.findtext('name')
+            category = elem.get('category')
+            if is_vulkan_api(elem) and elem.get('alias') is not None:
+                type_aliases[name] = elem.get('alias')
+            elif is_vulkan_api(elem) and name is not None:
+                if category in ('struct', 'union'):
+                    members = [member for member in elem.findall('member') if is_vulkan_api(member)]
+                    data_ = (
+                        [element_text(member) for member in members],
+                        [member.findtext('name') for member in members],
+                        [member.findtext('type') for member in members],
+                        [(member.get('len'), member.get('altlen'), member.get('optional')) for member in members],
+                    )
+                elif category == 'funcpointer':
+                    data_ = (element_text(elem), [t.text for t in elem.findall('type')])
+                elif category == 'bitmask':
+                    data_ = (element_text(elem), elem.get('requires') or elem.get('bitvalues'))
+                elif elem.get('requires', '').startswith('vk_video/'):
+                    category = 'video'
+                    data_ = None
+                else:
+                    data_ = element_text(elem)
+                if name not in types:
+                    type_order.append(name)
+                types[name] = (category, data_)
+            elem.clear()
+        elif parent == 'registry' and elem.tag == 'enums':
+            name = elem.get('name')
+            if elem.get('type') == 'constants':
+                for enum in elem.findall('enum'):
+                    api_constants.append((enum.get('name')[3:], xml_enum_value(enum)))
+            else:
+                if elem.get('bitwidth') == '64':
+                    bitwidth64.add(name)
+                enum_values.setdefault(name, []).extend(
+                    (enum.get('name')[3:], xml_enum_value(enum)) for enum in elem.findall('enum') if is_vulkan_api(enum)
+                )
+            elem.clear()
+        elif parent == 'commands' and elem.tag == 'command':
+            if is_vulkan_api(elem):
+                if elem.get('alias') is not None:
+                    command_aliases[elem.get('name')] = elem.get('alias')
+                else:
+                    proto = elem.find('proto')
+                    name = proto.findtext('name')
+                    params = [param for param in elem.findall('param') if is_vulkan_api(param)]
+                    commands[name] = (
+                        element_text(proto).rsplit(name, 1)[0].strip(),
+                        [element_text(param) for param in params],
+                        [param.findtext('name') for param in params],
+                        [param.findtext('type') for param in params] + [proto.findtext('type')],
+                        [(param.get('len'), param.get('altlen'), param.get('optional')) for param in params],
+                    )
+            elem.clear()
+        elif parent == 'registry' and elem.tag == 'feature':
+            if is_vulkan_api(elem):
+                model.features[elem.get('name')] = elem.get('number')
+                read_requires(elem, elem.get('name'))
+            elem.clear()
+        elif parent == 'extensions' and elem.tag == 'extension':
+            name = elem.get('name')
+            supported = elem.get('supported', '').split(',')
+            if 'vulkan' in supported and elem.get('platform') in XML_PLATFORMS:
+                model.extensions[name] = {
+                    'number': int(elem.get('number')),
+                    'type': elem.get('type'),
+                    'platform': elem.get('platform'),
+                    'depends': elem.get('depends') or elem.get('requires'),
+                    'promoted_to': elem.get('promotedto'),
+                }
+                read_requires(elem, name, int(elem.get('number')))
+            elem.clear()
+        elif parent == 'registry':
+            elem.clear()
+
+    # Everything that is required by a feature or an extension, and the types it depends on. The features are walked
+    # before the extensions: a type that a core version only reaches through other types (ex: `VkInstance`) is core.
+    command_order = list(dict.fromkeys(name for _, kind, name in required if kind == 'command'))
+
+    requires = {}
+    roots = [item for item in required if item[0] in model.features] + [item for item in required if item[0] not in model.features]
+    pending = []
+    for owner, _, root in roots:
+        if root in requires:
+            continue
+        requires[root] = owner
+        pending.append(root)
+        while pending:
+            name = pending.pop()
+            name = command_aliases.get(name, name)
+            if name in type_aliases:
+                dependencies = [type_aliases[name]]
+            elif name in commands:
+                dependencies = commands[name][3]
+            elif name in types:
+                category, data_ = types[name]
+                if category in ('struct', 'union'):
+                    dependencies = data_[2]
+                elif category == 'funcpointer':
+                    dependencies = data_[1]
+                elif category == 'bitmask':
+                    dependencies = [data_[1]]
+                else:
+                    dependencies = []
+            else:
+                dependencies = []
+
+            for dependency in dependencies:
+                if dependency is not None and dependency not in requires:
+                    requires[dependency] = owner
+                    pending.append(dependency)
+
+    # Structs are sorted so that every struct is written after the types of its fields
+    struct_order = []
+    visited = set()
+    def visit(name):
+        name = type_aliases.get(name, name)
+        if name in visited or name not in types:
+            return
+        visited.add(name)
+        category, data_ = types[name]
+        if category in ('struct', 'union'):
+            for dependency in data_[2]:
+                visit(dependency)
+            struct_order.append(name)
+        elif category == 'funcpointer':
+            for dependency in data_[1]:
+                visit(dependency)
+
+    for name in type_order:
+        if name in requires:
+            visit(name)
+
+    # The model is built from the C declarations, with the same parsers as the headers
+    for name in type_order:
+        if name not in requires:
+            continue
+        category, data_ = types[name]
+        if category in ('handle', 'bitmask', 'basetype', 'funcpointer'):
+            text = data_ if category in ('handle', 'basetype') else data_[0]
+            m = TOKENS.search(' '.join(text.split()))
+            if m is None:
+                continue
+            kind = m.lastgroup
+            if kind == 'handle':
+                model.handles.append(m.group('handle'))
+            elif kind == 'non_dispatchable_handle':
+                model.handles_non_dispatchable.append(m.group('non_dispatchable_handle'))
+            elif kind == 'flags':
+                model.flags.append(m.group('flags'))
+            elif kind == 'base_type' and m.group('base_type') not in BASE_NAMES:
+                model.base_types.append((m.group('base_type'), do_type(m.group('base_c_type'))))
+            elif kind == 'params':
+                model.functions.append((no_vk(m.group('function')), do_type(m.group('return_type')), parse_params(m.group('params'))))
+                model.callbacks.add(no_vk(m.group('function')))
+        elif category == 'enum':
+            model.enums.append((no_vk(name), sort_enum_aliases(enum_values.get(name, []))))
+            if name in bitwidth64:
+                # Written after the enums, this replaces the default enum type
+                model.base_types.append((no_vk(name), 'c_uint64'))
+
+    for name in struct_order:
+        if name in ("VkBaseOutStructure", "VkBaseInStructure") or name not in requires:
+            continue
+        category, (declarations, names, _, metadata) = types[name]
+        py_name = no_vk(name)
+        model.structs.append((category, py_name, parse_struct_body(';'.join(declarations) + ';')))
+        model.requires[py_name] = requires[name]
+        for fname, (length, altlen, optional) in zip(names, metadata):
+            if length is not None:
+                model.lengths.setdefault(py_name, {})[fix_arg(fname)] = xml_lengths(length, altlen)
+            if optional is not None:
+                model.optional.setdefault(py_name, {})[fix_arg(fname)] = optional
+
+    for name in command_order:
+        target = command_aliases.get(name, name)
+        if target not in commands:
+            continue
+        return_type, declarations, names, _, metadata = commands[target]
+        py_name = no_vk('PFN_' + name)
+        model.functions.append((py_name, do_type(return_type), parse_params(','.join(declarations))))
+        model.requires[py_name] = requires[name]
+        model.command_requires[py_name] = command_requires[name]
+        for pname, (length, altlen, optional) in zip(names, metadata):
+            if length is not None:
+                model.lengths.setdefault(py_name, {})[fix_arg(pname)] = xml_lengths(length, altlen)
+            if optional is not None:
+                model.optional.setdefault(py_name, {})[fix_arg(pname)] = optional
+
+    for name in type_order:
+        if name in requires and types[name][0] in ('handle', 'bitmask', 'enum', 'basetype', 'funcpointer'):
+            model.requires[no_vk(name)] = requires[name]
+
+    # The video std types are defined by the video std headers, not by vk.xml. The types
+    # used by value are enums, the other ones are only used through pointers and are opaque
+    by_value = set(field[1] for _, _, fields in model.structs for field in fields)
+    by_value.update(t for _, _, args in model.functions for t in args)
+    for name in type_order:
+        if name in requires and types[name][0] == 'video':
+            opaque = "define_struct('{}')".format(name)
+            model.base_types.append((name, 'c_uint32' if name in by_value else opaque))
+
+    # Aliases of the structs are written after the struct, the other aliases are written with the base types
+    for alias, name in type_aliases.items():
+        if alias not in requires or name not in types:
+            continue
+        category = types[name][0]
+        if category in ('struct', 'union'):
+            model.struct_aliases[no_vk(name)] = model.struct_aliases.get(no_vk(name), ()) + (no_vk(alias),)
+        elif category in ('handle', 'bitmask', 'enum', 'basetype'):
+            model.base_types.append((no_vk(alias), no_vk(name)))
+        model.requires[no_vk(alias)] = requires[alias]
+
+    functions = set(name for name, _, _ in model.functions)
+    for alias, name in command_aliases.items():
+        while name in command_aliases:
+            name = command_aliases[name]
+        if no_vk('PFN_' + alias) in functions and no_vk('PFN_' + name) in functions:
+            model.command_aliases[no_vk('PFN_' + alias)] = no_vk('PFN_' + name)
+
+    constants = dict(api_constants)
+    for name, value in api_constants:
+        value = constants.get(value, value)
+        if name not in BASE_NAMES and value.isdigit():
+            model.constants.append((name, value))
+
+    return model
+
+def write_api_constants(f, model):
+    if model.constants:
+        f.write("# API constants\n")
+        for name, value in model.constants:
+            f.write("{} = {}\n".format(name, value))
+        f.write("\n\n")
+
+def write_base_types(f, model):
+    if model.base_types:
+        f.write("# Base types\n")
+        for name, type_ in model.base_types:
+            f.write("{} = {}\n".format(name, type_))
+        f.write("\n\n")
+
+def parse_handles_def(f, model):
     f.write("# Handles types\n")
-    handles = re.findall("VK_DEFINE_HANDLE\(Vk(\w+)\)", src, re.S)
-    for h in handles:
+    for h in model.handles:
         f.write("{} = c_size_t\n".format(h))
 
-    handles_non_dispatchable = re.findall("VK_DEFINE_NON_DISPATCHABLE_HANDLE\(Vk(\w+)\)", src, re.S)
-    for h in handles_non_dispatchable:
+    for h in model.handles_non_dispatchable:
         f.write("{} = c_uint64\n".format(h))
 
-def parse_flags_def(f):
+def parse_flags_def(f, model):
     f.write("# Flags types\n")
-    data = re.findall("typedef VkFlags Vk(\w+?);", src)
-    
-    for name in data:
+    for name in model.flags:
         f.write("{} = Flags\n".format(name))
 
-def parse_enums(f):
+def parse_enums(f, model):
     f.write("# Enums\n")
 
-    data = re.findall("typedef enum Vk(\w+) {(.+?)} \w+;", src, re.S)
-
-    for name, fields in data:
+    for name, values in model.enums:
         f.write("{} = c_uint32\n".format(name))
-        for name, value in re.findall("VK_(\w+?) = (.*?)(?:,|})", fields, re.S):
-                f.write("{} = {}\n".format(name, no_vk(value)))
+        for name, value in values:
+                f.write("{} = {}\n".format(name, value))
         f.write("\n")
 
+def fold_enums(model):
+    "Evaluate the enum values, including the aliases and the `*_RANGE_SIZE` arithmetic, to plain integers"
+    folded = {}
+    enums = []
+    for name, values in model.enums:
+        enum_values = []
+        for vname, value in values:
+            folded[vname] = eval(value, {'__builtins__': {}}, folded)
+            enum_values.append((vname, folded[vname]))
+        enums.append((name, enum_values))
+
+    return enums
+
+def write_constant_tables(f, model):
+    # Names are stored as space separated strings and the enum values are pre-folded,
+    # which keeps the module code object small and fast to unmarshal
+    f.write("# Handles types\n")
+    f.write("_handles = {!r}\n".format(' '.join(model.handles)))
+    f.write("_non_dispatchable_handles = {!r}\n\n".format(' '.join(model.handles_non_dispatchable)))
+    f.write("# Flags types\n")
+    f.write("_flags = {!r}\n\n".format(' '.join(model.flags)))
+    f.write("# Enums\n_enums = (\n")
+    for name, values in fold_enums(model):
+        names = ' '.join(vname for vname, _ in values)
+        f.write("    ({!r}, {!r}, {!r}),\n".format(name, names, tuple(value for _, value in values)))
+    f.write(")\n\n")
+
+def write_compact_constants(f, model, package=False):
+    write_constant_tables(f, model)
+    f.write(COMPACT_BUILDER)
+    f.write("\n_build_constants(globals(), _handles, _non_dispatchable_handles, _flags, _enums)\n")
+    # The builder of a package is also used by its extension modules
+    f.write("del _handles, _non_dispatchable_handles, _flags, _enums{}\n".format('' if package else ', _build_constants'))
+
 def parse_allocation_callback(f):
     # Allocation callback must be defined before the structs, but there are no good way to differenciate them
     # from the function pointers. Hence why they are hardcoded here
     f.write("""
 # Allocation callback
 FnAllocationFunction = FUNCTYPE(c_void_p, c_void_p, c_size_t, c_size_t, SystemAllocationScope)
-FnReallocationFunction = FUNCTYPE(c_void_p, c_void_p, c_size_t, c_size_t, SystemAllocationScope)
+FnReallocationFunction = FUNCTYPE(c_void_p, c_void_p, c_void_p, c_size_t, c_size_t, SystemAllocationScope)
 FnFreeFunction = FUNCTYPE(None, c_void_p, c_void_p)
 FnInternalAllocationNotification = FUNCTYPE(None, c_void_p, c_size_t, InternalAllocationType, SystemAllocationScope)
 FnInternalFreeNotification = FUNCTYPE(None, c_void_p, c_size_t, InternalAllocationType, SystemAllocationScope)
-FnDebugReportCallbackEXT = FUNCTYPE(Bool32, DebugReportFlagsEXT, DebugReportObjectTypeEXT, c_uint64, c_size_t, c_uint32, c_char_p, c_char_p, c_void_p)
+FnDebugReportCallbackEXT = FUNCTYPE(Bool32, DebugReportFlagsEXT, DebugReportObjectTypeEXT, c_uint64, c_size_t, c_int32, c_char_p, c_char_p, c_void_p)
 
 """[1::])
 
-def parse_structs(f):
-    data = re.findall("typedef (struct|union) Vk(\w+?) {(.+?)} \w+?;", src, re.S)
+def parse_structs(f, model):
+    functions = {name: (rt, args) for name, rt, args in model.functions}
+    defined = set(ALLOCATION_CALLBACKS)
 
-    for _type, name, fields in data:
+    def write_callback(name):
+        if name in functions and name not in defined:
+            defined.add(name)
+            rt, args = functions[name]
+            for type_ in [rt] + args:
+                write_callback(type_)
+            f.write("{} = FUNCTYPE({}, {})\n\n".format(name, rt, ', '.join(args)))
 
-        # Structures that are not parsed correctly and not used anywhere else
-        if name in ("BaseOutStructure", "BaseInStructure"):
-            continue
+    for _type, name, fields in model.structs:
 
-        # A callback definition MUST be written just before this struct
-        if name == "DebugUtilsMessengerCreateInfoEXT":
-            f.write("FnDebugUtilsMessengerCallbackEXT = FUNCTYPE(Bool32, DebugUtilsMessageSeverityFlagBitsEXT, DebugUtilsMessageTypeFlagsEXT, POINTER(DebugUtilsMessengerCallbackDataEXT), c_void_p)\n\n")
+        # The callbacks used by the fields MUST be written just before this struct
+        for field in fields:
+            write_callback(field[1])
 
-        fields = re.findall("\s+(.+?)\s+([_a-zA-Z0-9[\]]+);", fields)
         f.write("{0} = define_{1}('{0}', \n".format(name, _type))
-        for type_, fname in fields:
-            if '[' in fname:
-                try:
-                    fname, type_ = parse_array(fname, type_)
-                except:
-                    print(f"Error parsing \"{fname}\", skipping definition.")
-                    continue
-            f.write("    ('{}', {}),\n".format(fix_arg(fname), do_type(type_)))
+        for field in fields:
+            # A bit field has a third item, its number of bits
+            f.write("    ({}),\n".format(', '.join(["'{}'".format(field[0])] + [str(item) for item in field[1:]])))
         f.write(")\n\n")
 
         # Some struct name that are not redefined automatically
-        if name in ("MemoryRequirements2",):
-            f.write("MemoryRequirements2KHR = MemoryRequirements2\n\n")
+        for alias in model.struct_aliases.get(name, ()):
+            f.write("{} = {}\n\n".format(alias, name))
+
 
+def canonical_types(model):
+    "Map the type names of the model to the ctypes type they are bound to in the wrapper"
+    types = dict(re.findall(r"^(\w+) = (c_\w+)$", BASE, re.M))
+    types.update(dict.fromkeys(model.handles, 'c_size_t'))
+    types.update(dict.fromkeys(model.handles_non_dispatchable, 'c_uint64'))
+    types.update(dict.fromkeys(model.flags, 'c_uint32'))
+    types.update(dict.fromkeys((name for name, _ in model.enums), 'c_uint32'))
+    for name, type_ in model.base_types:
+        types[name] = types.get(type_, type_)
+    return types
 
-def parse_functions(f):
-    data = re.findall("typedef (\w+\*?) \(\w+ \*(\w+)\)\((.+?)\);", src, re.S)
+def canonical_type(t, types):
+    if t.startswith('POINTER(') and t.endswith(')'):
+        return 'POINTER({})'.format(canonical_type(t[8:-1], types))
+    return types.get(t, t)
 
-    for rt, name, fields in data:
-        no_vk_name = no_vk(name)
-        if no_vk_name not in ('FnAllocationFunction', 'FnReallocationFunction', 'FnFreeFunction', 'FnInternalAllocationNotification', 'FnInternalFreeNotification', 'FnDebugReportCallbackEXT'):
-            data_fields = ', '.join([do_type(t) for t in re.findall("(?:\s*|)(.+?)\s*\w+(?:,|$)", fields)])
-            f.write("{} = FUNCTYPE({}, {})\n".format(no_vk_name, do_type(rt), data_fields))
+def intern_prototypes(model, functions):
+    "Map the name of every function to the first function declared with the same types"
+    # This deduplicates the generated source, the other names are written as aliases. It is not a runtime
+    # saving: ctypes already returns the same class for the same prototype. The declared types are compared, not
+    # the ctypes types they are bound to, so a prototype is never the alias of an unrelated command (ex: the
+    # handles of `FnDestroyFence` and `FnFreeMemory` are both c_uint64).
+    first = {}
+    prototypes = {}
+    for name, rt, args in functions:
+        prototypes[name] = first.setdefault(tuple([rt] + args), name)
+    return prototypes
+
+def parse_functions(f, model):
+    functions = [function for function in model.functions if function[0] not in ALLOCATION_CALLBACKS]
+    prototypes = intern_prototypes(model, functions)
+    for name, rt, args in functions:
+        if prototypes[name] != name:
+            f.write("{} = {}\n".format(name, prototypes[name]))
+        else:
+            f.write("{} = FUNCTYPE({}, {})\n".format(name, rt, ', '.join(args)))
 
-def group_functions(f):
-    data = re.findall("typedef (\w+\*?) \(\w+ \*(\w+)\)\((.+?)\);", src, re.S)
+def read_function_groups(model):
+    "Sort the vulkan commands in the Loader, Instance and Device families"
     group_map = {"Instance":[], "Device":[], "Loader":[]}
 
-    for rt, vkname, fields in data:
-        fields_types_name = [do_type(t) for t in re.findall("(?:\s*|)(.+?)\s*\w+(?:,|$)", fields)]
-        table_name = fields_types_name[0]
-        name = no_vk(vkname)
+    for name, rt, args in model.functions:
+        table_name = args[0] if args else ''
 
-        if table_name in ('Device', 'Queue', 'CommandBuffer') and name != 'FnGetDeviceProcAddr':
+        if name in model.callbacks:
+            pass
+        elif table_name in ('Device', 'Queue', 'CommandBuffer') and name != 'FnGetDeviceProcAddr':
             group_map["Device"].append(name)
         elif table_name in ('Instance', 'PhysicalDevice') or name == 'FnGetDeviceProcAddr':
             group_map["Instance"].append(name)
@@ -299,37 +1638,340 @@ def group_functions(f):
             #print(table_name, name)
             group_map["Loader"].append(name)
 
-    for group_name, group_lines in group_map.items():
+    return group_map
+
+def group_functions(f, model):
+    for group_name, group_lines in read_function_groups(model).items():
         f.write("{}Functions = (\n".format(group_name))
         for name in group_lines:
             f.write('  (b"{}", {}),\n'.format(name.replace('Fn', 'vk'), name))
         f.write(")\n\n")
 
-def write_base_loader(f):
+def write_dispatch_tables(f):
+    for group_name in DISPATCH_GROUPS:
+        f.write("{0}Dispatch = define_dispatch('{0}Dispatch', {0}Functions)\n".format(group_name))
+    for group_name in UNCHECKED_GROUPS:
+        f.write("Unchecked{0}Functions = unchecked_functions({0}Functions)\n".format(group_name))
+        f.write("Unchecked{0}Dispatch = define_dispatch('Unchecked{0}Dispatch', Unchecked{0}Functions)\n".format(group_name))
+
+def write_function_requires(f, models):
+    "Write the commands of each core version and extension, and the promoted commands (see `enabled_commands`)"
+    requires = {}
+    names = set()
+    for model in models:
+        commands = set(name for group in read_function_groups(model).values() for name in group)
+        for name, _, _ in model.functions:
+            if name in commands:
+                for requirement in model.command_requires.get(name) or [model.requires.get(name, 'VK_VERSION_1_0')]:
+                    requires.setdefault(requirement, []).append(name[2::])
+                names.add(name)
+
+    f.write("# Function requirements\n_function_requires = {\n")
+    for owner, owner_names in requires.items():
+        f.write("    {!r}: {!r},\n".format(owner, ' '.join(owner_names)))
+    f.write("}\n\n_function_aliases = {\n")
+    for model in models[:1]:
+        for alias, name in model.command_aliases.items():
+            if alias in names and name in names:
+                f.write("    {!r}: {!r},\n".format(alias[2::], name[2::]))
+    f.write("}\n\n\n")
+
+def write_definitions_table(f, model, families=True):
+    # Structs, unions, prototypes and function families are written as a table of
+    # specs that the module builds on demand (see LAZY_LOADER). Each spec is a single
+    # space separated string, type expressions are written without spaces.
+    compact_type = lambda t: t.replace(' ', '')
+    f.write("# Definitions\n_definitions = {\n")
+    for _type, name, fields in model.structs:
+        # The names and the types of the fields, then the bits of every field when the struct has bit fields
+        parts = [' '.join(field[0] for field in fields), ' '.join(compact_type(field[1]) for field in fields)]
+        if any(len(field) > 2 for field in fields):
+            parts.append(' '.join(str(field[2]) if len(field) > 2 else '0' for field in fields))
+        f.write("    {!r}: ({!r}, {!r}),\n".format(name, _type, ';'.join(parts)))
+        for alias in model.struct_aliases.get(name, ()):
+            f.write("    {!r}: ('alias', {!r}),\n".format(alias, name))
+
+    prototypes = intern_prototypes(model, model.functions)
+    for name, rt, args in model.functions:
+        if prototypes[name] != name:
+            f.write("    {!r}: ('alias', {!r}),\n".format(name, prototypes[name]))
+        else:
+            signature = ' '.join(compact_type(t) for t in [rt] + args)
+            f.write("    {!r}: ('function', {!r}),\n".format(name, signature))
+
+    if families:
+        for group_name, group_lines in read_function_groups(model).items():
+            f.write("    {!r}: ('functions', {!r}),\n".format(group_name + "Functions", ' '.join(group_lines)))
+        for group_name in DISPATCH_GROUPS:
+            f.write("    {!r}: ('dispatch', {!r}),\n".format(group_name + "Dispatch", group_name + "Functions"))
+        for group_name in UNCHECKED_GROUPS:
+            f.write("    {!r}: ('unchecked', {!r}),\n".format("Unchecked" + group_name + "Functions", group_name + "Functions"))
+            f.write("    {!r}: ('dispatch', {!r}),\n".format("Unchecked" + group_name + "Dispatch", "Unchecked" + group_name + "Functions"))
+    f.write("}\n\n")
+
+def write_definitions(f, model):
+    write_definitions_table(f, model)
+    f.write(LAZY_LOADER)
+
+def extension_module_name(extension):
+    "Name of the module of an extension in a package. Ex: `VK_KHR_swapchain` is in `khr_swapchain.py`"
+    return extension[3:].lower()
+
+def split_model(model):
+    "Split the model by the extension requiring each definition. The core versions are under the `None` key."
+    models = {}
+
+    def owner(name):
+        extension = model.requires.get(name)
+        if extension is not None and extension.startswith('VK_VERSION_'):
+            extension = None
+        if extension not in models:
+            models[extension] = Model()
+            models[extension].requires = model.requires
+            models[extension].command_aliases = model.command_aliases
+            models[extension].command_requires = model.command_requires
+            models[extension].lengths = model.lengths
+            models[extension].optional = model.optional
+            models[extension].callbacks = model.callbacks
+        return models[extension]
+
+    owner(None).constants = model.constants
+    for name in model.handles:
+        owner(name).handles.append(name)
+    for name in model.handles_non_dispatchable:
+        owner(name).handles_non_dispatchable.append(name)
+    for name in model.flags:
+        owner(name).flags.append(name)
+    for name, type_ in model.base_types:
+        owner(name).base_types.append((name, type_))
+    for name, values in model.enums:
+        owner(name).enums.append((name, values))
+    for struct in model.structs:
+        submodel = owner(struct[1])
+        submodel.structs.append(struct)
+        if struct[1] in model.struct_aliases:
+            submodel.struct_aliases[struct[1]] = model.struct_aliases[struct[1]]
+    for function in model.functions:
+        owner(function[0]).functions.append(function)
+
+    return models
+
+def model_names(model):
+    "Every name defined by the model, in the module namespace"
+    names = model.handles + model.handles_non_dispatchable + model.flags
+    names += [name for name, _ in model.base_types]
+    for name, values in model.enums:
+        names += [name] + [vname for vname, _ in values]
+    for _, name, _ in model.structs:
+        names += (name,) + model.struct_aliases.get(name, ())
+    names += [name for name, _, _ in model.functions]
+    return names
+
+def write_package_loader(f, extensions, builder):
+    f.write("# Extension modules\n_extensions = {\n")
+    for extension in extensions:
+        f.write("    {!r}: {!r},\n".format(extension, extension_module_name(extension)))
+    f.write("}\n\n")
+    f.write("# Names defined by each extension module\n_extension_names = {\n")
+    for extension, model in extensions.items():
+        f.write("    {!r}: {!r},\n".format(extension_module_name(extension), ' '.join(model_names(model))))
+    f.write("}\n\n")
+    if builder:
+        f.write(COMPACT_BUILDER)
+        f.write("\n")
+    f.write(PACKAGE_LOADER)
+
+def write_extension(f, extension, model):
+    f.write(EXTENSION_HEADER.format(extension))
+    write_constant_tables(f, model)
+    f.write("# Base types\n_base_types = (\n")
+    for name, type_ in model.base_types:
+        f.write("    ({!r}, {!r}),\n".format(name, type_))
+    f.write(")\n\n")
+    write_definitions_table(f, model, families=False)
+    f.write("# Function families\n_families = {\n")
+    for group_name, group_lines in read_function_groups(model).items():
+        f.write("    {!r}: {!r},\n".format(group_name + "Functions", ' '.join(group_lines)))
+    f.write("}\n\n")
+    f.write("_add_extension(globals(), _handles, _non_dispatchable_handles, _flags, _enums, _base_types, _definitions, _families)\n")
+    f.write("del _handles, _non_dispatchable_handles, _flags, _enums, _base_types, _definitions, _families\n")
+
+def write_base_loader(f, model, lazy=False):
+    # The loader functions are proxies resolving the function on their first call,
+    # so the vulkan library is not loaded when the module is imported
+    names = ['GetInstanceProcAddr'] + [name[2::] for name in read_function_groups(model)['Loader']]
     f.write('''
 # Loading proc
-GetInstanceProcAddr = FnGetInstanceProcAddr((b"vkGetInstanceProcAddr", vk))
+_define_loader_functions("{}")'''[1::].format(' '.join(names)))
+    if lazy:
+        f.write('''
+
+# Star imports must also export the names that were not built yet
+__all__ = [name for name in globals() if not name.startswith('_')] + sorted(name for name in _definitions if name not in globals())
+''')
+
+def input_hash(*parts):
+    "Hash the inputs of the generator. The generator source is always part of the hash."
+    with open(__file__, 'rb') as infile:
+        digest = hashlib.sha256(infile.read())
+    for part in parts:
+        digest.update(b'\0' + (part if isinstance(part, bytes) else part.encode()))
+    return digest.hexdigest()
+
+def write_atomic(path, data):
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, 'wb') as outfile:
+        outfile.write(data)
+    os.replace(tmp_path, path)
+
+def file_digest(path):
+    "Hash a file block by block, without reading it whole"
+    digest = hashlib.sha256()
+    with open(path, 'rb') as infile:
+        for block in iter(lambda: infile.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_model(src, src_key, source, parse, cache_dir):
+    "Parse the source with a front-end, or reuse the model parsed from the same source (hashed as `src_key`) by a previous run"
+    if cache_dir is None:
+        return parse(src)
+
+    # One entry per source path (the SDK or the registry), replaced when the source changes: the stale models do not pile
+    # up in the cache. The key of the source is pickled before the model, a stale model is not loaded.
+    name = hashlib.sha256("{}\0{}".format(os.path.abspath(source), parse.__name__).encode()).hexdigest()
+    path = os.path.join(cache_dir, "model-{}.pickle".format(name))
+    key = input_hash(src_key, parse.__name__)
+    try:
+        with open(path, 'rb') as infile:
+            if pickle.load(infile) == key:
+                return pickle.load(infile)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+
+    model = parse(src)
+    os.makedirs(cache_dir, exist_ok=True)
+    write_atomic(path, pickle.dumps(key, pickle.HIGHEST_PROTOCOL) + pickle.dumps(model, pickle.HIGHEST_PROTOCOL))
+    return model
 
-# Load the loader functions in the module namespace
-loc = locals()
-for name, fnptr in load_functions(Instance(0), LoaderFunctions, GetInstanceProcAddr):
-    loc[name] = fnptr
-del loc'''[1::])
+def output_stamp_path(cache_dir, output):
+    name = hashlib.sha256(os.path.abspath(output).encode()).hexdigest()
+    return os.path.join(cache_dir, "output-{}.stamp".format(name))
 
-with open("vk.py", 'w') as f:
+def hash_output(output):
+    "Hash the output module, or every module of the output package"
+    if not os.path.isdir(output):
+        with open(output, 'rb') as infile:
+            return hashlib.sha256(infile.read()).hexdigest()
+
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(output)):
+        if name.endswith('.py'):
+            with open(os.path.join(output, name), 'rb') as infile:
+                digest.update(name.encode() + b'\0' + infile.read())
+    return digest.hexdigest()
+
+def is_up_to_date(cache_dir, output, key):
+    "Check that the output was generated from the same inputs and was not modified since"
+    try:
+        with open(output_stamp_path(cache_dir, output), 'r') as infile:
+            stamp_key, output_hash = infile.read().split()
+        return stamp_key == key and hash_output(output) == output_hash
+    except (OSError, ValueError):
+        return False
+
+def write_output_stamp(cache_dir, output, key):
+    output_hash = hash_output(output)
+    write_atomic(output_stamp_path(cache_dir, output), "{} {}\n".format(key, output_hash).encode())
+
+def write_wrapper(f, model, args, extensions=None):
+    "Write the wrapper module, or the `__init__.py` of a package when the models of the extensions are given"
+    package = extensions is not None
+    # Building the compact tables at import costs more than the statements of the default wrapper: they are always lazy
+    lazy = args.lazy or args.compact
     f.write(BASE)
-    parse_handles_def(f)
-    f.write("\n\n")
-    parse_flags_def(f)
-    f.write("\n\n")
-    parse_enums(f)
-    f.write("\n\n")
-    parse_allocation_callback(f)
-    f.write("\n\n")
-    parse_structs(f)
-    f.write("\n\n")
-    parse_functions(f)
-    f.write("\n\n")
-    group_functions(f)
-    f.write("\n\n")
-    write_base_loader(f)
+    write_api_constants(f, model)
+    if args.compact:
+        write_compact_constants(f, model, package)
+        f.write("\n\n")
+    else:
+        parse_handles_def(f, model)
+        f.write("\n\n")
+        parse_flags_def(f, model)
+        f.write("\n\n")
+        parse_enums(f, model)
+        f.write("\n\n")
+
+    write_base_types(f, model)
+
+    if args.compact or args.lazy or package:
+        write_definitions(f, model)
+        f.write("\n\n")
+        if package:
+            write_package_loader(f, extensions, not args.compact)
+            f.write("\n")
+        if not lazy:
+            f.write(DEFINITIONS_BUILDER)
+            f.write("\n\n")
+    else:
+        parse_allocation_callback(f)
+        f.write("\n\n# Structures\n")
+        parse_structs(f, model)
+        f.write("\n\n# Function prototypes\n")
+        parse_functions(f, model)
+        f.write("\n\n# Function families\n")
+        group_functions(f, model)
+        f.write("\n# Dispatch tables\n")
+        write_dispatch_tables(f)
+        f.write("\n\n")
+    write_function_requires(f, [model] + list((extensions or {}).values()))
+    write_base_loader(f, model, lazy)
+
+def write_package(path, model, args):
+    "Write the wrapper as a package: the core versions in `__init__.py` and a module per extension"
+    extensions = split_model(model)
+    core = extensions.pop(None, Model())
+    os.makedirs(path, exist_ok=True)
+
+    with open(os.path.join(path, '__init__.py'), 'w') as f:
+        write_wrapper(f, core, args, extensions)
+
+    for extension, submodel in extensions.items():
+        with open(os.path.join(path, extension_module_name(extension) + '.py'), 'w') as f:
+            write_extension(f, extension, submodel)
+
+parser = argparse.ArgumentParser(description="Generate a python wrapper from the Vulkan headers in the installed Vulkan SDK, or from the vk.xml registry.")
+parser.add_argument('-o', '--output', help="Path of the generated wrapper (default: vk.py, or vk with --package)")
+parser.add_argument('--lazy', action='store_true', help="Build the structs, unions and function prototypes on first access instead of at import. Requires python 3.7")
+parser.add_argument('--compact', action='store_true', help="Write the constants, structs and function prototypes as data tables with a small builder instead of one statement per definition. The definitions are built on first access, like with --lazy. Requires python 3.7")
+parser.add_argument('--package', action='store_true', help="Generate a package with the core versions in `__init__.py` and a module per extension, imported on first use. Requires python 3.7")
+parser.add_argument('--xml', metavar='PATH', help="Generate the wrapper from a vk.xml registry instead of the headers of the Vulkan SDK")
+parser.add_argument('--cache-dir', default=".vk_cache", help="Directory of the parsed headers and generated outputs cache (default: .vk_cache)")
+parser.add_argument('--no-cache', action='store_true', help="Always parse the headers and write the output")
+args = parser.parse_args()
+
+cache_dir = None if args.no_cache else args.cache_dir
+output = args.output or ('vk' if args.package else 'vk.py')
+if args.xml is not None:
+    # The registry is streamed from its file by parse_xml, only its hash is computed here
+    src, src_key = args.xml, file_digest(args.xml)
+    source, parse = args.xml, parse_xml
+else:
+    src = src_key = read_headers(os.environ["VULKAN_SDK"])
+    source, parse = os.environ["VULKAN_SDK"], parse_headers
+
+output_key = input_hash(src_key, repr((args.lazy, args.compact, args.package)))
+
+if cache_dir is not None and is_up_to_date(cache_dir, output, output_key):
+    print("{} is up to date".format(output))
+else:
+    model = load_model(src, src_key, source, parse, cache_dir)
+
+    if args.package:
+        write_package(output, model, args)
+    else:
+        with open(output, 'w') as f:
+            write_wrapper(f, model, args)
+
+    if cache_dir is not None:
+        write_output_stamp(cache_dir, output, output_key)
@@ -0,0 +1,85 @@
+"Fixtures of the tests: a stub dispatch table recording the calls instead of a Vulkan device, and a stub Vulkan library"
+
+import pytest
+
+import vk
+import vk_recorder
+
+
+class StubFunctions(object):
+    "Dispatch table whose commands record their name and arguments in `calls`, and return VK_SUCCESS. The commands of `missing` are not loaded."
+
+    def __init__(self):
+        self.calls = []
+        self.missing = set()
+
+    def __getattr__(self, name):
+        if name in self.missing:
+            raise AttributeError("Function {} could not be loaded".format(name))
+        def command(*args):
+            self.calls.append((name,) + args)
+            return vk.SUCCESS
+        return command
+
+    def names(self):
+        return [call[0] for call in self.calls]
+
+
+class StubLoader(object):
+    """
+    Stub of the Vulkan library: `load_library` replaces the `LoadLibrary` of the wrapper and records the names of the
+    loaded libraries, and `get_instance_proc_addr` replaces `FnGetInstanceProcAddr`. Its `vkGetInstanceProcAddr`
+    only has `vkEnumerateInstanceVersion`, which returns Vulkan 1.1.
+    """
+
+    def __init__(self):
+        self.libraries = []
+        self.resolved = []      # The libraries of the `vkGetInstanceProcAddr` resolved by the wrapper
+        self.commands = {b'vkEnumerateInstanceVersion': vk.FnEnumerateInstanceVersion(self.enumerate_instance_version)}
+
+    def load_library(self, name):
+        self.libraries.append(name)
+        return 'library:' + name
+
+    def get_instance_proc_addr(self, symbol):
+        name, library = symbol
+        self.resolved.append(library)
+        return lambda instance, fn_name: self.commands.get(fn_name)
+
+    def enumerate_instance_version(self, version):
+        version[0] = vk.MAKE_VERSION(1, 1, 0)
+        return vk.SUCCESS
+
+
+@pytest.fixture
+def stub_loader(monkeypatch):
+    "Unload the library of the wrapper and replace it with a `StubLoader`. The loader functions are restored after the test."
+    loader = StubLoader()
+    monkeypatch.setattr(vk, 'vk', None)
+    monkeypatch.setattr(vk, 'LoadLibrary', loader.load_library)
+    monkeypatch.setattr(vk, 'FnGetInstanceProcAddr', loader.get_instance_proc_addr)
+    for name, loader_function in vk._loader_functions.items():
+        monkeypatch.setattr(vk, name, loader_function)
+        monkeypatch.setattr(loader_function, 'function', None)
+        monkeypatch.setattr(loader_function, 'missing', False)
+    return loader
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def numpy_or_not(request, monkeypatch):
+    "Run a test with NumPy, when it is installed, and without"
+    if request.param == 'numpy' and vk_recorder.numpy is None:
+        pytest.skip("NumPy is not installed")
+    if request.param == 'python':
+        monkeypatch.setattr(vk_recorder, 'numpy', None)
+
+
+@pytest.fixture
+def address():
+    "An address above 32 bits, truncated when a python int is passed as a C int"
+    return 0x7ff428046e30
+
+
+@pytest.fixture
+def functions():
+    return StubFunctions()
@@ -0,0 +1,72 @@
+"Tests of the device dispatch tables, with stub GetInstanceProcAddr and GetDeviceProcAddr functions instead of the Vulkan library"
+
+from ctypes import CFUNCTYPE, c_char_p, c_size_t, c_void_p, cast
+
+import pytest
+
+import vk
+
+INSTANCE = 3
+DEVICE = 5
+
+# ctypes callbacks cannot return a function pointer type, the stub returns the address
+StubGetDeviceProcAddr = CFUNCTYPE(c_void_p, c_size_t, c_char_p)
+
+
+class StubLoader(object):
+    "The loader trampolines of CmdDraw and GetDeviceProcAddr, and the device CmdDraw returned by GetDeviceProcAddr"
+
+    def __init__(self):
+        self.calls = []
+        self.lookups = []
+        self.device_draw = vk.FnCmdDraw(lambda *args: self.calls.append(('device',) + args))
+        self.trampoline_draw = vk.FnCmdDraw(lambda *args: self.calls.append(('trampoline',) + args))
+        self.get_device_proc_addr = StubGetDeviceProcAddr(self.device_proc_addr)
+
+    def device_proc_addr(self, device, name):
+        self.lookups.append((device, name))
+        return cast(self.device_draw, c_void_p).value if name == b'vkCmdDraw' else None
+
+    def instance_proc_addr(self, instance, name):
+        functions = {b'vkCmdDraw': self.trampoline_draw, b'vkGetDeviceProcAddr': self.get_device_proc_addr}
+        return cast(functions[name], c_void_p) if name in functions else c_void_p()
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    stub = StubLoader()
+    monkeypatch.setattr(vk, 'GetInstanceProcAddr', stub.instance_proc_addr)
+    monkeypatch.setattr(vk, 'FnGetDeviceProcAddr', StubGetDeviceProcAddr)
+    return stub
+
+
+def test_device_dispatch_loads_the_device_commands(loader):
+    dispatch = vk.device_dispatch(INSTANCE, DEVICE)
+    dispatch.CmdDraw(7, 3, 1, 0, 0)
+    assert loader.calls == [('device', 7, 3, 1, 0, 0)]
+    assert set(device for device, _ in loader.lookups) == {DEVICE}
+    assert 'CmdDraw' not in dispatch.missing and 'CmdDispatch' in dispatch.missing
+    assert vk.dispatch_trampolines(INSTANCE, dispatch) == []
+
+    trampolines = vk.DeviceDispatch(DEVICE, vk.GetInstanceProcAddr)
+    assert vk.dispatch_trampolines(INSTANCE, trampolines) == ['CmdDraw']
+
+
+def test_device_dispatch_options(loader):
+    dispatch = vk.device_dispatch(INSTANCE, DEVICE, lazy=True, enabled={'CmdDraw', 'CmdDrawIndexed'})
+    assert vk.dispatch_trampolines(INSTANCE, dispatch) == [] and loader.lookups == []
+    dispatch.CmdDraw(7, 3, 1, 0, 0)
+    assert loader.lookups == [(DEVICE, b'vkCmdDraw')]
+    with pytest.raises(AttributeError):
+        dispatch.CmdDispatch
+
+    unchecked = vk.device_dispatch(INSTANCE, DEVICE, dispatch_class=vk.UncheckedDeviceDispatch, enabled={'CmdDraw'})
+    assert isinstance(unchecked, vk.UncheckedDeviceDispatch)
+    unchecked.CmdDraw(vk.CommandBuffer(7), 6, 1, 0, 0)
+    assert loader.calls == [('device', 7, 3, 1, 0, 0), ('device', 7, 6, 1, 0, 0)]
+
+
+def test_device_dispatch_requires_get_device_proc_addr(loader, monkeypatch):
+    monkeypatch.setattr(vk, 'GetInstanceProcAddr', lambda instance, name: c_void_p())
+    with pytest.raises(RuntimeError):
+        vk.device_dispatch(INSTANCE, DEVICE)
@@ -0,0 +1,98 @@
+"Tests of the DrawList of vk_recorder.py, recorded with a stub dispatch table"
+
+from ctypes import addressof, c_char
+import struct
+
+from vk_recorder import DRAW_INDIRECT_STRIDE, DrawList
+
+COMMAND_BUFFER = 7
+PIPELINE_BIND_POINT_GRAPHICS = 0
+
+
+def test_draw_list_sorts_the_draws_by_state(numpy_or_not, functions):
+    draw_list = DrawList()
+    draw_list.add(12, (3, 1, 0, 0))
+    draw_list.add(11, (6, 1, 0, 0), vertex_buffers=(0, [21], [0]))
+    draw_list.add(12, (9, 1, 0, 0))
+    draw_list.add(11, (12, 1, 0, 0), vertex_buffers=(0, [21], [0]))
+    assert draw_list.order() == [0, 2, 1, 3]
+
+    assert draw_list.record(functions, COMMAND_BUFFER) == 3
+    assert functions.names() == ['CmdBindPipeline', 'CmdDraw', 'CmdDraw', 'CmdBindPipeline', 'CmdBindVertexBuffers', 'CmdDraw', 'CmdDraw']
+    assert [call[2] for call in functions.calls if call[0] == 'CmdDraw'] == [3, 9, 6, 12]
+
+
+def test_clear_releases_the_state_ids(functions):
+    draw_list = DrawList()
+    for frame in range(3):
+        draw_list.add(11, (3, 1, 0, 0), descriptor_sets=(41, 0, [51], [256 * frame]))
+        key = draw_list.keys[0]
+        draw_list.record(functions, COMMAND_BUFFER)
+        draw_list.clear()
+        assert key == 1 << 48 | 1 << 32
+
+    dynamic_offsets = [call[-1][0] for call in functions.calls if call[0] == 'CmdBindDescriptorSets']
+    assert dynamic_offsets == [0, 256, 512]
+
+
+def test_draw_list_records_a_run_per_state(numpy_or_not, functions):
+    draw_list = DrawList()
+    for pipeline, first_index in [(11, 0), (12, 36), (11, 72)]:
+        draw_list.add(pipeline, (36, 1, first_index, 0, 0), index_buffer=(31, 0, 0))
+
+    memory = (c_char * (3 * DRAW_INDIRECT_STRIDE))()
+    assert draw_list.record_indirect(functions, COMMAND_BUFFER, 41, addressof(memory)) == 3 * DRAW_INDIRECT_STRIDE
+    assert struct.unpack_from('<15I', memory) == (36, 1, 0, 0, 0, 36, 1, 72, 0, 0, 36, 1, 36, 0, 0)
+    draws = [call for call in functions.calls if call[0] == 'CmdDrawIndexedIndirect']
+    assert [(call[3].value, call[4]) for call in draws] == [(0, 2), (2 * DRAW_INDIRECT_STRIDE, 1)]
+
+
+def test_merge_instances_groups_the_draws_of_a_mesh(numpy_or_not, functions):
+    draw_list = DrawList()
+    meshes = [(36, 1, 0, 0, 0), (24, 1, 36, 0, 0)]
+    for instance in range(6):
+        draw_list.add(11, meshes[instance % 2], instances=struct.pack('<I', instance))
+
+    memory = (c_char * 64)()
+    assert draw_list.merge_instances(51, addressof(memory), offset=8) == 24
+    assert struct.unpack_from('<6I', memory, 8) == (0, 2, 4, 1, 3, 5)
+
+    draw_list.record(functions, COMMAND_BUFFER)
+    assert functions.calls == [
+        ('CmdBindVertexBuffers', COMMAND_BUFFER, 1, 1, functions.calls[0][4], functions.calls[0][5]),
+        ('CmdBindPipeline', COMMAND_BUFFER, PIPELINE_BIND_POINT_GRAPHICS, 11),
+        ('CmdDrawIndexed', COMMAND_BUFFER, 36, 3, 0, 0, 0),
+        ('CmdDrawIndexed', COMMAND_BUFFER, 24, 3, 36, 0, 3),
+    ]
+    assert list(functions.calls[0][4]) == [51] and list(functions.calls[0][5]) == [8]
+
+
+def test_draw_list_records_indirect_count_commands(numpy_or_not, functions):
+    draw_list = DrawList()
+    for pipeline, first_index in [(11, 0), (12, 36), (11, 72)]:
+        draw_list.add(pipeline, (36, 1, first_index, 0, 0), index_buffer=(31, 0, 0))
+    draw_list.add(12, (3, 1, 0, 0))
+
+    memory = (c_char * (4 * DRAW_INDIRECT_STRIDE))()
+    counts = (c_char * 16)()
+    draw_list.record_indirect(functions, COMMAND_BUFFER, 41, addressof(memory), count_buffer=42, count_offset=4, count_mapped=addressof(counts))
+    draws = [call for call in functions.calls if call[0].startswith('CmdDraw')]
+    assert [call[0] for call in draws] == ['CmdDrawIndexedIndirectCount', 'CmdDrawIndirectCount', 'CmdDrawIndexedIndirectCount']
+    assert [(call[3].value, call[4], call[5].value, call[6]) for call in draws] == [
+        (0, 42, 4, 2), (2 * DRAW_INDIRECT_STRIDE, 42, 8, 1), (3 * DRAW_INDIRECT_STRIDE, 42, 12, 1)]
+    assert struct.unpack_from('<4I', counts) == (0, 2, 1, 1)
+
+
+def test_draw_list_indirect_count_aliases_and_fallback(numpy_or_not, functions):
+    draw_list = DrawList()
+    draw_list.add(11, (36, 1, 0, 0, 0), index_buffer=(31, 0, 0))
+    memory = (c_char * DRAW_INDIRECT_STRIDE)()
+
+    # The commands of VK_KHR_draw_indirect_count without the core commands, then no count commands at all
+    functions.missing = set(['CmdDrawIndirectCount', 'CmdDrawIndexedIndirectCount'])
+    draw_list.record_indirect(functions, COMMAND_BUFFER, 41, addressof(memory), count_buffer=42)
+    functions.missing.update(name + suffix for name in list(functions.missing) for suffix in ('KHR', 'AMD'))
+    draw_list.record_indirect(functions, COMMAND_BUFFER, 41, addressof(memory), count_buffer=42)
+    draws = [call for call in functions.calls if call[0].startswith('CmdDraw')]
+    assert [call[0] for call in draws] == ['CmdDrawIndexedIndirectCountKHR', 'CmdDrawIndexedIndirect']
+    assert (draws[1][3].value, draws[1][4:]) == (0, (1, DRAW_INDIRECT_STRIDE))
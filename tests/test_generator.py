@@ -0,0 +1,212 @@
+"Tests of create_vulkan_wrapper.py: the wrappers are generated from the small headers and registry of tests/fixtures, and imported"
+
+from ctypes import POINTER, c_uint32, c_uint64, sizeof
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR = os.path.join(ROOT, 'create_vulkan_wrapper.py')
+FIXTURES = os.path.join(ROOT, 'tests', 'fixtures')
+SDK = os.path.join(FIXTURES, 'sdk')
+
+
+def generate(directory, *options, **kwargs):
+    "Run the generator in `directory` with the headers of `sdk` (default: the fixture SDK) and return its output"
+    name = kwargs.get('name', 'vk_fixture')
+    output = os.path.join(str(directory), name if '--package' in options else name + '.py')
+    env = dict(os.environ, VULKAN_SDK=kwargs.get('sdk', SDK))
+    command = [sys.executable, GENERATOR, '-o', output, '--cache-dir', os.path.join(str(directory), 'cache')] + list(options)
+    return subprocess.check_output(command, env=env, cwd=str(directory), universal_newlines=True)
+
+
+@pytest.fixture
+def load_wrapper(tmp_path, monkeypatch):
+    "Import a wrapper generated in tmp_path. Its modules are removed from sys.modules after the test."
+    names = []
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def load(name='vk_fixture'):
+        names.append(name)
+        return importlib.import_module(name)
+
+    yield load
+    for module_name in list(sys.modules):
+        if any(module_name == name or module_name.startswith(name + '.') for name in names):
+            del sys.modules[module_name]
+
+
+def test_headers_wrapper(tmp_path, load_wrapper):
+    generate(tmp_path, '--no-cache')
+    vk = load_wrapper()
+
+    assert vk.STRUCTURE_TYPE_INSTANCE_CREATE_INFO == 1
+    assert vk.RESULT_RANGE_SIZE == 3
+    assert vk.PIPELINE_STAGE_2_COPY_BIT == 1 << 32 and vk.PipelineStageFlags2 is c_uint64
+    assert vk.Buffer is c_uint64 and vk.InstanceCreateFlags is c_uint32
+    assert [field[0] for field in vk.InstanceCreateInfo._fields_][:3] == ['type', 'next', 'flags']
+    assert vk.Extent2D.matrix.size == 4 * 3 * 4
+    assert sizeof(vk.AccelerationStructureInstanceKHR) == 16
+    assert vk.AccelerationStructureInstanceKHR._fields_[1] == ('mask', c_uint32, 8)
+    assert vk.XcbSurfaceCreateInfoKHR.window.size == 4
+
+    assert [name for name, _ in vk.LoaderFunctions] == [b'vkCreateInstance', b'vkEnumerateInstanceVersion']
+    assert b'vkDestroySurfaceKHR' in dict(vk.InstanceFunctions)
+    assert vk.DeviceDispatch.functions == vk.DeviceFunctions
+    assert vk._function_aliases == {'CmdDrawKHR': 'CmdDraw'}
+    assert 'CmdDraw' in vk.enabled_commands() and 'DestroySurfaceKHR' not in vk.enabled_commands()
+    assert 'DestroySurfaceKHR' in vk.enabled_commands(extensions=[b'VK_KHR_surface'])
+
+
+def test_prototype_aliases(tmp_path, load_wrapper):
+    generate(tmp_path, '--no-cache')
+    source = (tmp_path / 'vk_fixture.py').read_text()
+    vk = load_wrapper()
+
+    # Only the commands declared with the same types are aliases, not the commands with the same ctypes types
+    assert 'FnCmdDrawIndexedIndirect = FnCmdDrawIndirect\n' in source
+    assert 'FnDestroyPipeline = FUNCTYPE(None, Device, Pipeline, POINTER(AllocationCallbacks))\n' in source
+    assert vk.FnDestroyPipeline is vk.FnDestroyBuffer
+
+
+def struct_layouts(vk, names):
+    "Return the fields of the structures `names` of a wrapper, with the size and offset of every field"
+    return dict((name, [(field[0], getattr(vk, name).__dict__[field[0]].offset, getattr(vk, name).__dict__[field[0]].size)
+                        for field in getattr(vk, name)._fields_]) for name in names)
+
+
+def test_lazy_wrapper(tmp_path, load_wrapper):
+    generate(tmp_path, '--no-cache', name='vk_default')
+    generate(tmp_path, '--no-cache', '--lazy', name='vk_lazy')
+    default, lazy = load_wrapper('vk_default'), load_wrapper('vk_lazy')
+
+    structs = ['InstanceCreateInfo', 'Extent2D', 'AllocationCallbacks', 'AccelerationStructureInstanceKHR', 'XcbSurfaceCreateInfoKHR']
+    assert not any(name in vars(lazy) for name in structs + ['FnCmdDraw', 'DeviceFunctions', 'DeviceDispatch'])
+    assert set(structs + ['FnCmdDraw', 'DeviceDispatch']) <= set(lazy.__all__) & set(dir(lazy))
+
+    assert struct_layouts(lazy, structs) == struct_layouts(default, structs)
+    assert 'ApplicationInfo' in vars(lazy) and 'AllocationCallbacks' in vars(lazy)
+    assert lazy.FnCmdDrawKHR is lazy.FnCmdDraw
+    assert [name for name, _ in lazy.DeviceFunctions] == [name for name, _ in default.DeviceFunctions]
+    assert lazy.DeviceDispatch.functions == lazy.DeviceFunctions
+    with pytest.raises(AttributeError):
+        lazy.NotAStructure
+
+
+def test_compact_wrapper(tmp_path, load_wrapper):
+    generate(tmp_path, '--no-cache', name='vk_default')
+    generate(tmp_path, '--no-cache', '--compact', name='vk_compact')
+    default, compact = load_wrapper('vk_default'), load_wrapper('vk_compact')
+
+    assert '_build_constants' not in vars(compact) and '_enums' not in vars(compact)
+    constants = [name for name, value in vars(default).items() if name.isupper() and isinstance(value, int)]
+    assert 'STRUCTURE_TYPE_INSTANCE_CREATE_INFO' in constants and 'PIPELINE_STAGE_2_COPY_BIT' in constants
+    assert [getattr(compact, name) for name in constants] == [getattr(default, name) for name in constants]
+    for name in ('Instance', 'Buffer', 'InstanceCreateFlags', 'Result', 'PipelineStageFlags2', 'ColorSpaceKHR'):
+        assert getattr(compact, name) is getattr(default, name)
+
+    structs = [name for name in compact._definitions if compact._definitions[name][0] == 'struct']
+    assert 'AccelerationStructureInstanceKHR' in structs
+    assert struct_layouts(compact, structs) == struct_layouts(default, structs)
+    assert compact.FnCreateInstance._argtypes_ == (POINTER(compact.InstanceCreateInfo), POINTER(compact.AllocationCallbacks), POINTER(compact.Instance))
+    assert [name for name, _ in compact.InstanceFunctions] == [name for name, _ in default.InstanceFunctions]
+    assert compact.UncheckedDeviceDispatch.functions == compact.UncheckedDeviceFunctions
+
+
+def test_cache(tmp_path, load_wrapper):
+    sdk = tmp_path / 'sdk'
+    shutil.copytree(SDK, str(sdk))
+    header = sdk / 'include' / 'vulkan' / 'vulkan_core.h'
+    output = tmp_path / 'vk_fixture.py'
+    models = lambda: [name for name in os.listdir(str(tmp_path / 'cache')) if name.startswith('model-')]
+
+    assert 'up to date' not in generate(tmp_path, sdk=str(sdk))
+    assert 'up to date' in generate(tmp_path, sdk=str(sdk))
+
+    # A modified output, other options or other headers are generated again, with one model per SDK
+    output.write_text(output.read_text() + '\n')
+    assert 'up to date' not in generate(tmp_path, sdk=str(sdk))
+    model_time = os.stat(str(tmp_path / 'cache' / models()[0])).st_mtime_ns
+    assert 'up to date' not in generate(tmp_path, '--lazy', sdk=str(sdk))
+    assert os.stat(str(tmp_path / 'cache' / models()[0])).st_mtime_ns == model_time
+    header.write_text(header.read_text().replace('VK_NOT_READY = 1,', 'VK_NOT_READY = 1,\n    VK_TIMEOUT = 2,'))
+    assert 'up to date' not in generate(tmp_path, '--lazy', sdk=str(sdk))
+    assert len(models()) == 1
+    assert load_wrapper().TIMEOUT == 2
+
+    # The model of the previous headers is replaced
+    stale = tmp_path / 'cache' / models()[0]
+    model = stale.read_bytes()
+    header.write_text(header.read_text().replace('VK_TIMEOUT = 2,', 'VK_TIMEOUT = 3,'))
+    generate(tmp_path, '--lazy', sdk=str(sdk))
+    assert stale.read_bytes() != model and 'TIMEOUT = 3' in output.read_text()
+
+
+def test_no_cache(tmp_path):
+    assert 'up to date' not in generate(tmp_path, '--no-cache')
+    assert 'up to date' not in generate(tmp_path, '--no-cache')
+    assert not os.path.exists(str(tmp_path / 'cache'))
+
+
+def test_xml_wrapper(tmp_path, load_wrapper):
+    generate(tmp_path, '--no-cache', '--xml', os.path.join(FIXTURES, 'vk.xml'))
+    vk = load_wrapper()
+
+    assert (vk.STRUCTURE_TYPE_SUBMIT_INFO, vk.STRUCTURE_TYPE_FOO_KHR) == (4, 1000001000)
+    assert vk.DEBUG_REPORT_INFORMATION_BIT_EXT == 1 and vk.MAX_FOO == 4
+    assert [field[0] for field in vk.SubmitInfo._fields_] == ['type', 'next', 'command_buffer_count', 'command_buffers']
+    assert vk.SubmitInfoKHR is vk.SubmitInfo
+    assert vk.FnQueueSubmit._argtypes_ == (vk.Queue, c_uint32, POINTER(vk.SubmitInfo))
+    assert b'vkDestroySurfaceKHR' in dict(vk.InstanceFunctions)
+    assert vk._function_aliases == {'CmdFooKHR': 'CmdFoo'}
+
+    # The commands required by several versions and extensions, with the dependencies of the registry
+    assert 'CmdFoo' in vk.enabled_commands(vk.MAKE_VERSION(1, 1, 0))
+    assert 'CmdFoo' not in vk.enabled_commands(extensions=['VK_KHR_foo'])
+    assert set(['CmdFoo', 'CmdFooKHR']) <= vk.enabled_commands(extensions=['VK_KHR_foo', 'VK_KHR_surface'])
+
+
+def test_xml_cache(tmp_path, load_wrapper):
+    registry = tmp_path / 'vk.xml'
+    shutil.copy(os.path.join(FIXTURES, 'vk.xml'), str(registry))
+    assert 'up to date' not in generate(tmp_path, '--xml', str(registry))
+    assert 'up to date' in generate(tmp_path, '--xml', str(registry))
+
+    # A modified registry is parsed and generated again
+    registry.write_text(registry.read_text().replace('value="4" name="VK_MAX_FOO"', 'value="5" name="VK_MAX_FOO"'))
+    assert 'up to date' not in generate(tmp_path, '--xml', str(registry))
+    assert load_wrapper().MAX_FOO == 5
+
+
+def test_xml_core_types_reached_through_other_types(tmp_path, load_wrapper):
+    # `VkInstance`, `VkAllocationCallbacks` and `VkSystemAllocationScope` are only reached through the core commands, and
+    # `VkSubmitInfo` is also required by an extension through its alias `VkSubmitInfoKHR`
+    generate(tmp_path, '--no-cache', '--package', '--lazy', '--xml', os.path.join(FIXTURES, 'vk.xml'))
+    vk = load_wrapper()
+
+    assert vk._extension_names == {'khr_surface': 'SurfaceKHR FnDestroySurfaceKHR', 'khr_foo': 'FnCmdFooKHR'}
+    assert set(['Instance', 'SystemAllocationScope', 'AllocationCallbacks', 'SubmitInfo']) <= set(vk._definitions) | set(vars(vk))
+
+
+@pytest.mark.parametrize('options', [(), ('--lazy',), ('--compact',)])
+@pytest.mark.parametrize('source', [(), ('--xml', os.path.join(FIXTURES, 'vk.xml'))])
+def test_package_wrapper(tmp_path, load_wrapper, options, source):
+    generate(tmp_path, '--no-cache', '--package', *(options + source))
+    vk = load_wrapper()
+    extensions = lambda: sorted(name for name in sys.modules if name.startswith('vk_fixture.'))
+
+    # The core definitions do not import the extension modules
+    assert vk.DeviceDispatch.functions == vk.DeviceFunctions
+    assert vk.FnGetInstanceProcAddr._argtypes_[0] is vk.Instance
+    vk.AllocationCallbacks, vk.UncheckedDeviceDispatch
+    assert extensions() == []
+
+    # An extension is imported by the first use of one of its definitions
+    assert vk.FnDestroySurfaceKHR._argtypes_[:2] == (vk.Instance, vk.SurfaceKHR)
+    assert extensions() == ['vk_fixture.khr_surface']
+    assert vk.extension_module('VK_KHR_surface').InstanceFunctions[0][0] == b'vkDestroySurfaceKHR'
+    assert 'DestroySurfaceKHR' in vk.enabled_commands(extensions=['VK_KHR_surface'])
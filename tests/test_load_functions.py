@@ -0,0 +1,28 @@
+"Tests of load_functions and enabled_commands, with stub loaders instead of the Vulkan library"
+
+from ctypes import CFUNCTYPE, c_uint32, c_void_p, cast
+
+import vk
+
+
+def test_load_functions_collects_the_missing_commands(capsys):
+    prototype = CFUNCTYPE(c_uint32)
+    present = prototype(lambda: 7)
+    loader = lambda vk_object, name: cast(present, c_void_p) if name == b'vkGetValue' else None
+    functions = vk.load_functions(None, [(b'vkGetValue', prototype), (b'vkGetOther', prototype)], loader)
+    assert [(name, function()) for name, function in functions] == [('GetValue', 7)]
+    assert functions.missing == ['GetOther']
+    missing = []
+    assert vk.load_functions(None, [(b'vkGetOther', prototype)], loader, missing=missing).missing is missing == ['GetOther']
+    assert capsys.readouterr().out == ''
+
+
+def test_requirements_combine_versions_and_extensions():
+    version_1_1 = vk.MAKE_VERSION(1, 1, 0)
+    requirement = '(VK_KHR_synchronization2,VK_VERSION_1_3)+VK_KHR_ray_tracing_pipeline'
+    assert vk._requirement_enabled('VK_VERSION_1_1', version_1_1, set())
+    assert not vk._requirement_enabled('VK_VERSION_1_2', version_1_1, set())
+    assert vk._requirement_enabled('VK_KHR_swapchain+VK_VERSION_1_1', version_1_1, {'VK_KHR_swapchain'})
+    assert vk._requirement_enabled(requirement, version_1_1, {'VK_KHR_synchronization2', 'VK_KHR_ray_tracing_pipeline'})
+    assert vk._requirement_enabled(requirement, vk.MAKE_VERSION(1, 3, 0), {'VK_KHR_ray_tracing_pipeline'})
+    assert not vk._requirement_enabled(requirement, version_1_1, {'VK_KHR_ray_tracing_pipeline'})
@@ -0,0 +1,28 @@
+"Tests of the prepared calls, calling python callbacks through their C function pointers"
+
+from ctypes import CFUNCTYPE, POINTER, c_uint32, c_void_p
+
+import pytest
+
+import vk
+
+
+def test_prepared_call_converts_pointer_addresses(address):
+    echo = CFUNCTYPE(c_void_p, c_uint32, c_void_p)(lambda value, pointer: pointer)
+    assert vk.prepared_call(echo)(1, address) == address
+    assert vk.prepared_call(echo, 1)(address) == address
+
+
+def test_prepared_call_rejects_int_typed_pointers(address):
+    first = CFUNCTYPE(c_uint32, POINTER(c_uint32))(lambda pointer: pointer[0])
+    assert vk.prepared_call(first)((c_uint32 * 1)(7)) == 7
+    with pytest.raises(TypeError):
+        vk.prepared_call(first)(address)
+
+
+def test_prepared_call_of_an_unchecked_function(address):
+    echo = CFUNCTYPE(c_void_p, c_uint32, c_void_p)(lambda value, pointer: pointer)
+    unchecked = vk.unchecked_function(echo)
+    assert vk.prepared_call(unchecked)(1, address) == address
+    assert vk.prepared_call(unchecked, 1)(address) == address
+    assert vk.prepared_call(vk.unchecked_function(echo), 1, address)() == address
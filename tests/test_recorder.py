@@ -0,0 +1,75 @@
+"Tests of the CommandRecorder of vk_recorder.py with a stub dispatch table recording the calls instead of a Vulkan device"
+
+from ctypes import c_uint64
+
+import pytest
+
+from vk_recorder import CommandRecorder
+
+COMMAND_BUFFER = 7
+PIPELINE_BIND_POINT_GRAPHICS = 0
+
+
+def handles(*values):
+    return (c_uint64 * len(values))(*values)
+
+
+@pytest.fixture
+def recorder(functions):
+    return CommandRecorder(functions, COMMAND_BUFFER)
+
+
+def test_recorder_elides_redundant_binds(recorder, functions):
+    for _ in range(3):
+        recorder.CmdBindPipeline(PIPELINE_BIND_POINT_GRAPHICS, 11)
+        recorder.CmdBindVertexBuffers(0, 2, handles(21, 22), handles(0, 64))
+        recorder.CmdBindIndexBuffer(31, 0, 0)
+        recorder.CmdDraw(3, 1, 0, 0)
+    recorder.CmdBindPipeline(PIPELINE_BIND_POINT_GRAPHICS, 12)
+
+    assert functions.names() == [
+        'CmdBindPipeline', 'CmdBindVertexBuffers', 'CmdBindIndexBuffer', 'CmdDraw', 'CmdDraw', 'CmdDraw', 'CmdBindPipeline'
+    ]
+    assert functions.calls[0] == ('CmdBindPipeline', COMMAND_BUFFER, PIPELINE_BIND_POINT_GRAPHICS, 11)
+    assert recorder.issued['CmdBindPipeline'] == 2
+    assert recorder.elided['CmdBindPipeline'] == 2
+    assert recorder.elided['CmdBindVertexBuffers'] == 2
+
+
+def test_recorder_compares_the_bound_ranges(recorder, functions):
+    recorder.CmdBindVertexBuffers(0, 2, handles(21, 22), handles(0, 0))
+    recorder.CmdBindVertexBuffers(1, 1, handles(22), handles(0))
+    recorder.CmdBindVertexBuffers(1, 1, handles(23), handles(0))
+    assert recorder.issued['CmdBindVertexBuffers'] == 2
+    assert recorder.elided['CmdBindVertexBuffers'] == 1
+
+
+@pytest.mark.parametrize('command, args', [
+    ('CmdExecuteCommands', (1, handles(5))),
+    ('CmdBindVertexBuffers2', (0, 1, handles(21), handles(0), None, None)),
+    ('CmdPushDescriptorSetKHR', (PIPELINE_BIND_POINT_GRAPHICS, 41, 0, 0, None)),
+    ('CmdSetViewportWithCount', (0, None)),
+])
+def test_passthrough_commands_invalidate_the_state(recorder, functions, command, args):
+    recorder.CmdBindPipeline(PIPELINE_BIND_POINT_GRAPHICS, 11)
+    recorder.CmdBindVertexBuffers(0, 1, handles(21), handles(0))
+    getattr(recorder, command)(*args)
+    recorder.CmdBindPipeline(PIPELINE_BIND_POINT_GRAPHICS, 11)
+    recorder.CmdBindVertexBuffers(0, 1, handles(21), handles(0))
+
+    assert functions.names() == ['CmdBindPipeline', 'CmdBindVertexBuffers', command, 'CmdBindPipeline', 'CmdBindVertexBuffers']
+    assert functions.calls[2] == (command, COMMAND_BUFFER) + args
+
+
+def test_push_constants_keep_the_state(recorder, functions):
+    recorder.CmdBindPipeline(PIPELINE_BIND_POINT_GRAPHICS, 11)
+    recorder.CmdPushConstants(41, 1, 0, 4, None)
+    recorder.CmdBindPipeline(PIPELINE_BIND_POINT_GRAPHICS, 11)
+    assert functions.names() == ['CmdBindPipeline', 'CmdPushConstants']
+
+
+def test_invalidate_forgets_the_state(recorder, functions):
+    recorder.CmdBindIndexBuffer(31, 0, 0)
+    recorder.invalidate()
+    recorder.CmdBindIndexBuffer(31, 0, 0)
+    assert recorder.issued['CmdBindIndexBuffer'] == 2
@@ -0,0 +1,48 @@
+"Tests of DrawList.content_key and of the SecondaryCommandCache of vk_recorder.py, with a stub dispatch table"
+
+import vk
+from vk_recorder import DrawList, SecondaryCommandCache
+
+COMMAND_BUFFER = 7
+
+
+def test_content_key_follows_the_draws_and_states():
+    def draw_list(pipeline, vertex_count):
+        draws = DrawList()
+        draws.add(pipeline, (vertex_count, 1, 0, 0))
+        return draws
+
+    assert draw_list(11, 3).content_key() == draw_list(11, 3).content_key()
+    assert draw_list(11, 3).content_key() != draw_list(12, 3).content_key()
+    assert draw_list(11, 3).content_key() != draw_list(11, 6).content_key()
+
+
+def test_content_key_does_not_depend_on_the_state_ids():
+    def add_draws(draws, pipelines):
+        for pipeline in pipelines:
+            draws.add(pipeline, (3, 1, 0, 0), index_buffer=(31, 0, 0))
+        return draws
+
+    reused = add_draws(DrawList(), [12, 13])
+    reused.clear()
+    assert add_draws(reused, [11, 12, 11]).content_key() == add_draws(DrawList(), [11, 12, 11]).content_key()
+    assert add_draws(DrawList(), [11, 12, 11]).content_key() != add_draws(DrawList(), [12, 11, 12]).content_key()
+
+
+def test_secondary_command_cache_reuses_the_recorded_commands(functions):
+    cache = SecondaryCommandCache(vk, functions, 3, 4)
+    draws = DrawList()
+    draws.add(11, (3, 1, 0, 0))
+
+    assert not cache.execute(COMMAND_BUFFER, 'scene', draws, 61)
+    assert cache.execute(COMMAND_BUFFER, 'scene', draws, 61)
+    assert not cache.execute(COMMAND_BUFFER, 'scene', draws, 62)
+    draws.add(11, (6, 1, 0, 0))
+    assert not cache.execute(COMMAND_BUFFER, 'scene', draws, 62)
+    cache.invalidate('scene')
+    assert not cache.execute(COMMAND_BUFFER, 'scene', draws, 62)
+
+    assert (cache.hits, cache.misses) == (1, 4)
+    assert functions.names().count('AllocateCommandBuffers') == 1
+    assert functions.names().count('BeginCommandBuffer') == 4
+    assert functions.names().count('CmdExecuteCommands') == 5
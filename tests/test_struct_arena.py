@@ -0,0 +1,46 @@
+"Tests of StructArena"
+
+from ctypes import addressof, sizeof
+
+import vk
+
+
+def test_arena_allocates_zeroed_structures():
+    arena = vk.StructArena(256)
+    begin_info = arena.new(vk.CommandBufferBeginInfo, type=vk.STRUCTURE_TYPE_COMMAND_BUFFER_BEGIN_INFO, flags=1)
+    regions = arena.array(vk.BufferCopy, 2)
+    assert (begin_info.type, begin_info.flags, begin_info.next) == (vk.STRUCTURE_TYPE_COMMAND_BUFFER_BEGIN_INFO, 1, None)
+    assert [region.size for region in regions] == [0, 0]
+    assert addressof(regions) % 8 == 0 and addressof(regions) >= addressof(begin_info) + sizeof(begin_info)
+    assert arena.used == addressof(regions) + sizeof(regions) - addressof(begin_info)
+
+
+def test_arena_grows_without_moving_the_structures():
+    arena = vk.StructArena(64)
+    regions = [arena.new(vk.BufferCopy, size=index) for index in range(10)]
+    addresses = [addressof(region) for region in regions]
+    assert arena.size == 256
+    assert [region.size for region in regions] == list(range(10))
+
+    # The structures keep their address and their values until the reset, and the next frames keep the largest buffer
+    regions[0].src_offset = 5
+    assert [addressof(region) for region in regions] == addresses and regions[0].size == 0
+    arena.reset()
+    assert (arena.size, arena.used) == (256, 0)
+    large = arena.array(vk.BufferCopy, 20)
+    assert arena.size == 512 and addressof(large) % 8 == 0
+
+
+def test_arena_reset_reuses_the_structures():
+    arena = vk.StructArena(1024)
+    first = [arena.new(vk.BufferCopy, size=3), arena.new(vk.SubmitInfo, wait_semaphore_count=2)]
+    arena.reset()
+    second = [arena.new(vk.BufferCopy), arena.new(vk.SubmitInfo)]
+    assert [a is b for a, b in zip(first, second)] == [True, True]
+    assert (second[0].size, second[1].wait_semaphore_count) == (0, 0)
+
+    # A frame that allocates other structures does not reuse the next objects
+    arena.reset()
+    third = [arena.new(vk.BufferCopy), arena.new(vk.BufferCopy)]
+    assert third[0] is first[0] and third[1] is not first[1]
+    assert addressof(third[1]) == addressof(third[0]) + sizeof(vk.BufferCopy)
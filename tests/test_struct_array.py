@@ -0,0 +1,62 @@
+"Tests of StructArray, passed to python callbacks through C function pointers"
+
+from ctypes import CFUNCTYPE, POINTER, addressof, c_uint32
+
+import pytest
+
+import vk
+
+# Sum of the sizes of `count` BufferCopy regions
+SumSizes = CFUNCTYPE(c_uint32, c_uint32, POINTER(vk.BufferCopy))
+sum_sizes = SumSizes(lambda count, regions: sum(regions[index].size for index in range(count)))
+
+
+def test_struct_array_grows_and_keeps_its_storage():
+    regions = vk.StructArray(vk.BufferCopy)
+    assert (len(regions), regions.capacity) == (0, 0)
+    for size in (16, 32, 64):
+        regions.append().size = size
+    assert (len(regions), regions.capacity) == (3, 4)
+    assert [region.size for region in regions] == [16, 32, 64]
+
+    storage = addressof(regions[0])
+    regions.resize(1)
+    regions.resize(3)
+    assert [region.size for region in regions] == [16, 0, 0]
+    assert addressof(regions[0]) == storage
+
+    regions.clear()
+    regions.append(vk.BufferCopy(size=8))
+    assert (len(regions), regions.capacity, regions[-1].size) == (1, 4, 8)
+    with pytest.raises(IndexError):
+        regions[1]
+
+
+def test_struct_array_is_a_pointer_argument():
+    regions = vk.StructArray(vk.BufferCopy, 2)
+    regions[0].size, regions[1].size = 3, 4
+    assert sum_sizes(len(regions), regions) == 7
+    regions.append().size = 5
+    assert sum_sizes(len(regions), regions) == 12
+    assert vk.unchecked_function(sum_sizes)(len(regions), regions) == 12
+
+
+def test_struct_array_slices_are_views():
+    regions = vk.StructArray(vk.BufferCopy, 4)
+    view = regions[1:3]
+    view[0].size = 9
+    assert (len(view), regions[1].size) == (2, 9)
+    assert sum_sizes(len(view), view) == 9
+    with pytest.raises(ValueError):
+        view.resize(4)
+    with pytest.raises(ValueError):
+        regions[::2]
+
+
+def test_struct_array_numpy_views():
+    pytest.importorskip('numpy')
+    regions = vk.StructArray(vk.BufferCopy, 3, capacity=8)
+    regions.set('size', [16, 32, 64])
+    regions.set('src_offset', 128)
+    assert [(region.src_offset, region.size) for region in regions] == [(128, 16), (128, 32), (128, 64)]
+    assert regions[1:].numpy()['size'].tolist() == [32, 64]
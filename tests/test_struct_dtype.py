@@ -0,0 +1,57 @@
+"Tests of the NumPy structured dtypes of the structures"
+
+from ctypes import c_uint32, c_uint64, sizeof
+
+import pytest
+
+import vk
+
+numpy = pytest.importorskip('numpy')
+
+# The layout of `AccelerationStructureInstanceKHR`, after its transform
+InstanceKHR = vk.define_struct('InstanceKHR',
+    ('instance_custom_index', c_uint32, 24),
+    ('mask', c_uint32, 8),
+    ('instance_shader_binding_table_record_offset', c_uint32, 24),
+    ('flags', c_uint32, 8),
+    ('acceleration_structure_reference', c_uint64),
+)
+
+
+def test_dtype_has_the_layout_of_the_structure():
+    for struct in (vk.BufferCopy, vk.SubmitInfo, vk.ClearAttachment, vk.ClearValue, vk.PhysicalDeviceProperties):
+        dtype = vk.struct_dtype(struct)
+        assert dtype.itemsize == sizeof(struct)
+        assert [(name, dtype.fields[name][1]) for name in dtype.names] == [(name, getattr(struct, name).offset) for name, _ in struct._fields_]
+
+    assert vk.struct_dtype(vk.SubmitInfo)['command_buffers'] == numpy.dtype(numpy.uintp)
+    assert vk.struct_dtype(vk.ClearAttachment)['clear_value'] == vk.struct_dtype(vk.ClearValue)
+    assert vk.struct_dtype(vk.PhysicalDeviceProperties)['device_name'].shape == (vk.MAX_PHYSICAL_DEVICE_NAME_SIZE,)
+    assert vk.struct_dtype(vk.PhysicalDeviceImageFormatInfo2).names[:4] == ('type_0', 'next', 'format', 'type')
+
+
+def test_dtype_shares_the_memory_of_a_ctypes_array():
+    regions = numpy.zeros(3, vk.struct_dtype(vk.BufferCopy))
+    regions['size'] = [16, 32, 64]
+    array = vk.struct_array(regions, vk.BufferCopy)
+    assert [region.size for region in array] == [16, 32, 64]
+    array[1].src_offset = 256
+    assert regions['src_offset'].tolist() == [0, 256, 0]
+
+    with pytest.raises(ValueError):
+        vk.struct_array(regions[::2], vk.BufferCopy)
+
+
+def test_bit_fields_are_one_field_per_storage_unit():
+    dtype = vk.struct_dtype(InstanceKHR)
+    assert dtype.names == ('instance_custom_index', 'instance_shader_binding_table_record_offset', 'acceleration_structure_reference')
+    assert [dtype.fields[name][1] for name in dtype.names] == [0, 4, 8]
+
+    instances = (InstanceKHR * 2)()
+    instances[0].instance_custom_index, instances[0].mask = 5, 0xff
+    units = numpy.frombuffer(instances, dtype)
+    assert units['instance_custom_index'].tolist() == [0xff000005, 0]
+
+    units['instance_shader_binding_table_record_offset'] = 3 | 1 << 24
+    assert (instances[1].instance_shader_binding_table_record_offset, instances[1].flags) == (3, 1)
+    assert (instances[0].instance_custom_index, instances[0].mask) == (5, 0xff)
@@ -0,0 +1,36 @@
+"Tests of struct_factory"
+
+from ctypes import c_uint32
+
+import pytest
+
+import vk
+
+
+def test_factory_sets_the_structure_type():
+    BeginInfo = vk.struct_factory(vk.CommandBufferBeginInfo)
+    begin_info = BeginInfo(flags=1)
+    assert isinstance(begin_info, vk.CommandBufferBeginInfo)
+    assert (begin_info.type, begin_info.flags) == (vk.STRUCTURE_TYPE_COMMAND_BUFFER_BEGIN_INFO, 1)
+    assert vk.struct_factory(vk.CommandBufferBeginInfo) is BeginInfo
+    assert vk.struct_factory(vk.PhysicalDevice16BitStorageFeatures)().type == vk.STRUCTURE_TYPE_PHYSICAL_DEVICE_16BIT_STORAGE_FEATURES
+
+
+def test_factory_fields_are_keywords():
+    BeginInfo = vk.struct_factory(vk.CommandBufferBeginInfo)
+    # A positional value would be the structure type, like with the constructor
+    with pytest.raises(TypeError):
+        BeginInfo(None, 1)
+
+
+def test_factory_of_a_structure_with_a_second_type_field():
+    FormatInfo = vk.struct_factory(vk.PhysicalDeviceImageFormatInfo2)
+    format_info = FormatInfo(type=vk.IMAGE_TYPE_2D, usage=4)
+    assert c_uint32.from_buffer(format_info).value == vk.STRUCTURE_TYPE_PHYSICAL_DEVICE_IMAGE_FORMAT_INFO_2
+    assert (format_info.type, format_info.usage) == (vk.IMAGE_TYPE_2D, 4)
+    with pytest.raises(TypeError):
+        FormatInfo(vk.STRUCTURE_TYPE_PHYSICAL_DEVICE_IMAGE_FORMAT_INFO_2)
+
+
+def test_factory_of_a_structure_without_type():
+    assert vk.struct_factory(vk.Extent2D) is vk.Extent2D
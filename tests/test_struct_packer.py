@@ -0,0 +1,50 @@
+"Tests of struct_packer, pack_structs and unpack_structs"
+
+from ctypes import addressof, c_char, c_uint32, c_uint64, sizeof
+
+import vk
+
+InstanceKHR = vk.define_struct('InstanceKHR',
+    ('instance_custom_index', c_uint32, 24),
+    ('mask', c_uint32, 8),
+    ('acceleration_structure_reference', c_uint64),
+)
+
+
+def test_packers_have_the_size_of_the_structures():
+    for struct in (vk.BufferCopy, vk.DrawIndexedIndirectCommand, vk.SubmitInfo, vk.ClearAttachment, vk.PhysicalDeviceProperties,
+                   vk.PhysicalDeviceImageFormatInfo2, vk.GraphicsPipelineCreateInfo, InstanceKHR):
+        assert vk.struct_packer(struct).size == sizeof(struct)
+    assert vk.struct_packer(vk.BufferCopy) is vk.struct_packer(vk.BufferCopy)
+
+
+def test_pack_structs_round_trip():
+    items = [(36, 1, 0, -4, 0), (24, 2, 36, 0, 1)]
+    memory = (c_char * 128)()
+    assert vk.pack_structs(vk.DrawIndexedIndirectCommand, memory, items, offset=8) == 8 + 2 * 20
+    commands = (vk.DrawIndexedIndirectCommand * 2).from_buffer(memory, 8)
+    assert [(command.index_count, command.vertex_offset, command.first_instance) for command in commands] == [(36, -4, 0), (24, 0, 1)]
+    assert list(vk.unpack_structs(vk.DrawIndexedIndirectCommand, memory, 2, offset=8)) == items
+
+
+def test_unpack_structs_reads_the_ctypes_structures():
+    command_buffers = (vk.CommandBuffer * 1)(7)
+    infos = (vk.SubmitInfo * 2)()
+    infos[1].type, infos[1].command_buffer_count, infos[1].command_buffers = vk.STRUCTURE_TYPE_SUBMIT_INFO, 1, command_buffers
+    values = list(vk.unpack_structs(vk.SubmitInfo, infos))
+    assert len(values) == 2 and values[0] == (0,) * len(values[0])
+    assert values[1][:2] == (vk.STRUCTURE_TYPE_SUBMIT_INFO, 0)
+    assert values[1][5:7] == (1, addressof(command_buffers))
+
+    attachments = (vk.ClearAttachment * 1)()
+    attachments[0].color_attachment = 2
+    attachments[0].clear_value.color.float32[:] = [1.0, 0.5, 0.0, 1.0]
+    (aspect_mask, color_attachment, clear_value), = vk.unpack_structs(vk.ClearAttachment, attachments)
+    assert color_attachment == 2 and clear_value == bytes(attachments[0].clear_value)
+
+
+def test_bit_fields_are_packed_as_their_storage_unit():
+    instances = (InstanceKHR * 1)()
+    vk.pack_structs(InstanceKHR, instances, [(5 | 0xff << 24, 0x123456789)])
+    assert (instances[0].instance_custom_index, instances[0].mask) == (5, 0xff)
+    assert instances[0].acceleration_structure_reference == 0x123456789
@@ -0,0 +1,21 @@
+"Tests of the unchecked functions, calling python callbacks through their C function pointers"
+
+from ctypes import CFUNCTYPE, c_double, c_float, c_uint32, c_uint64, c_void_p, cast
+
+import vk
+
+
+def test_unchecked_functions_keep_the_64_bit_values(address):
+    echo = CFUNCTYPE(c_uint64, c_uint64, c_void_p, c_uint32, c_float)(lambda handle, pointer, value, number: handle + pointer + value + int(number))
+    unchecked = vk.unchecked_function(echo)
+    assert unchecked(address, address, 0xffffffff, 2.0) == 2 * address + 0xffffffff + 2
+    assert unchecked(c_uint64(address), c_void_p(address), 1, c_float(2.0)) == 2 * address + 3
+    assert cast(unchecked, c_void_p).value == cast(echo, c_void_p).value
+
+
+def test_unchecked_functions_convert_the_ints_given_as_floats():
+    second = CFUNCTYPE(c_float, c_uint32, c_float)(lambda value, number: number)
+    double = CFUNCTYPE(c_double, c_double)(lambda number: number)
+    assert vk.unchecked_function(second)(1, 2) == 2.0 == second(1, 2)
+    assert vk.unchecked_function(second)(1, 2.5) == 2.5
+    assert vk.unchecked_function(double)(3) == 3.0
@@ -0,0 +1,53 @@
+"Tests of the library loading of the wrapper. Importing the wrapper does not load the Vulkan library, so they run without one."
+
+from ctypes import byref, c_uint32
+import os
+import subprocess
+import sys
+
+import pytest
+
+import vk
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_import_does_not_load_the_library():
+    # A new process, where loading any library fails
+    code = "import ctypes\ndef fail(name): raise AssertionError(name)\nctypes.cdll.LoadLibrary = fail\nimport vk\nprint(vk.vk, vk.EnumerateInstanceVersion)"
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT, universal_newlines=True)
+    assert output == "None <vulkan loader function vkEnumerateInstanceVersion (not loaded)>\n"
+
+
+def test_first_call_loads_the_library(stub_loader):
+    assert vk.vk is None and stub_loader.libraries == []
+    version = c_uint32()
+    assert vk.EnumerateInstanceVersion(byref(version)) == vk.SUCCESS
+    assert version.value == vk.MAKE_VERSION(1, 1, 0)
+    assert stub_loader.libraries == [vk.LIBRARY_NAME] and vk.vk == 'library:' + vk.LIBRARY_NAME
+
+    # The loaded function replaces the loader function, and the library is loaded once
+    assert isinstance(vk.EnumerateInstanceVersion, vk.FnEnumerateInstanceVersion)
+    assert vk.EnumerateInstanceVersion(byref(version)) == vk.SUCCESS
+    assert stub_loader.libraries == [vk.LIBRARY_NAME] and stub_loader.resolved == [vk.vk]
+
+
+def test_load_library_overrides_the_library(stub_loader):
+    assert vk.load_library('/opt/vulkan/libvulkan.so.1') == 'library:/opt/vulkan/libvulkan.so.1'
+    assert vk.EnumerateInstanceVersion(byref(c_uint32())) == vk.SUCCESS
+    assert stub_loader.libraries == ['/opt/vulkan/libvulkan.so.1']
+    assert stub_loader.resolved == ['library:/opt/vulkan/libvulkan.so.1']
+
+    # Loading another library resolves the loader functions again, with the new library
+    vk.load_library('/opt/other/libvulkan.so.1')
+    assert isinstance(vk.EnumerateInstanceVersion, vk._LoaderFunction)
+    assert vk.EnumerateInstanceVersion(byref(c_uint32())) == vk.SUCCESS
+    assert stub_loader.resolved == ['library:/opt/vulkan/libvulkan.so.1', 'library:/opt/other/libvulkan.so.1']
+
+
+def test_missing_loader_functions_are_false(stub_loader):
+    stub_loader.commands.clear()
+    assert not vk.EnumerateInstanceVersion
+    with pytest.raises(RuntimeError):
+        vk.EnumerateInstanceVersion(byref(c_uint32()))
+    assert stub_loader.libraries == [vk.LIBRARY_NAME]
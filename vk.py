@@ -1,9 +1,9 @@
 #
-# Vulkan wrapper generated from "https://raw.githubusercontent.com/KhronosGroup/Vulkan-Docs/master/include/vulkan/vulkan_core.h"
+# Vulkan wrapper generated from Vulkan headers in the installed Vulkan SDK.
 #
 
-from ctypes import c_int8, c_uint16, c_int32, c_uint32, c_uint64, c_size_t, c_float, c_char, c_char_p, c_void_p, POINTER, Structure, Union, cast
-from platform import system
+from ctypes import c_int8, c_uint16, c_int32, c_uint32, c_int64, c_uint64, c_size_t, c_float, c_double, c_char, c_char_p, c_void_p, POINTER, Structure, Union, cast, sizeof, alignment, memmove, memset, addressof, _CFuncPtr, _Pointer
+import sys
 
 # Helper functions
 repr_fn = lambda self: str(dict(self._fields_))
@@ -17,35 +17,603 @@ def define_struct(name, *args):
 def define_union(name, *args):
     return type(name, (Union,), {'_fields_': args, '__repr__': repr_fn})
 
-def load_functions(vk_object, functions_list, loader):
-    functions = []
+def load_function(vk_object, name, prototype, loader):
+    "Load a single function. Return None if it could not be loaded."
+    fn_ptr = cast(loader(vk_object, name), c_void_p)
+    return prototype(fn_ptr.value) if fn_ptr else None
+
+class LoadedFunctions(list):
+    "The (name, function) pairs returned by `load_functions`, with the names of the commands that could not be loaded in `missing`"
+    __slots__ = ('missing',)
+
+def load_functions(vk_object, functions_list, loader, enabled=None, missing=None):
+    "Load the commands of a function family. With `enabled` (see `enabled_commands`), only the enabled commands are looked up, and a promoted command is looked up once for all its enabled names."
+    # The names of the commands that could not be loaded are appended to `missing`, a new list when none is given
+    functions = LoadedFunctions()
+    functions.missing = missing = [] if missing is None else missing
+    addresses = {}
     for name, prototype in functions_list:
         py_name = name.decode()[2::]
-        fn_ptr = loader(vk_object, name)
-        fn_ptr = cast(fn_ptr, c_void_p)
+        if enabled is None:
+            fn_ptr = cast(loader(vk_object, name), c_void_p).value
+        elif py_name in enabled:
+            promoted = _function_aliases.get(py_name, py_name)
+            if promoted not in addresses:
+                lookup = promoted if promoted in enabled else py_name
+                addresses[promoted] = cast(loader(vk_object, ('vk' + lookup).encode()), c_void_p).value
+            fn_ptr = addresses[promoted]
+        else:
+            continue
+
         if fn_ptr:
-            fn = prototype(fn_ptr.value)
-            functions.append((py_name, fn))
-        elif __debug__ == True:
-            print('Function {} could not be loaded. (__debug__ == True)'.format(py_name))
+            functions.append((py_name, prototype(fn_ptr)))
+        else:
+            missing.append(py_name)
     return functions
 
+def enabled_commands(api_version=None, extensions=()):
+    "Return the names of the commands of the core versions up to `api_version` (default: 1.0) and of the `extensions`"
+    api_version = API_VERSION_1_0 if api_version is None else api_version
+    extensions = set(e.decode() if isinstance(e, bytes) else e for e in extensions)
+    names = set()
+    for requirement, commands in _function_requires.items():
+        if _requirement_enabled(requirement, api_version, extensions):
+            names.update(commands.split())
+    return frozenset(names)
+
+def _requirement_enabled(requirement, api_version, extensions):
+    # A core version, an extension, or a dependency expression of vk.xml (ex: `VK_KHR_swapchain+VK_VERSION_1_1`) where
+    # `+` is an and and `,` an or. The registry puts the mixed operators in parentheses, they are read from left to right.
+    for operator in '(),+':
+        requirement = requirement.replace(operator, ' {} '.format(operator))
+    stack = []
+    value, operator = None, None
+    for token in requirement.split():
+        if token == '(':
+            stack.append((value, operator))
+            value, operator = None, None
+            continue
+        elif token in ('+', ','):
+            operator = token
+            continue
+        elif token == ')':
+            enabled = value
+            value, operator = stack.pop()
+        elif token.startswith('VK_VERSION_'):
+            major, minor = token[11:].split('_')
+            enabled = MAKE_VERSION(int(major), int(minor), 0) <= api_version
+        else:
+            enabled = token in extensions
+        value = enabled if operator is None else (value and enabled) if operator == '+' else (value or enabled)
+    return value
+
+def define_dispatch(name, *functions_lists):
+    "Create a dispatch table class with a slot per command of the function families. The commands are loaded by the constructor, or on their first use when `lazy` is true."
+    # The names of the commands that could not be loaded are in the `missing` list of the tables
+    functions, prototypes = [], {}
+    for functions_list in functions_lists:
+        for fn_name, prototype in functions_list:
+            py_name = fn_name.decode()[2::]
+            if py_name not in prototypes:
+                prototypes[py_name] = prototype
+                functions.append((fn_name, prototype))
+
+    def __init__(self, vk_object, loader, lazy=False, enabled=None):
+        self._vk_object = vk_object
+        self._loader = loader if lazy else None
+        self._enabled = enabled
+        self.missing = []
+        if not lazy:
+            # The slots have no __dict__ to update in bulk. Setting them costs a few percent of the lookups of the commands.
+            for fn_name, fn in load_functions(vk_object, functions, loader, enabled, self.missing):
+                setattr(self, fn_name, fn)
+
+    def __getattr__(self, py_name):
+        # Only called for the slots that are not set: the commands that are not loaded yet
+        prototype = prototypes.get(py_name)
+        if prototype is None:
+            raise AttributeError("{!r} object has no attribute {!r}".format(name, py_name))
+        enabled = self._enabled
+        if enabled is not None and py_name not in enabled:
+            raise AttributeError("Function {} is not enabled".format(py_name))
+        if self._loader is not None:
+            promoted = _function_aliases.get(py_name, py_name)
+            lookup = promoted if enabled is not None and promoted in enabled else py_name
+            fn = load_function(self._vk_object, ('vk' + lookup).encode(), prototype, self._loader)
+            if fn is not None:
+                setattr(self, py_name, fn)
+                return fn
+            if py_name not in self.missing:
+                self.missing.append(py_name)
+        raise AttributeError("Function {} could not be loaded".format(py_name))
+
+    slots = tuple(fn_name.decode()[2::] for fn_name, _ in functions) + ('_vk_object', '_loader', '_enabled', 'missing')
+    return type(name, (object,), {'__slots__': slots, '__init__': __init__, '__getattr__': __getattr__, 'functions': tuple(functions)})
+
+_unchecked_types = {}
+_unchecked_calls = {}
+
+def _unchecked_type(prototype):
+    # The C function type with the return type and the calling convention of `prototype`, but without argument types
+    key = (prototype._restype_, prototype._flags_)
+    unchecked = _unchecked_types.get(key)
+    if unchecked is None:
+        unchecked = _unchecked_types[key] = type('UncheckedFunction', (_CFuncPtr,), {'_restype_': prototype._restype_, '_flags_': prototype._flags_})
+    return unchecked
+
+def _argument_conversion(argtype):
+    # Without argument type, a python int is passed as a 32-bit C integer and a python float is not accepted. The ints
+    # given for the 64-bit integers and the pointers, and the ints and floats given for the floats, are wrapped in the
+    # ctypes type of the argument.
+    code = getattr(argtype, '_type_', None)
+    if argtype is None or not isinstance(code, str):
+        return None if argtype is None or not issubclass(argtype, (_Pointer, _CFuncPtr)) else 'c_void_p'
+    if code in 'PzZ':
+        return 'c_void_p'
+    if code in 'fd':
+        return 'c_float' if code == 'f' else 'c_double'
+    if code in 'qQlL' and sizeof(argtype) > 4:
+        return 'c_int64' if code in 'ql' else 'c_uint64'
+    return None
+
+def _unchecked_call(prototype):
+    # The builder of the unchecked calls of a prototype, generated once for the prototypes with the same conversions
+    conversions = tuple(_argument_conversion(argtype) for argtype in prototype._argtypes_ or ())
+    key = (prototype._restype_, prototype._flags_, conversions)
+    make = _unchecked_calls.get(key)
+    if make is None:
+        names = ['a{}'.format(index) for index in range(len(conversions))]
+        arguments = [name if conversion is None else '{0}({1}) if {1}.__class__ {2} else {1}'.format(conversion, name, 'in (int, float)' if conversion in ('c_float', 'c_double') else 'is int') for name, conversion in zip(names, conversions)]
+        source = 'def make(address):\n    fn = unchecked(address)\n    def call({}):\n        return fn({})\n    call._as_parameter_ = fn\n    return call\n'.format(', '.join(names), ', '.join(arguments))
+        namespace = {'unchecked': _unchecked_type(prototype), 'c_void_p': c_void_p, 'c_float': c_float, 'c_double': c_double, 'c_int64': c_int64, 'c_uint64': c_uint64}
+        exec(source, namespace)
+        make = _unchecked_calls[key] = namespace['make']
+    return make
+
+def unchecked_prototype(prototype):
+    "Return a prototype calling the functions of `prototype` without converting their arguments, except the python ints and floats that a C function without argument types would truncate or refuse"
+    # The call is generated when the first function is loaded, not when the family is built
+    built = []
+    def make(address):
+        if not built:
+            built.append(_unchecked_call(prototype))
+        call = built[0](address)
+        call._prototype_ = prototype
+        return call
+    return make
+
+def unchecked_function(fn):
+    "Return the unchecked version of a loaded function (see `unchecked_prototype`)"
+    return unchecked_prototype(type(fn))(cast(fn, c_void_p).value)
+
+def unchecked_functions(functions_list):
+    "Return the function family loading the functions of `functions_list` with their unchecked prototype"
+    return tuple((name, unchecked_prototype(prototype)) for name, prototype in functions_list)
+
+def _needs_conversion(argtype):
+    # Without conversion, a python int is passed as a 32-bit C integer and a python float is not accepted. An int given
+    # as a pointer (ex: an address for `c_void_p`) would be truncated, the pointer types convert it or raise TypeError.
+    if argtype is None:
+        return False
+    pointer = isinstance(getattr(argtype, '_type_', None), str) and argtype._type_ in 'PzZ'
+    return pointer or issubclass(argtype, (c_uint64, c_int64, c_size_t, c_float, c_double, _Pointer, _CFuncPtr))
+
+def prepared_call(fn, *arguments):
+    "Return a call of the loaded function `fn` with its leading `arguments` bound and converted once. It takes the other arguments."
+    from functools import partial
+    prototype = getattr(fn, '_prototype_', None)
+    if prototype is not None:
+        # An unchecked function (see `unchecked_prototype`) has no argument types, its prototype has them
+        fn = prototype(cast(fn, c_void_p).value)
+    argtypes = fn.argtypes or ()
+    bound = tuple(argtype.from_param(value) if argtype is not None else value for argtype, value in zip(argtypes + (None,) * len(arguments), arguments))
+    call = partial(_unchecked_type(type(fn))(cast(fn, c_void_p).value), *bound)
+
+    # Only the arguments that would be passed the wrong way are converted on each call
+    converters = [(index, argtype.from_param) for index, argtype in enumerate(argtypes[len(arguments):]) if _needs_conversion(argtype)]
+    if not converters:
+        return call
+
+    def converting_call(*args):
+        args = list(args)
+        for index, from_param in converters:
+            args[index] = from_param(args[index])
+        return call(*args)
+    return converting_call
+
+_struct_dtypes = {}
+
+def _field_dtype(numpy, ctype):
+    if issubclass(ctype, (Structure, Union)):
+        return struct_dtype(ctype)
+    elif hasattr(ctype, '_length_'):
+        return numpy.dtype((_field_dtype(numpy, ctype._type_), (ctype._length_,)))
+    elif isinstance(getattr(ctype, '_type_', None), str) and ctype._type_ not in 'PzZ':
+        return numpy.dtype(ctype)
+    return numpy.dtype(numpy.uintp)     # Pointers and function pointers, as addresses
+
+def _struct_fields(struct):
+    "Return the [(name, type, offset)] of the fields of a structure or union. The bit fields of a storage unit are one field, named after the first of them."
+    fields = []
+    end = 0
+    union = issubclass(struct, Union)
+    for index, field in enumerate(struct._fields_):
+        name, ctype = field[0], field[1]
+        if any(other[0] == name for other in struct._fields_[index + 1:]):
+            # Only the last field of a name is a ctypes attribute. The other fields are named with their index.
+            name = '{}_{}'.format(name, index)
+            offset = 0 if union else -(-end // alignment(ctype)) * alignment(ctype)
+        else:
+            offset = getattr(struct, name).offset
+        if offset < end and not union:
+            continue    # The next bit fields of a storage unit, whose offset is the offset of the unit
+        fields.append((name, ctype, offset))
+        end = offset + sizeof(ctype)
+    return fields
+
+def struct_dtype(struct):
+    "Return the NumPy structured dtype of a structure or union: the same field names, offsets and size. The pointers are addresses (uintp)."
+    dtype = _struct_dtypes.get(struct)
+    if dtype is None:
+        import numpy
+        names, types, offsets = zip(*_struct_fields(struct)) if struct._fields_ else ((), (), ())
+        formats = [_field_dtype(numpy, ctype) for ctype in types]
+        dtype = _struct_dtypes[struct] = numpy.dtype({'names': list(names), 'formats': formats, 'offsets': list(offsets), 'itemsize': sizeof(struct)}, align=True)
+    return dtype
+
+def struct_array(array, struct):
+    "Return a ctypes array of `struct` sharing the memory of a NumPy array (ex: of `struct_dtype(struct)`). It is passed as a `POINTER(struct)` argument without copy."
+    if array.dtype.itemsize != sizeof(struct) or not array.flags.c_contiguous:
+        raise ValueError("The array must be a contiguous array of items of {} bytes".format(sizeof(struct)))
+    return (struct * len(array)).from_buffer(array)
+
+_struct_packers = {}
+
+def _pack_format(ctype):
+    # Format of the values of a type, flattened, with the padding of the structures
+    if issubclass(ctype, Structure):
+        formats = []
+        end = 0
+        for _, field_type, offset in _struct_fields(ctype):
+            formats.append('{}x'.format(offset - end) if offset > end else '')
+            formats.append(_pack_format(field_type))
+            end = offset + sizeof(field_type)
+        formats.append('{}x'.format(sizeof(ctype) - end) if sizeof(ctype) > end else '')
+        return ''.join(formats)
+    elif hasattr(ctype, '_length_'):
+        if ctype._type_ is c_char:
+            return '{}s'.format(ctype._length_)
+        return _pack_format(ctype._type_) * ctype._length_
+    elif issubclass(ctype, Union):
+        return '{}s'.format(sizeof(ctype))    # The bytes of the largest member
+    elif isinstance(getattr(ctype, '_type_', None), str) and ctype._type_ in 'fdc?':
+        return ctype._type_
+    elif isinstance(getattr(ctype, '_type_', None), str) and ctype._type_ not in 'PzZ' and ctype._type_.islower():
+        return {1: 'b', 2: 'h', 4: 'i', 8: 'q'}[sizeof(ctype)]
+    return {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}[sizeof(ctype)]  # Unsigned integers, pointers and function pointers as addresses
+
+def struct_packer(struct):
+    "Return the `struct.Struct` packing a structure as its values, in the order of the fields. The nested structures and arrays are flattened, the pointers are addresses."
+    # The format has the padding and the size of the ctypes type, so consecutive items are an array of the structure
+    packer = _struct_packers.get(struct)
+    if packer is None:
+        from struct import Struct
+        packer = _struct_packers[struct] = Struct('=' + _pack_format(struct))
+    return packer
+
+def pack_structs(struct, buffer, items, offset=0):
+    "Pack the values of the `items` (sequences of values, see `struct_packer`) as consecutive structures in a writable `buffer`. Return the offset after the last item."
+    # Packing the items in a single bytes object and copying it once is faster than a `pack_into` per item
+    from itertools import starmap
+    data = b''.join(starmap(struct_packer(struct).pack, items))
+    memoryview(buffer).cast('B')[offset:offset + len(data)] = data
+    return offset + len(data)
+
+def unpack_structs(struct, buffer, count=None, offset=0):
+    "Return an iterator over the values of the consecutive structures of a `buffer`: `count` structures, or up to the end of the buffer"
+    packer = struct_packer(struct)
+    view = memoryview(buffer).cast('B')[offset:]
+    if count is None:
+        count = len(view) // packer.size
+    return packer.iter_unpack(view[:count * packer.size])
+
+class StructArray(object):
+    "Growable array of a structure, passed as a `POINTER(struct)` argument without copy. Its storage is kept when it shrinks."
+    # The slices are views of the same storage, and cannot be resized
+
+    __slots__ = ('struct', '_storage', '_start', '_length', '_is_view', '_parameter')
+
+    def __init__(self, struct, length=0, capacity=0):
+        self.struct = struct
+        self._storage = (struct * max(length, capacity))()
+        self._start = 0
+        self._length = length
+        self._is_view = False
+        self._parameter = None
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self):
+        return self._length if self._is_view else len(self._storage)
+
+    def resize(self, length):
+        "Set the number of items. The new items are zeroed, and the storage only grows (by doubling its capacity) when it is too small."
+        if self._is_view:
+            raise ValueError("A view of a StructArray cannot be resized")
+        if length == self._length:
+            return
+        size = sizeof(self.struct)
+        if length > len(self._storage):
+            storage = (self.struct * max(length, 2 * len(self._storage)))()
+            memmove(storage, self._storage, self._length * size)
+            self._storage = storage
+        elif length > self._length:
+            memset(addressof(self._storage) + (self._start + self._length) * size, 0, (length - self._length) * size)
+        self._length = length
+        self._parameter = None
+
+    def clear(self):
+        self.resize(0)
+
+    def append(self, item=None):
+        "Add an item, a copy of the structure `item` or zeroed, and return it. The returned structure shares the memory of the array."
+        self.resize(self._length + 1)
+        if item is not None:
+            self[self._length - 1] = item
+        return self._storage[self._start + self._length - 1]
+
+    def _index(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("StructArray index out of range")
+        return self._start + index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                raise ValueError("A StructArray slice cannot have a step")
+            view = StructArray(self.struct)
+            view._storage, view._start, view._length, view._is_view = self._storage, self._start + start, max(stop - start, 0), True
+            return view
+        return self._storage[self._index(index)]
+
+    def __setitem__(self, index, item):
+        self._storage[self._index(index)] = item
+
+    def __iter__(self):
+        storage = self._storage
+        return (storage[index] for index in range(self._start, self._start + self._length))
+
+    @property
+    def _as_parameter_(self):
+        # A pointer to the first item, cached until the array is resized. It keeps a reference to the storage.
+        parameter = self._parameter
+        if parameter is None:
+            items = (self.struct * self._length).from_buffer(self._storage, self._start * sizeof(self.struct))
+            parameter = self._parameter = cast(items, POINTER(self.struct))
+        return parameter
+
+    def numpy(self):
+        "Return a NumPy array of the items (see `struct_dtype`) sharing the memory of the array, until the array grows"
+        import numpy
+        return numpy.frombuffer(self._storage, struct_dtype(self.struct), self._length, self._start * sizeof(self.struct))
+
+    def set(self, field, values):
+        "Set the field `field` of every item from a sequence (or a single value), with a vectorized NumPy assignment"
+        self.numpy()[field] = values
+
+class StructArena(object):
+    "Bump allocator of the transient structures of a frame in one ctypes buffer. `reset` frees all the structures at once."
+    # The memory after the last structure is always zero: `reset` zeroes the used memory once, instead of every new structure.
+    # The structure objects are kept in allocation order, and the frames that allocate the same structures reuse the same objects.
+
+    __slots__ = ('_buffer', '_address', '_offset', '_count', '_structs', '_retired')
+
+    def __init__(self, size=65536):
+        self._buffer = None
+        self._retired = []
+        self._count = 0
+        self._allocate(size)
+
+    def _allocate(self, size):
+        if self._buffer is not None:
+            self._retired.append(self._buffer)
+        self._buffer = (c_char * size)()
+        self._address = addressof(self._buffer)
+        self._offset = 0
+        # [(type, structure, end offset)] of the allocations in this buffer, the first `_count` are in use
+        self._structs = []
+
+    @property
+    def size(self):
+        return len(self._buffer)
+
+    @property
+    def used(self):
+        return self._offset
+
+    def new(self, struct, **fields):
+        "Return a zeroed structure allocated in the arena, with the `fields` set. It is valid until the arena is reset."
+        count = self._count
+        structs = self._structs
+        if count < len(structs) and structs[count][0] is struct:
+            _, value, self._offset = structs[count]
+        else:
+            align = alignment(struct)
+            offset = -(-self._offset // align) * align
+            if offset + sizeof(struct) > len(self._buffer):
+                # The full buffer is kept until the reset, for the structures allocated in it
+                self._allocate(max(2 * len(self._buffer), sizeof(struct) + align))
+                self._count = 0
+                return self.new(struct, **fields)
+            value = struct.from_address(self._address + offset)
+            self._offset = offset + sizeof(struct)
+            # The frame diverges from the previous one, the next objects cannot be reused
+            del structs[count:]
+            structs.append((struct, value, self._offset))
+
+        self._count = count + 1
+        for name, field in fields.items():
+            setattr(value, name, field)
+        return value
+
+    def array(self, struct, count):
+        "Return a zeroed array of `count` structures allocated in the arena, valid until the arena is reset"
+        return self.new(struct * count)
+
+    def reset(self):
+        "Free every structure of the arena. The structures allocated before must not be used anymore."
+        memset(self._address, 0, self._offset)
+        self._offset = 0
+        self._count = 0
+        # The arena keeps its largest buffer, and the next frames do not need to grow it
+        self._retired = []
+
+_struct_factories = {}
+_structure_types = {}
+
+def _structure_type(struct):
+    # The STRUCTURE_TYPE value of a structure is named after the structure (ex: `PhysicalDeviceVulkan11Features`
+    # and `STRUCTURE_TYPE_PHYSICAL_DEVICE_VULKAN_1_1_FEATURES`), without the underscores the names are the same
+    if not _structure_types:
+        for name, value in list(globals().items()):
+            if name.startswith('STRUCTURE_TYPE_'):
+                _structure_types[name[15:].replace('_', '')] = value
+    return _structure_types.get(struct.__name__.upper())
+
+def struct_factory(struct):
+    "Return a callable creating `struct` structures with their STRUCTURE_TYPE set, and the other fields given as keywords"
+    factory = _struct_factories.get(struct)
+    if factory is not None:
+        return factory
+
+    fields = struct._fields_
+    structure_type = _structure_type(struct) if fields[:1] and fields[0][0] == 'type' else None
+    if structure_type is None:
+        # Nothing to fill in
+        factory = struct
+    elif any(field[0] == 'type' for field in fields[1:]):
+        # A few structures have a second `type` field (ex: the image type of `PhysicalDeviceImageFormatInfo2`), that is
+        # the one set by name. The structure type is written at its offset.
+        def factory(**fields):
+            value = struct(**fields)
+            c_uint32.from_buffer(value).value = structure_type
+            return value
+        factory.__name__ = factory.__qualname__ = struct.__name__
+    else:
+        # The ctypes constructor sets the fields in C, a partial of it runs at the same speed. A positional value would
+        # also set `type`, which the constructor refuses.
+        from functools import partial
+        factory = partial(struct, type=structure_type)
+
+    _struct_factories[struct] = factory
+    return factory
+
+def device_dispatch(instance, device, lazy=False, dispatch_class=None, enabled=None):
+    "Create a dispatch table (`DeviceDispatch` by default) of the commands of `device`, loaded with its `GetDeviceProcAddr` instead of the loader trampolines"
+    module = sys.modules[__name__]
+    get_device_proc_addr = load_function(instance, b"vkGetDeviceProcAddr", module.FnGetDeviceProcAddr, GetInstanceProcAddr)
+    if get_device_proc_addr is None:
+        raise RuntimeError("Function vkGetDeviceProcAddr could not be loaded")
+    return (dispatch_class or module.DeviceDispatch)(device, get_device_proc_addr, lazy, enabled)
+
+def dispatch_trampolines(instance, dispatch):
+    "Return the names of the loaded commands of a dispatch table that are the loader trampolines returned by `GetInstanceProcAddr`"
+    trampolines = []
+    dispatch_class = type(dispatch)
+    for fn_name, _ in dispatch_class.functions:
+        py_name = fn_name.decode()[2::]
+        try:
+            # Read the slot directly: the commands of a lazy table must not be loaded here
+            fn = getattr(dispatch_class, py_name).__get__(dispatch, dispatch_class)
+        except AttributeError:
+            continue
+        if cast(fn, c_void_p).value == cast(GetInstanceProcAddr(instance, fn_name), c_void_p).value:
+            trampolines.append(py_name)
+    return trampolines
+
 API_VERSION_1_0 = MAKE_VERSION(1,0,0)
 
 # System initialization
-system_name = system()
+system_name = 'Windows' if sys.platform == 'win32' else 'Linux' if sys.platform.startswith('linux') else sys.platform
 if system_name == 'Windows':
     from ctypes import WINFUNCTYPE, windll
     FUNCTYPE = WINFUNCTYPE
-    vk = windll.LoadLibrary('vulkan-1')
+    LoadLibrary = windll.LoadLibrary
+    LIBRARY_NAME = 'vulkan-1'
 elif system_name == 'Linux':
     from ctypes import CFUNCTYPE, cdll
     FUNCTYPE = CFUNCTYPE
-    vk = cdll.LoadLibrary('libvulkan.so.1')
+    LoadLibrary = cdll.LoadLibrary
+    LIBRARY_NAME = 'libvulkan.so.1'
+
+# Library loading. The vulkan library is only loaded by the first call of a loader function, or by `load_library`.
+vk = None
+_loader_functions = {}
+
+def load_library(name=None):
+    "Load the vulkan library, or the library `name` (ex: a specific loader or a test stub). The loader functions are resolved again on their next call."
+    global vk
+    vk = LoadLibrary(name or LIBRARY_NAME)
+    module_namespace = globals()
+    for fn_name, loader_function in _loader_functions.items():
+        loader_function.function = None
+        loader_function.missing = False
+        module_namespace[fn_name] = loader_function
+    return vk
+
+def _load_loader_function(name):
+    prototype = getattr(sys.modules[__name__], 'Fn' + name)
+    library = vk if vk is not None else load_library()
+    if name == 'GetInstanceProcAddr':
+        return prototype((b"vkGetInstanceProcAddr", library))
+    return load_function(Instance(0), b'vk' + name.encode(), prototype, _loader_functions['GetInstanceProcAddr'])
+
+class _LoaderFunction(object):
+    "Loader function resolved on its first call or truth test. The resolved function then replaces it in the module namespace."
+    # A function the loader does not have (ex: `EnumerateInstanceVersion` with a Vulkan 1.0 loader) is false
+    __slots__ = ('name', 'function', 'missing')
+
+    def __init__(self, name):
+        self.name = name
+        self.function = None
+        self.missing = False
+
+    def _resolve(self):
+        if self.function is None and not self.missing:
+            function = self.function = _load_loader_function(self.name)
+            self.missing = function is None
+            if function is not None:
+                globals()[self.name] = function
+        return self.function
+
+    def __call__(self, *args):
+        function = self.function or self._resolve()
+        if function is None:
+            raise RuntimeError("Function vk{} could not be loaded".format(self.name))
+        return function(*args)
+
+    def __bool__(self):
+        return self._resolve() is not None
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        state = '' if self.function is not None else ' (missing)' if self.missing else ' (not loaded)'
+        return '<vulkan loader function vk{}{}>'.format(self.name, state)
+
+def _define_loader_functions(names):
+    module_namespace = globals()
+    for name in names.split():
+        module_namespace[name] = _loader_functions[name] = _LoaderFunction(name)
 
 # System types
 HINSTANCE = c_size_t
 HWND = c_size_t
+HMONITOR = c_size_t
 HANDLE = c_size_t
 DWORD = c_uint32
 BOOL = c_uint32
@@ -2235,14 +2803,15 @@ MEMORY_OVERALLOCATION_BEHAVIOR_RANGE_SIZE_AMD = (MEMORY_OVERALLOCATION_BEHAVIOR_
 
 # Allocation callback
 FnAllocationFunction = FUNCTYPE(c_void_p, c_void_p, c_size_t, c_size_t, SystemAllocationScope)
-FnReallocationFunction = FUNCTYPE(c_void_p, c_void_p, c_size_t, c_size_t, SystemAllocationScope)
+FnReallocationFunction = FUNCTYPE(c_void_p, c_void_p, c_void_p, c_size_t, c_size_t, SystemAllocationScope)
 FnFreeFunction = FUNCTYPE(None, c_void_p, c_void_p)
 FnInternalAllocationNotification = FUNCTYPE(None, c_void_p, c_size_t, InternalAllocationType, SystemAllocationScope)
 FnInternalFreeNotification = FUNCTYPE(None, c_void_p, c_size_t, InternalAllocationType, SystemAllocationScope)
-FnDebugReportCallbackEXT = FUNCTYPE(Bool32, DebugReportFlagsEXT, DebugReportObjectTypeEXT, c_uint64, c_size_t, c_uint32, c_char_p, c_char_p, c_void_p)
+FnDebugReportCallbackEXT = FUNCTYPE(Bool32, DebugReportFlagsEXT, DebugReportObjectTypeEXT, c_uint64, c_size_t, c_int32, c_char_p, c_char_p, c_void_p)
 
 
 
+# Structures
 ApplicationInfo = define_struct('ApplicationInfo', 
     ('type', StructureType),
     ('next', c_void_p),
@@ -5467,6 +6036,7 @@ XcbSurfaceCreateInfoKHR = define_struct('XcbSurfaceCreateInfoKHR',
 
 
 
+# Function prototypes
 FnVoidFunction = FUNCTYPE(None, )
 FnCreateInstance = FUNCTYPE(Result, POINTER(InstanceCreateInfo), POINTER(AllocationCallbacks), POINTER(Instance))
 FnDestroyInstance = FUNCTYPE(None, Instance, POINTER(AllocationCallbacks))
@@ -5494,7 +6064,7 @@ FnFreeMemory = FUNCTYPE(None, Device, DeviceMemory, POINTER(AllocationCallbacks)
 FnMapMemory = FUNCTYPE(Result, Device, DeviceMemory, DeviceSize, DeviceSize, MemoryMapFlags, POINTER(c_void_p))
 FnUnmapMemory = FUNCTYPE(None, Device, DeviceMemory)
 FnFlushMappedMemoryRanges = FUNCTYPE(Result, Device, c_uint32, POINTER(MappedMemoryRange))
-FnInvalidateMappedMemoryRanges = FUNCTYPE(Result, Device, c_uint32, POINTER(MappedMemoryRange))
+FnInvalidateMappedMemoryRanges = FnFlushMappedMemoryRanges
 FnGetDeviceMemoryCommitment = FUNCTYPE(None, Device, DeviceMemory, POINTER(DeviceSize))
 FnBindBufferMemory = FUNCTYPE(Result, Device, Buffer, DeviceMemory, DeviceSize)
 FnBindImageMemory = FUNCTYPE(Result, Device, Image, DeviceMemory, DeviceSize)
@@ -5513,8 +6083,8 @@ FnDestroySemaphore = FUNCTYPE(None, Device, Semaphore, POINTER(AllocationCallbac
 FnCreateEvent = FUNCTYPE(Result, Device, POINTER(EventCreateInfo), POINTER(AllocationCallbacks), POINTER(Event))
 FnDestroyEvent = FUNCTYPE(None, Device, Event, POINTER(AllocationCallbacks))
 FnGetEventStatus = FUNCTYPE(Result, Device, Event)
-FnSetEvent = FUNCTYPE(Result, Device, Event)
-FnResetEvent = FUNCTYPE(Result, Device, Event)
+FnSetEvent = FnGetEventStatus
+FnResetEvent = FnGetEventStatus
 FnCreateQueryPool = FUNCTYPE(Result, Device, POINTER(QueryPoolCreateInfo), POINTER(AllocationCallbacks), POINTER(QueryPool))
 FnDestroyQueryPool = FUNCTYPE(None, Device, QueryPool, POINTER(AllocationCallbacks))
 FnGetQueryPoolResults = FUNCTYPE(Result, Device, QueryPool, c_uint32, c_uint32, c_size_t, c_void_p, DeviceSize, QueryResultFlags)
@@ -5566,18 +6136,18 @@ FnCmdSetViewport = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Vie
 FnCmdSetScissor = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Rect2D))
 FnCmdSetLineWidth = FUNCTYPE(None, CommandBuffer, c_float)
 FnCmdSetDepthBias = FUNCTYPE(None, CommandBuffer, c_float, c_float, c_float)
-FnCmdSetBlendConstants = FUNCTYPE(None, CommandBuffer)
+FnCmdSetBlendConstants = FUNCTYPE(None, CommandBuffer, POINTER(c_float))
 FnCmdSetDepthBounds = FUNCTYPE(None, CommandBuffer, c_float, c_float)
 FnCmdSetStencilCompareMask = FUNCTYPE(None, CommandBuffer, StencilFaceFlags, c_uint32)
-FnCmdSetStencilWriteMask = FUNCTYPE(None, CommandBuffer, StencilFaceFlags, c_uint32)
-FnCmdSetStencilReference = FUNCTYPE(None, CommandBuffer, StencilFaceFlags, c_uint32)
+FnCmdSetStencilWriteMask = FnCmdSetStencilCompareMask
+FnCmdSetStencilReference = FnCmdSetStencilCompareMask
 FnCmdBindDescriptorSets = FUNCTYPE(None, CommandBuffer, PipelineBindPoint, PipelineLayout, c_uint32, c_uint32, POINTER(DescriptorSet), c_uint32, POINTER(c_uint32))
 FnCmdBindIndexBuffer = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, IndexType)
 FnCmdBindVertexBuffers = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Buffer), POINTER(DeviceSize))
 FnCmdDraw = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, c_uint32, c_uint32)
 FnCmdDrawIndexed = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, c_uint32, c_int32, c_uint32)
 FnCmdDrawIndirect = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, c_uint32, c_uint32)
-FnCmdDrawIndexedIndirect = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, c_uint32, c_uint32)
+FnCmdDrawIndexedIndirect = FnCmdDrawIndirect
 FnCmdDispatch = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, c_uint32)
 FnCmdDispatchIndirect = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize)
 FnCmdCopyBuffer = FUNCTYPE(None, CommandBuffer, Buffer, Buffer, c_uint32, POINTER(BufferCopy))
@@ -5592,7 +6162,7 @@ FnCmdClearDepthStencilImage = FUNCTYPE(None, CommandBuffer, Image, ImageLayout,
 FnCmdClearAttachments = FUNCTYPE(None, CommandBuffer, c_uint32, POINTER(ClearAttachment), c_uint32, POINTER(ClearRect))
 FnCmdResolveImage = FUNCTYPE(None, CommandBuffer, Image, ImageLayout, Image, ImageLayout, c_uint32, POINTER(ImageResolve))
 FnCmdSetEvent = FUNCTYPE(None, CommandBuffer, Event, PipelineStageFlags)
-FnCmdResetEvent = FUNCTYPE(None, CommandBuffer, Event, PipelineStageFlags)
+FnCmdResetEvent = FnCmdSetEvent
 FnCmdWaitEvents = FUNCTYPE(None, CommandBuffer, c_uint32, POINTER(Event), PipelineStageFlags, PipelineStageFlags, c_uint32, POINTER(MemoryBarrier), c_uint32, POINTER(BufferMemoryBarrier), c_uint32, POINTER(ImageMemoryBarrier))
 FnCmdPipelineBarrier = FUNCTYPE(None, CommandBuffer, PipelineStageFlags, PipelineStageFlags, DependencyFlags, c_uint32, POINTER(MemoryBarrier), c_uint32, POINTER(BufferMemoryBarrier), c_uint32, POINTER(ImageMemoryBarrier))
 FnCmdBeginQuery = FUNCTYPE(None, CommandBuffer, QueryPool, c_uint32, QueryControlFlags)
@@ -5655,35 +6225,35 @@ FnCreateDisplayModeKHR = FUNCTYPE(Result, PhysicalDevice, DisplayKHR, POINTER(Di
 FnGetDisplayPlaneCapabilitiesKHR = FUNCTYPE(Result, PhysicalDevice, DisplayModeKHR, c_uint32, POINTER(DisplayPlaneCapabilitiesKHR))
 FnCreateDisplayPlaneSurfaceKHR = FUNCTYPE(Result, Instance, POINTER(DisplaySurfaceCreateInfoKHR), POINTER(AllocationCallbacks), POINTER(SurfaceKHR))
 FnCreateSharedSwapchainsKHR = FUNCTYPE(Result, Device, c_uint32, POINTER(SwapchainCreateInfoKHR), POINTER(AllocationCallbacks), POINTER(SwapchainKHR))
-FnGetPhysicalDeviceFeatures2KHR = FUNCTYPE(None, PhysicalDevice, POINTER(PhysicalDeviceFeatures2))
-FnGetPhysicalDeviceProperties2KHR = FUNCTYPE(None, PhysicalDevice, POINTER(PhysicalDeviceProperties2))
-FnGetPhysicalDeviceFormatProperties2KHR = FUNCTYPE(None, PhysicalDevice, Format, POINTER(FormatProperties2))
-FnGetPhysicalDeviceImageFormatProperties2KHR = FUNCTYPE(Result, PhysicalDevice, POINTER(PhysicalDeviceImageFormatInfo2), POINTER(ImageFormatProperties2))
-FnGetPhysicalDeviceQueueFamilyProperties2KHR = FUNCTYPE(None, PhysicalDevice, POINTER(c_uint32), POINTER(QueueFamilyProperties2))
-FnGetPhysicalDeviceMemoryProperties2KHR = FUNCTYPE(None, PhysicalDevice, POINTER(PhysicalDeviceMemoryProperties2))
-FnGetPhysicalDeviceSparseImageFormatProperties2KHR = FUNCTYPE(None, PhysicalDevice, POINTER(PhysicalDeviceSparseImageFormatInfo2), POINTER(c_uint32), POINTER(SparseImageFormatProperties2))
-FnGetDeviceGroupPeerMemoryFeaturesKHR = FUNCTYPE(None, Device, c_uint32, c_uint32, c_uint32, POINTER(PeerMemoryFeatureFlags))
-FnCmdSetDeviceMaskKHR = FUNCTYPE(None, CommandBuffer, c_uint32)
-FnCmdDispatchBaseKHR = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, c_uint32, c_uint32, c_uint32, c_uint32)
-FnTrimCommandPoolKHR = FUNCTYPE(None, Device, CommandPool, CommandPoolTrimFlags)
-FnEnumeratePhysicalDeviceGroupsKHR = FUNCTYPE(Result, Instance, POINTER(c_uint32), POINTER(PhysicalDeviceGroupProperties))
-FnGetPhysicalDeviceExternalBufferPropertiesKHR = FUNCTYPE(None, PhysicalDevice, POINTER(PhysicalDeviceExternalBufferInfo), POINTER(ExternalBufferProperties))
+FnGetPhysicalDeviceFeatures2KHR = FnGetPhysicalDeviceFeatures2
+FnGetPhysicalDeviceProperties2KHR = FnGetPhysicalDeviceProperties2
+FnGetPhysicalDeviceFormatProperties2KHR = FnGetPhysicalDeviceFormatProperties2
+FnGetPhysicalDeviceImageFormatProperties2KHR = FnGetPhysicalDeviceImageFormatProperties2
+FnGetPhysicalDeviceQueueFamilyProperties2KHR = FnGetPhysicalDeviceQueueFamilyProperties2
+FnGetPhysicalDeviceMemoryProperties2KHR = FnGetPhysicalDeviceMemoryProperties2
+FnGetPhysicalDeviceSparseImageFormatProperties2KHR = FnGetPhysicalDeviceSparseImageFormatProperties2
+FnGetDeviceGroupPeerMemoryFeaturesKHR = FnGetDeviceGroupPeerMemoryFeatures
+FnCmdSetDeviceMaskKHR = FnCmdSetDeviceMask
+FnCmdDispatchBaseKHR = FnCmdDispatchBase
+FnTrimCommandPoolKHR = FnTrimCommandPool
+FnEnumeratePhysicalDeviceGroupsKHR = FnEnumeratePhysicalDeviceGroups
+FnGetPhysicalDeviceExternalBufferPropertiesKHR = FnGetPhysicalDeviceExternalBufferProperties
 FnGetMemoryFdKHR = FUNCTYPE(Result, Device, POINTER(MemoryGetFdInfoKHR), POINTER(c_int32))
 FnGetMemoryFdPropertiesKHR = FUNCTYPE(Result, Device, ExternalMemoryHandleTypeFlagBits, c_int32, POINTER(MemoryFdPropertiesKHR))
-FnGetPhysicalDeviceExternalSemaphorePropertiesKHR = FUNCTYPE(None, PhysicalDevice, POINTER(PhysicalDeviceExternalSemaphoreInfo), POINTER(ExternalSemaphoreProperties))
+FnGetPhysicalDeviceExternalSemaphorePropertiesKHR = FnGetPhysicalDeviceExternalSemaphoreProperties
 FnImportSemaphoreFdKHR = FUNCTYPE(Result, Device, POINTER(ImportSemaphoreFdInfoKHR))
 FnGetSemaphoreFdKHR = FUNCTYPE(Result, Device, POINTER(SemaphoreGetFdInfoKHR), POINTER(c_int32))
 FnCmdPushDescriptorSetKHR = FUNCTYPE(None, CommandBuffer, PipelineBindPoint, PipelineLayout, c_uint32, c_uint32, POINTER(WriteDescriptorSet))
 FnCmdPushDescriptorSetWithTemplateKHR = FUNCTYPE(None, CommandBuffer, DescriptorUpdateTemplate, PipelineLayout, c_uint32, c_void_p)
-FnCreateDescriptorUpdateTemplateKHR = FUNCTYPE(Result, Device, POINTER(DescriptorUpdateTemplateCreateInfo), POINTER(AllocationCallbacks), POINTER(DescriptorUpdateTemplate))
-FnDestroyDescriptorUpdateTemplateKHR = FUNCTYPE(None, Device, DescriptorUpdateTemplate, POINTER(AllocationCallbacks))
-FnUpdateDescriptorSetWithTemplateKHR = FUNCTYPE(None, Device, DescriptorSet, DescriptorUpdateTemplate, c_void_p)
+FnCreateDescriptorUpdateTemplateKHR = FnCreateDescriptorUpdateTemplate
+FnDestroyDescriptorUpdateTemplateKHR = FnDestroyDescriptorUpdateTemplate
+FnUpdateDescriptorSetWithTemplateKHR = FnUpdateDescriptorSetWithTemplate
 FnCreateRenderPass2KHR = FUNCTYPE(Result, Device, POINTER(RenderPassCreateInfo2KHR), POINTER(AllocationCallbacks), POINTER(RenderPass))
 FnCmdBeginRenderPass2KHR = FUNCTYPE(None, CommandBuffer, POINTER(RenderPassBeginInfo), POINTER(SubpassBeginInfoKHR))
 FnCmdNextSubpass2KHR = FUNCTYPE(None, CommandBuffer, POINTER(SubpassBeginInfoKHR), POINTER(SubpassEndInfoKHR))
 FnCmdEndRenderPass2KHR = FUNCTYPE(None, CommandBuffer, POINTER(SubpassEndInfoKHR))
 FnGetSwapchainStatusKHR = FUNCTYPE(Result, Device, SwapchainKHR)
-FnGetPhysicalDeviceExternalFencePropertiesKHR = FUNCTYPE(None, PhysicalDevice, POINTER(PhysicalDeviceExternalFenceInfo), POINTER(ExternalFenceProperties))
+FnGetPhysicalDeviceExternalFencePropertiesKHR = FnGetPhysicalDeviceExternalFenceProperties
 FnImportFenceFdKHR = FUNCTYPE(Result, Device, POINTER(ImportFenceFdInfoKHR))
 FnGetFenceFdKHR = FUNCTYPE(Result, Device, POINTER(FenceGetFdInfoKHR), POINTER(c_int32))
 FnGetPhysicalDeviceSurfaceCapabilities2KHR = FUNCTYPE(Result, PhysicalDevice, POINTER(PhysicalDeviceSurfaceInfo2KHR), POINTER(SurfaceCapabilities2KHR))
@@ -5692,36 +6262,36 @@ FnGetPhysicalDeviceDisplayProperties2KHR = FUNCTYPE(Result, PhysicalDevice, POIN
 FnGetPhysicalDeviceDisplayPlaneProperties2KHR = FUNCTYPE(Result, PhysicalDevice, POINTER(c_uint32), POINTER(DisplayPlaneProperties2KHR))
 FnGetDisplayModeProperties2KHR = FUNCTYPE(Result, PhysicalDevice, DisplayKHR, POINTER(c_uint32), POINTER(DisplayModeProperties2KHR))
 FnGetDisplayPlaneCapabilities2KHR = FUNCTYPE(Result, PhysicalDevice, POINTER(DisplayPlaneInfo2KHR), POINTER(DisplayPlaneCapabilities2KHR))
-FnGetImageMemoryRequirements2KHR = FUNCTYPE(None, Device, POINTER(ImageMemoryRequirementsInfo2), POINTER(MemoryRequirements2))
-FnGetBufferMemoryRequirements2KHR = FUNCTYPE(None, Device, POINTER(BufferMemoryRequirementsInfo2), POINTER(MemoryRequirements2))
-FnGetImageSparseMemoryRequirements2KHR = FUNCTYPE(None, Device, POINTER(ImageSparseMemoryRequirementsInfo2), POINTER(c_uint32), POINTER(SparseImageMemoryRequirements2))
-FnCreateSamplerYcbcrConversionKHR = FUNCTYPE(Result, Device, POINTER(SamplerYcbcrConversionCreateInfo), POINTER(AllocationCallbacks), POINTER(SamplerYcbcrConversion))
-FnDestroySamplerYcbcrConversionKHR = FUNCTYPE(None, Device, SamplerYcbcrConversion, POINTER(AllocationCallbacks))
-FnBindBufferMemory2KHR = FUNCTYPE(Result, Device, c_uint32, POINTER(BindBufferMemoryInfo))
-FnBindImageMemory2KHR = FUNCTYPE(Result, Device, c_uint32, POINTER(BindImageMemoryInfo))
-FnGetDescriptorSetLayoutSupportKHR = FUNCTYPE(None, Device, POINTER(DescriptorSetLayoutCreateInfo), POINTER(DescriptorSetLayoutSupport))
+FnGetImageMemoryRequirements2KHR = FnGetImageMemoryRequirements2
+FnGetBufferMemoryRequirements2KHR = FnGetBufferMemoryRequirements2
+FnGetImageSparseMemoryRequirements2KHR = FnGetImageSparseMemoryRequirements2
+FnCreateSamplerYcbcrConversionKHR = FnCreateSamplerYcbcrConversion
+FnDestroySamplerYcbcrConversionKHR = FnDestroySamplerYcbcrConversion
+FnBindBufferMemory2KHR = FnBindBufferMemory2
+FnBindImageMemory2KHR = FnBindImageMemory2
+FnGetDescriptorSetLayoutSupportKHR = FnGetDescriptorSetLayoutSupport
 FnCmdDrawIndirectCountKHR = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, Buffer, DeviceSize, c_uint32, c_uint32)
-FnCmdDrawIndexedIndirectCountKHR = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, Buffer, DeviceSize, c_uint32, c_uint32)
+FnCmdDrawIndexedIndirectCountKHR = FnCmdDrawIndirectCountKHR
 FnCreateDebugReportCallbackEXT = FUNCTYPE(Result, Instance, POINTER(DebugReportCallbackCreateInfoEXT), POINTER(AllocationCallbacks), POINTER(DebugReportCallbackEXT))
 FnDestroyDebugReportCallbackEXT = FUNCTYPE(None, Instance, DebugReportCallbackEXT, POINTER(AllocationCallbacks))
 FnDebugReportMessageEXT = FUNCTYPE(None, Instance, DebugReportFlagsEXT, DebugReportObjectTypeEXT, c_uint64, c_size_t, c_int32, c_char_p, c_char_p)
 FnDebugMarkerSetObjectTagEXT = FUNCTYPE(Result, Device, POINTER(DebugMarkerObjectTagInfoEXT))
 FnDebugMarkerSetObjectNameEXT = FUNCTYPE(Result, Device, POINTER(DebugMarkerObjectNameInfoEXT))
 FnCmdDebugMarkerBeginEXT = FUNCTYPE(None, CommandBuffer, POINTER(DebugMarkerMarkerInfoEXT))
-FnCmdDebugMarkerEndEXT = FUNCTYPE(None, CommandBuffer)
-FnCmdDebugMarkerInsertEXT = FUNCTYPE(None, CommandBuffer, POINTER(DebugMarkerMarkerInfoEXT))
+FnCmdDebugMarkerEndEXT = FnCmdEndRenderPass
+FnCmdDebugMarkerInsertEXT = FnCmdDebugMarkerBeginEXT
 FnCmdBindTransformFeedbackBuffersEXT = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Buffer), POINTER(DeviceSize), POINTER(DeviceSize))
-FnCmdBeginTransformFeedbackEXT = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Buffer), POINTER(DeviceSize))
-FnCmdEndTransformFeedbackEXT = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Buffer), POINTER(DeviceSize))
+FnCmdBeginTransformFeedbackEXT = FnCmdBindVertexBuffers
+FnCmdEndTransformFeedbackEXT = FnCmdBindVertexBuffers
 FnCmdBeginQueryIndexedEXT = FUNCTYPE(None, CommandBuffer, QueryPool, c_uint32, QueryControlFlags, c_uint32)
-FnCmdEndQueryIndexedEXT = FUNCTYPE(None, CommandBuffer, QueryPool, c_uint32, c_uint32)
+FnCmdEndQueryIndexedEXT = FnCmdResetQueryPool
 FnCmdDrawIndirectByteCountEXT = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, Buffer, DeviceSize, c_uint32, c_uint32)
-FnCmdDrawIndirectCountAMD = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, Buffer, DeviceSize, c_uint32, c_uint32)
-FnCmdDrawIndexedIndirectCountAMD = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, Buffer, DeviceSize, c_uint32, c_uint32)
+FnCmdDrawIndirectCountAMD = FnCmdDrawIndirectCountKHR
+FnCmdDrawIndexedIndirectCountAMD = FnCmdDrawIndirectCountKHR
 FnGetShaderInfoAMD = FUNCTYPE(Result, Device, Pipeline, ShaderStageFlagBits, ShaderInfoTypeAMD, POINTER(c_size_t), c_void_p)
 FnGetPhysicalDeviceExternalImageFormatPropertiesNV = FUNCTYPE(Result, PhysicalDevice, Format, ImageType, ImageTiling, ImageUsageFlags, ImageCreateFlags, ExternalMemoryHandleTypeFlagsNV, POINTER(ExternalImageFormatPropertiesNV))
 FnCmdBeginConditionalRenderingEXT = FUNCTYPE(None, CommandBuffer, POINTER(ConditionalRenderingBeginInfoEXT))
-FnCmdEndConditionalRenderingEXT = FUNCTYPE(None, CommandBuffer)
+FnCmdEndConditionalRenderingEXT = FnCmdEndRenderPass
 FnCmdProcessCommandsNVX = FUNCTYPE(None, CommandBuffer, POINTER(CmdProcessCommandsInfoNVX))
 FnCmdReserveSpaceForCommandsNVX = FUNCTYPE(None, CommandBuffer, POINTER(CmdReserveSpaceForCommandsInfoNVX))
 FnCreateIndirectCommandsLayoutNVX = FUNCTYPE(Result, Device, POINTER(IndirectCommandsLayoutCreateInfoNVX), POINTER(AllocationCallbacks), POINTER(IndirectCommandsLayoutNVX))
@@ -5740,17 +6310,17 @@ FnRegisterDisplayEventEXT = FUNCTYPE(Result, Device, DisplayKHR, POINTER(Display
 FnGetSwapchainCounterEXT = FUNCTYPE(Result, Device, SwapchainKHR, SurfaceCounterFlagBitsEXT, POINTER(c_uint64))
 FnGetRefreshCycleDurationGOOGLE = FUNCTYPE(Result, Device, SwapchainKHR, POINTER(RefreshCycleDurationGOOGLE))
 FnGetPastPresentationTimingGOOGLE = FUNCTYPE(Result, Device, SwapchainKHR, POINTER(c_uint32), POINTER(PastPresentationTimingGOOGLE))
-FnCmdSetDiscardRectangleEXT = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Rect2D))
+FnCmdSetDiscardRectangleEXT = FnCmdSetScissor
 FnSetHdrMetadataEXT = FUNCTYPE(None, Device, c_uint32, POINTER(SwapchainKHR), POINTER(HdrMetadataEXT))
 FnDebugUtilsMessengerCallbackEXT = FUNCTYPE(Bool32, DebugUtilsMessageSeverityFlagBitsEXT, DebugUtilsMessageTypeFlagsEXT, POINTER(DebugUtilsMessengerCallbackDataEXT), c_void_p)
 FnSetDebugUtilsObjectNameEXT = FUNCTYPE(Result, Device, POINTER(DebugUtilsObjectNameInfoEXT))
 FnSetDebugUtilsObjectTagEXT = FUNCTYPE(Result, Device, POINTER(DebugUtilsObjectTagInfoEXT))
 FnQueueBeginDebugUtilsLabelEXT = FUNCTYPE(None, Queue, POINTER(DebugUtilsLabelEXT))
 FnQueueEndDebugUtilsLabelEXT = FUNCTYPE(None, Queue)
-FnQueueInsertDebugUtilsLabelEXT = FUNCTYPE(None, Queue, POINTER(DebugUtilsLabelEXT))
+FnQueueInsertDebugUtilsLabelEXT = FnQueueBeginDebugUtilsLabelEXT
 FnCmdBeginDebugUtilsLabelEXT = FUNCTYPE(None, CommandBuffer, POINTER(DebugUtilsLabelEXT))
-FnCmdEndDebugUtilsLabelEXT = FUNCTYPE(None, CommandBuffer)
-FnCmdInsertDebugUtilsLabelEXT = FUNCTYPE(None, CommandBuffer, POINTER(DebugUtilsLabelEXT))
+FnCmdEndDebugUtilsLabelEXT = FnCmdEndRenderPass
+FnCmdInsertDebugUtilsLabelEXT = FnCmdBeginDebugUtilsLabelEXT
 FnCreateDebugUtilsMessengerEXT = FUNCTYPE(Result, Instance, POINTER(DebugUtilsMessengerCreateInfoEXT), POINTER(AllocationCallbacks), POINTER(DebugUtilsMessengerEXT))
 FnDestroyDebugUtilsMessengerEXT = FUNCTYPE(None, Instance, DebugUtilsMessengerEXT, POINTER(AllocationCallbacks))
 FnSubmitDebugUtilsMessageEXT = FUNCTYPE(None, Instance, DebugUtilsMessageSeverityFlagBitsEXT, DebugUtilsMessageTypeFlagsEXT, POINTER(DebugUtilsMessengerCallbackDataEXT))
@@ -5781,9 +6351,9 @@ FnCmdWriteBufferMarkerAMD = FUNCTYPE(None, CommandBuffer, PipelineStageFlagBits,
 FnGetPhysicalDeviceCalibrateableTimeDomainsEXT = FUNCTYPE(Result, PhysicalDevice, POINTER(c_uint32), POINTER(TimeDomainEXT))
 FnGetCalibratedTimestampsEXT = FUNCTYPE(Result, Device, c_uint32, POINTER(CalibratedTimestampInfoEXT), POINTER(c_uint64), POINTER(c_uint64))
 FnCmdDrawMeshTasksNV = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32)
-FnCmdDrawMeshTasksIndirectNV = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, c_uint32, c_uint32)
-FnCmdDrawMeshTasksIndirectCountNV = FUNCTYPE(None, CommandBuffer, Buffer, DeviceSize, Buffer, DeviceSize, c_uint32, c_uint32)
-FnCmdSetExclusiveScissorNV = FUNCTYPE(None, CommandBuffer, c_uint32, c_uint32, POINTER(Rect2D))
+FnCmdDrawMeshTasksIndirectNV = FnCmdDrawIndirect
+FnCmdDrawMeshTasksIndirectCountNV = FnCmdDrawIndirectCountKHR
+FnCmdSetExclusiveScissorNV = FnCmdSetScissor
 FnCmdSetCheckpointNV = FUNCTYPE(None, CommandBuffer, c_void_p)
 FnGetQueueCheckpointDataNV = FUNCTYPE(None, Queue, POINTER(c_uint32), POINTER(CheckpointDataNV))
 FnCreateWin32SurfaceKHR = FUNCTYPE(Result, Instance, POINTER(Win32SurfaceCreateInfoKHR), POINTER(AllocationCallbacks), POINTER(SurfaceKHR))
@@ -5799,6 +6369,7 @@ FnCreateXcbSurfaceKHR = FUNCTYPE(Result, Instance, POINTER(XcbSurfaceCreateInfoK
 FnGetPhysicalDeviceXcbPresentationSupportKHR = FUNCTYPE(Bool32, PhysicalDevice, c_uint32, POINTER(xcb_connection_t), xcb_visualid_t)
 
 
+# Function families
 InstanceFunctions = (
   (b"vkDestroyInstance", FnDestroyInstance),
   (b"vkEnumeratePhysicalDevices", FnEnumeratePhysicalDevices),
@@ -6134,16 +6705,109 @@ LoaderFunctions = (
   (b"vkEnumerateInstanceExtensionProperties", FnEnumerateInstanceExtensionProperties),
   (b"vkEnumerateInstanceLayerProperties", FnEnumerateInstanceLayerProperties),
   (b"vkEnumerateInstanceVersion", FnEnumerateInstanceVersion),
-  (b"vkDebugUtilsMessengerCallbackEXT", FnDebugUtilsMessengerCallbackEXT),
 )
 
 
+# Dispatch tables
+InstanceDispatch = define_dispatch('InstanceDispatch', InstanceFunctions)
+DeviceDispatch = define_dispatch('DeviceDispatch', DeviceFunctions)
+UncheckedDeviceFunctions = unchecked_functions(DeviceFunctions)
+UncheckedDeviceDispatch = define_dispatch('UncheckedDeviceDispatch', UncheckedDeviceFunctions)
+
+
+# Function requirements
+_function_requires = {
+    'VK_VERSION_1_0': 'CreateInstance DestroyInstance EnumeratePhysicalDevices GetPhysicalDeviceFeatures GetPhysicalDeviceFormatProperties GetPhysicalDeviceImageFormatProperties GetPhysicalDeviceProperties GetPhysicalDeviceQueueFamilyProperties GetPhysicalDeviceMemoryProperties GetInstanceProcAddr GetDeviceProcAddr CreateDevice DestroyDevice EnumerateInstanceExtensionProperties EnumerateDeviceExtensionProperties EnumerateInstanceLayerProperties EnumerateDeviceLayerProperties GetDeviceQueue QueueSubmit QueueWaitIdle DeviceWaitIdle AllocateMemory FreeMemory MapMemory UnmapMemory FlushMappedMemoryRanges InvalidateMappedMemoryRanges GetDeviceMemoryCommitment BindBufferMemory BindImageMemory GetBufferMemoryRequirements GetImageMemoryRequirements GetImageSparseMemoryRequirements GetPhysicalDeviceSparseImageFormatProperties QueueBindSparse CreateFence DestroyFence ResetFences GetFenceStatus WaitForFences CreateSemaphore DestroySemaphore CreateEvent DestroyEvent GetEventStatus SetEvent ResetEvent CreateQueryPool DestroyQueryPool GetQueryPoolResults CreateBuffer DestroyBuffer CreateBufferView DestroyBufferView CreateImage DestroyImage GetImageSubresourceLayout CreateImageView DestroyImageView CreateShaderModule DestroyShaderModule CreatePipelineCache DestroyPipelineCache GetPipelineCacheData MergePipelineCaches CreateGraphicsPipelines CreateComputePipelines DestroyPipeline CreatePipelineLayout DestroyPipelineLayout CreateSampler DestroySampler CreateDescriptorSetLayout DestroyDescriptorSetLayout CreateDescriptorPool DestroyDescriptorPool ResetDescriptorPool AllocateDescriptorSets FreeDescriptorSets UpdateDescriptorSets CreateFramebuffer DestroyFramebuffer CreateRenderPass DestroyRenderPass GetRenderAreaGranularity CreateCommandPool DestroyCommandPool ResetCommandPool AllocateCommandBuffers FreeCommandBuffers BeginCommandBuffer EndCommandBuffer ResetCommandBuffer CmdBindPipeline CmdSetViewport CmdSetScissor CmdSetLineWidth CmdSetDepthBias CmdSetBlendConstants CmdSetDepthBounds CmdSetStencilCompareMask CmdSetStencilWriteMask CmdSetStencilReference CmdBindDescriptorSets CmdBindIndexBuffer CmdBindVertexBuffers CmdDraw CmdDrawIndexed CmdDrawIndirect CmdDrawIndexedIndirect CmdDispatch CmdDispatchIndirect CmdCopyBuffer CmdCopyImage CmdBlitImage CmdCopyBufferToImage CmdCopyImageToBuffer CmdUpdateBuffer CmdFillBuffer CmdClearColorImage CmdClearDepthStencilImage CmdClearAttachments CmdResolveImage CmdSetEvent CmdResetEvent CmdWaitEvents CmdPipelineBarrier CmdBeginQuery CmdEndQuery CmdResetQueryPool CmdWriteTimestamp CmdCopyQueryPoolResults CmdPushConstants CmdBeginRenderPass CmdNextSubpass CmdEndRenderPass CmdExecuteCommands',
+    'VK_VERSION_1_1': 'EnumerateInstanceVersion BindBufferMemory2 BindImageMemory2 GetDeviceGroupPeerMemoryFeatures CmdSetDeviceMask CmdDispatchBase EnumeratePhysicalDeviceGroups GetImageMemoryRequirements2 GetBufferMemoryRequirements2 GetImageSparseMemoryRequirements2 GetPhysicalDeviceFeatures2 GetPhysicalDeviceProperties2 GetPhysicalDeviceFormatProperties2 GetPhysicalDeviceImageFormatProperties2 GetPhysicalDeviceQueueFamilyProperties2 GetPhysicalDeviceMemoryProperties2 GetPhysicalDeviceSparseImageFormatProperties2 TrimCommandPool GetDeviceQueue2 CreateSamplerYcbcrConversion DestroySamplerYcbcrConversion CreateDescriptorUpdateTemplate DestroyDescriptorUpdateTemplate UpdateDescriptorSetWithTemplate GetPhysicalDeviceExternalBufferProperties GetPhysicalDeviceExternalFenceProperties GetPhysicalDeviceExternalSemaphoreProperties GetDescriptorSetLayoutSupport',
+    'VK_KHR_surface': 'DestroySurfaceKHR GetPhysicalDeviceSurfaceSupportKHR GetPhysicalDeviceSurfaceCapabilitiesKHR GetPhysicalDeviceSurfaceFormatsKHR GetPhysicalDeviceSurfacePresentModesKHR',
+    'VK_KHR_swapchain': 'CreateSwapchainKHR DestroySwapchainKHR GetSwapchainImagesKHR AcquireNextImageKHR QueuePresentKHR GetDeviceGroupPresentCapabilitiesKHR GetDeviceGroupSurfacePresentModesKHR GetPhysicalDevicePresentRectanglesKHR AcquireNextImage2KHR',
+    'VK_KHR_display': 'GetPhysicalDeviceDisplayPropertiesKHR GetPhysicalDeviceDisplayPlanePropertiesKHR GetDisplayPlaneSupportedDisplaysKHR GetDisplayModePropertiesKHR CreateDisplayModeKHR GetDisplayPlaneCapabilitiesKHR CreateDisplayPlaneSurfaceKHR',
+    'VK_KHR_display_swapchain': 'CreateSharedSwapchainsKHR',
+    'VK_KHR_get_physical_device_properties2': 'GetPhysicalDeviceFeatures2KHR GetPhysicalDeviceProperties2KHR GetPhysicalDeviceFormatProperties2KHR GetPhysicalDeviceImageFormatProperties2KHR GetPhysicalDeviceQueueFamilyProperties2KHR GetPhysicalDeviceMemoryProperties2KHR GetPhysicalDeviceSparseImageFormatProperties2KHR',
+    'VK_KHR_device_group': 'GetDeviceGroupPeerMemoryFeaturesKHR CmdSetDeviceMaskKHR CmdDispatchBaseKHR',
+    'VK_KHR_maintenance1': 'TrimCommandPoolKHR',
+    'VK_KHR_device_group_creation': 'EnumeratePhysicalDeviceGroupsKHR',
+    'VK_KHR_external_memory_capabilities': 'GetPhysicalDeviceExternalBufferPropertiesKHR',
+    'VK_KHR_external_memory_fd': 'GetMemoryFdKHR GetMemoryFdPropertiesKHR',
+    'VK_KHR_external_semaphore_capabilities': 'GetPhysicalDeviceExternalSemaphorePropertiesKHR',
+    'VK_KHR_external_semaphore_fd': 'ImportSemaphoreFdKHR GetSemaphoreFdKHR',
+    'VK_KHR_push_descriptor': 'CmdPushDescriptorSetKHR CmdPushDescriptorSetWithTemplateKHR',
+    'VK_KHR_descriptor_update_template': 'CreateDescriptorUpdateTemplateKHR DestroyDescriptorUpdateTemplateKHR UpdateDescriptorSetWithTemplateKHR',
+    'VK_KHR_create_renderpass2': 'CreateRenderPass2KHR CmdBeginRenderPass2KHR CmdNextSubpass2KHR CmdEndRenderPass2KHR',
+    'VK_KHR_shared_presentable_image': 'GetSwapchainStatusKHR',
+    'VK_KHR_external_fence_capabilities': 'GetPhysicalDeviceExternalFencePropertiesKHR',
+    'VK_KHR_external_fence_fd': 'ImportFenceFdKHR GetFenceFdKHR',
+    'VK_KHR_get_surface_capabilities2': 'GetPhysicalDeviceSurfaceCapabilities2KHR GetPhysicalDeviceSurfaceFormats2KHR',
+    'VK_KHR_get_display_properties2': 'GetPhysicalDeviceDisplayProperties2KHR GetPhysicalDeviceDisplayPlaneProperties2KHR GetDisplayModeProperties2KHR GetDisplayPlaneCapabilities2KHR',
+    'VK_KHR_get_memory_requirements2': 'GetImageMemoryRequirements2KHR GetBufferMemoryRequirements2KHR GetImageSparseMemoryRequirements2KHR',
+    'VK_KHR_sampler_ycbcr_conversion': 'CreateSamplerYcbcrConversionKHR DestroySamplerYcbcrConversionKHR',
+    'VK_KHR_bind_memory2': 'BindBufferMemory2KHR BindImageMemory2KHR',
+    'VK_KHR_maintenance3': 'GetDescriptorSetLayoutSupportKHR',
+    'VK_KHR_draw_indirect_count': 'CmdDrawIndirectCountKHR CmdDrawIndexedIndirectCountKHR',
+    'VK_EXT_debug_report': 'CreateDebugReportCallbackEXT DestroyDebugReportCallbackEXT DebugReportMessageEXT',
+    'VK_EXT_debug_marker': 'DebugMarkerSetObjectTagEXT DebugMarkerSetObjectNameEXT CmdDebugMarkerBeginEXT CmdDebugMarkerEndEXT CmdDebugMarkerInsertEXT',
+    'VK_EXT_transform_feedback': 'CmdBindTransformFeedbackBuffersEXT CmdBeginTransformFeedbackEXT CmdEndTransformFeedbackEXT CmdBeginQueryIndexedEXT CmdEndQueryIndexedEXT CmdDrawIndirectByteCountEXT',
+    'VK_AMD_draw_indirect_count': 'CmdDrawIndirectCountAMD CmdDrawIndexedIndirectCountAMD',
+    'VK_AMD_shader_info': 'GetShaderInfoAMD',
+    'VK_NV_external_memory_capabilities': 'GetPhysicalDeviceExternalImageFormatPropertiesNV',
+    'VK_EXT_conditional_rendering': 'CmdBeginConditionalRenderingEXT CmdEndConditionalRenderingEXT',
+    'VK_NVX_device_generated_commands': 'CmdProcessCommandsNVX CmdReserveSpaceForCommandsNVX CreateIndirectCommandsLayoutNVX DestroyIndirectCommandsLayoutNVX CreateObjectTableNVX DestroyObjectTableNVX RegisterObjectsNVX UnregisterObjectsNVX GetPhysicalDeviceGeneratedCommandsPropertiesNVX',
+    'VK_NV_clip_space_w_scaling': 'CmdSetViewportWScalingNV',
+    'VK_EXT_direct_mode_display': 'ReleaseDisplayEXT',
+    'VK_EXT_display_surface_counter': 'GetPhysicalDeviceSurfaceCapabilities2EXT',
+    'VK_EXT_display_control': 'DisplayPowerControlEXT RegisterDeviceEventEXT RegisterDisplayEventEXT GetSwapchainCounterEXT',
+    'VK_GOOGLE_display_timing': 'GetRefreshCycleDurationGOOGLE GetPastPresentationTimingGOOGLE',
+    'VK_EXT_discard_rectangles': 'CmdSetDiscardRectangleEXT',
+    'VK_EXT_hdr_metadata': 'SetHdrMetadataEXT',
+    'VK_EXT_debug_utils': 'SetDebugUtilsObjectNameEXT SetDebugUtilsObjectTagEXT QueueBeginDebugUtilsLabelEXT QueueEndDebugUtilsLabelEXT QueueInsertDebugUtilsLabelEXT CmdBeginDebugUtilsLabelEXT CmdEndDebugUtilsLabelEXT CmdInsertDebugUtilsLabelEXT CreateDebugUtilsMessengerEXT DestroyDebugUtilsMessengerEXT SubmitDebugUtilsMessageEXT',
+    'VK_EXT_sample_locations': 'CmdSetSampleLocationsEXT GetPhysicalDeviceMultisamplePropertiesEXT',
+    'VK_EXT_image_drm_format_modifier': 'GetImageDrmFormatModifierPropertiesEXT',
+    'VK_EXT_validation_cache': 'CreateValidationCacheEXT DestroyValidationCacheEXT MergeValidationCachesEXT GetValidationCacheDataEXT',
+    'VK_NV_shading_rate_image': 'CmdBindShadingRateImageNV CmdSetViewportShadingRatePaletteNV CmdSetCoarseSampleOrderNV',
+    'VK_NV_ray_tracing': 'CreateAccelerationStructureNV DestroyAccelerationStructureNV GetAccelerationStructureMemoryRequirementsNV BindAccelerationStructureMemoryNV CmdBuildAccelerationStructureNV CmdCopyAccelerationStructureNV CmdTraceRaysNV CreateRayTracingPipelinesNV GetRayTracingShaderGroupHandlesNV GetAccelerationStructureHandleNV CmdWriteAccelerationStructuresPropertiesNV CompileDeferredNV',
+    'VK_EXT_external_memory_host': 'GetMemoryHostPointerPropertiesEXT',
+    'VK_AMD_buffer_marker': 'CmdWriteBufferMarkerAMD',
+    'VK_EXT_calibrated_timestamps': 'GetPhysicalDeviceCalibrateableTimeDomainsEXT GetCalibratedTimestampsEXT',
+    'VK_NV_mesh_shader': 'CmdDrawMeshTasksNV CmdDrawMeshTasksIndirectNV CmdDrawMeshTasksIndirectCountNV',
+    'VK_NV_scissor_exclusive': 'CmdSetExclusiveScissorNV',
+    'VK_NV_device_diagnostic_checkpoints': 'CmdSetCheckpointNV GetQueueCheckpointDataNV',
+    'VK_KHR_win32_surface': 'CreateWin32SurfaceKHR GetPhysicalDeviceWin32PresentationSupportKHR',
+    'VK_KHR_external_memory_win32': 'GetMemoryWin32HandleKHR GetMemoryWin32HandlePropertiesKHR',
+    'VK_KHR_external_semaphore_win32': 'ImportSemaphoreWin32HandleKHR GetSemaphoreWin32HandleKHR',
+    'VK_KHR_external_fence_win32': 'ImportFenceWin32HandleKHR GetFenceWin32HandleKHR',
+    'VK_NV_external_memory_win32': 'GetMemoryWin32HandleNV',
+    'VK_KHR_xcb_surface': 'CreateXcbSurfaceKHR GetPhysicalDeviceXcbPresentationSupportKHR',
+}
+
+_function_aliases = {
+    'GetPhysicalDeviceFeatures2KHR': 'GetPhysicalDeviceFeatures2',
+    'GetPhysicalDeviceProperties2KHR': 'GetPhysicalDeviceProperties2',
+    'GetPhysicalDeviceFormatProperties2KHR': 'GetPhysicalDeviceFormatProperties2',
+    'GetPhysicalDeviceImageFormatProperties2KHR': 'GetPhysicalDeviceImageFormatProperties2',
+    'GetPhysicalDeviceQueueFamilyProperties2KHR': 'GetPhysicalDeviceQueueFamilyProperties2',
+    'GetPhysicalDeviceMemoryProperties2KHR': 'GetPhysicalDeviceMemoryProperties2',
+    'GetPhysicalDeviceSparseImageFormatProperties2KHR': 'GetPhysicalDeviceSparseImageFormatProperties2',
+    'GetDeviceGroupPeerMemoryFeaturesKHR': 'GetDeviceGroupPeerMemoryFeatures',
+    'CmdSetDeviceMaskKHR': 'CmdSetDeviceMask',
+    'CmdDispatchBaseKHR': 'CmdDispatchBase',
+    'TrimCommandPoolKHR': 'TrimCommandPool',
+    'EnumeratePhysicalDeviceGroupsKHR': 'EnumeratePhysicalDeviceGroups',
+    'GetPhysicalDeviceExternalBufferPropertiesKHR': 'GetPhysicalDeviceExternalBufferProperties',
+    'GetPhysicalDeviceExternalSemaphorePropertiesKHR': 'GetPhysicalDeviceExternalSemaphoreProperties',
+    'CreateDescriptorUpdateTemplateKHR': 'CreateDescriptorUpdateTemplate',
+    'DestroyDescriptorUpdateTemplateKHR': 'DestroyDescriptorUpdateTemplate',
+    'UpdateDescriptorSetWithTemplateKHR': 'UpdateDescriptorSetWithTemplate',
+    'GetPhysicalDeviceExternalFencePropertiesKHR': 'GetPhysicalDeviceExternalFenceProperties',
+    'GetImageMemoryRequirements2KHR': 'GetImageMemoryRequirements2',
+    'GetBufferMemoryRequirements2KHR': 'GetBufferMemoryRequirements2',
+    'GetImageSparseMemoryRequirements2KHR': 'GetImageSparseMemoryRequirements2',
+    'CreateSamplerYcbcrConversionKHR': 'CreateSamplerYcbcrConversion',
+    'DestroySamplerYcbcrConversionKHR': 'DestroySamplerYcbcrConversion',
+    'BindBufferMemory2KHR': 'BindBufferMemory2',
+    'BindImageMemory2KHR': 'BindImageMemory2',
+    'GetDescriptorSetLayoutSupportKHR': 'GetDescriptorSetLayoutSupport',
+}
 
-# Loading proc
-GetInstanceProcAddr = FnGetInstanceProcAddr((b"vkGetInstanceProcAddr", vk))
 
-# Load the loader functions in the module namespace
-loc = locals()
-for name, fnptr in load_functions(Instance(0), LoaderFunctions, GetInstanceProcAddr):
-    loc[name] = fnptr
-del loc
\ No newline at end of file
+# Loading proc
+_define_loader_functions("GetInstanceProcAddr CreateInstance EnumerateInstanceExtensionProperties EnumerateInstanceLayerProperties EnumerateInstanceVersion")
\ No newline at end of file
@@ -0,0 +1,654 @@
+"""
+Command recording helpers for the generated Vulkan wrappers.
+
+The helpers work with a device dispatch table of any generated wrapper (ex: `vk.DeviceDispatch`
+or `vk.UncheckedDeviceDispatch`) and the handles of the application.
+
+    recorder = CommandRecorder(device_functions, command_buffer)
+    recorder.CmdBindPipeline(vk.PIPELINE_BIND_POINT_GRAPHICS, pipeline)
+    recorder.CmdDraw(3, 1, 0, 0)
+"""
+
+from ctypes import Array, Structure, Union, byref, pointer, c_int, c_uint32, c_uint64, sizeof, memmove
+from ctypes import _SimpleCData
+from functools import partial
+from operator import itemgetter
+from array import array
+import hashlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Commands that change the state tracked by `CommandRecorder`
+STATE_COMMANDS = ('CmdBindPipeline', 'CmdBindDescriptorSets', 'CmdBindVertexBuffers', 'CmdBindIndexBuffer', 'CmdSetViewport', 'CmdSetScissor')
+
+# The other commands starting with these prefixes can change the tracked state (ex: CmdBindVertexBuffers2, CmdPushDescriptorSetKHR
+# or CmdSetViewportWithCount), and forget it when they are passed to the dispatch table. CmdExecuteCommands makes it undefined.
+INVALIDATING_PREFIXES = ('CmdBind', 'CmdSet', 'CmdPush', 'CmdExecuteCommands')
+
+# Commands of the invalidating prefixes that never change the tracked state
+STATELESS_COMMANDS = (
+    'CmdPushConstants', 'CmdPushConstants2KHR', 'CmdSetLineWidth', 'CmdSetDepthBias', 'CmdSetBlendConstants', 'CmdSetDepthBounds',
+    'CmdSetStencilCompareMask', 'CmdSetStencilWriteMask', 'CmdSetStencilReference'
+)
+
+# Bits of every state id in the sort keys of `DrawList`, and the position of the ids: the pipeline first
+DRAW_KEY_BITS = 16
+DRAW_KEY_STATES = ('pipeline', 'descriptor_sets', 'vertex_buffers', 'index_buffer')
+
+# Stride of the records written by `DrawList.record_indirect`: the size of VkDrawIndexedIndirectCommand.
+# The VkDrawIndirectCommand records (16 bytes) are padded to the same stride.
+DRAW_INDIRECT_STRIDE = 20
+
+# Suffixes of the indirect count commands used by `DrawList.record_indirect`, in order of preference: the core commands
+# of Vulkan 1.2, then the commands of VK_KHR_draw_indirect_count and VK_AMD_draw_indirect_count
+INDIRECT_COUNT_SUFFIXES = ('', 'KHR', 'AMD')
+
+_UNSET = object()
+_CArgObject = type(byref(c_int()))
+
+# Kind of the command arguments by type. The ctypes isinstance checks are slow, the kind is found once per type.
+_argument_kinds = {int: 'value'}
+
+def argument_kind(cls):
+    "Kind of the arguments of type `cls`: 'array', 'struct', 'scalar' (ctypes scalars), 'byref' or 'value' (compared as is)"
+    kind = _argument_kinds.get(cls)
+    if kind is None:
+        if issubclass(cls, Array):
+            kind = 'array'
+        elif issubclass(cls, (Structure, Union)):
+            kind = 'struct'
+        elif issubclass(cls, _SimpleCData):
+            kind = 'scalar'
+        elif cls is _CArgObject:
+            kind = 'byref'
+        else:
+            kind = 'value'
+        _argument_kinds[cls] = kind
+    return kind
+
+def state_key(value):
+    "Comparable key of a command argument: the value of the ctypes scalars, the bytes of the ctypes arrays and structures"
+    if value.__class__ is int:
+        return value
+    kind = _argument_kinds.get(value.__class__) or argument_kind(value.__class__)
+    if kind == 'scalar':
+        return value.value
+    elif kind == 'byref':
+        return state_key(value._obj)
+    elif kind == 'value':
+        return value
+    return bytes(value)
+
+def items_data(items, count):
+    "Bytes of the first `count` items of a ctypes array argument (or of a structure, for a single item). None if the items cannot be read."
+    if count.__class__ is not int:
+        count = state_key(count)
+    kind = _argument_kinds.get(items.__class__) or argument_kind(items.__class__)
+    if kind == 'byref':
+        items = items._obj
+        kind = argument_kind(items.__class__)
+    if kind == 'array':
+        if count == len(items):
+            return bytes(items)
+        elif count < len(items):
+            return bytes(items)[:count * sizeof(items._type_)]
+    elif kind == 'struct' and count == 1:
+        return bytes(items)
+    return None
+
+class CommandRecorder(object):
+    """
+    Record the commands of a command buffer, dropping the state commands that would not change the bound state.
+    The state commands take the arguments of the vulkan commands, without the command buffer. The other `Cmd`
+    commands of the dispatch table are called directly, and forget the state when they can change it (see INVALIDATING_PREFIXES).
+    """
+
+    def __init__(self, device_functions, command_buffer):
+        self.device_functions = device_functions
+        self.command_buffer = command_buffer
+        self.issued = dict.fromkeys(STATE_COMMANDS, 0)
+        self.elided = dict.fromkeys(STATE_COMMANDS, 0)
+        self.invalidate()
+
+    def invalidate(self):
+        "Forget the bound state. To call after the state becomes undefined, ex: after CmdExecuteCommands or when the command buffer is reset."
+        self._pipelines = {}
+        self._layouts = {}
+        self._index_buffer = _UNSET
+
+        # State of the commands setting a range of indices: the state of every index, and the last call of the command
+        self._items = {}
+        self._last_calls = {}
+
+    def __getattr__(self, name):
+        if not name.startswith('Cmd'):
+            raise AttributeError("{!r} object has no attribute {!r}".format(type(self).__name__, name))
+        call = partial(getattr(self.device_functions, name), self.command_buffer)
+        if name.startswith(INVALIDATING_PREFIXES) and name not in STATELESS_COMMANDS:
+            call = partial(self._invalidating_call, call)
+        setattr(self, name, call)
+        return call
+
+    def _invalidating_call(self, call, *args):
+        self.invalidate()
+        return call(*args)
+
+    def _forget(self, kind):
+        self._items.pop(kind, None)
+        self._last_calls.pop(kind, None)
+
+    def _record_range(self, command, kind, call, args):
+        """
+        Record a command setting the state of a range of indices. `call` is `(first, count, extra, *arrays)`, with `arrays`
+        the bytes of the item arrays of the command (see `items_data`) and `extra` a key shared by the items.
+        When an array cannot be read, the state of every index is forgotten.
+        """
+        arrays = call[3:]
+        if None in arrays:
+            self._forget(kind)
+        else:
+            # Only the last call can be compared without the index states: the indices it set can only change with another call
+            self._last_calls[kind] = call
+            first, count, extra = state_key(call[0]), state_key(call[1]), call[2]
+            states = self._items.setdefault(kind, {})
+            sizes = [len(data) // count if count else 0 for data in arrays]
+            keys = [tuple(data[index * size:(index + 1) * size] for data, size in zip(arrays, sizes)) + (extra,) for index in range(count)]
+            if all(states.get(first + index, _UNSET) == key for index, key in enumerate(keys)):
+                self.elided[command] += 1
+                return
+            for index, key in enumerate(keys):
+                states[first + index] = key
+
+        self.issued[command] += 1
+        getattr(self.device_functions, command)(self.command_buffer, *args)
+
+    def CmdBindPipeline(self, bind_point, pipeline):
+        bind_point_key = state_key(bind_point)
+        key = state_key(pipeline)
+        if self._pipelines.get(bind_point_key, _UNSET) == key:
+            self.elided['CmdBindPipeline'] += 1
+            return
+
+        # The static state of the new pipeline can replace the dynamic viewports and scissors
+        self._pipelines[bind_point_key] = key
+        self._forget('viewports')
+        self._forget('scissors')
+        self.issued['CmdBindPipeline'] += 1
+        self.device_functions.CmdBindPipeline(self.command_buffer, bind_point, pipeline)
+
+    def CmdBindDescriptorSets(self, bind_point, layout, first_set, set_count, descriptor_sets, dynamic_offset_count, dynamic_offsets):
+        bind_point_key = state_key(bind_point)
+        layout_key = state_key(layout)
+        kind = ('descriptor_sets', bind_point_key)
+
+        # Binding sets with another layout can disturb the other sets: only the sets bound with the same layout are kept
+        if self._layouts.get(bind_point_key, _UNSET) != layout_key:
+            self._forget(kind)
+            self._layouts[bind_point_key] = layout_key
+
+        # The dynamic offsets are shared by the sets of the call: a set is only the same with the same call
+        extra = None
+        sets_data = items_data(descriptor_sets, set_count)
+        if dynamic_offset_count:
+            offsets = items_data(dynamic_offsets, dynamic_offset_count)
+            if offsets is None:
+                sets_data = None    # Unknown offsets, the sets are forgotten
+            extra = (state_key(first_set), state_key(set_count), offsets)
+
+        call = (first_set, set_count, extra, sets_data)
+        if sets_data is not None and self._last_calls.get(kind) == call:
+            self.elided['CmdBindDescriptorSets'] += 1
+            return
+        self._record_range('CmdBindDescriptorSets', kind, call, (bind_point, layout, first_set, set_count, descriptor_sets, dynamic_offset_count, dynamic_offsets))
+
+    def CmdBindVertexBuffers(self, first_binding, binding_count, buffers, offsets):
+        call = (first_binding, binding_count, None, items_data(buffers, binding_count), items_data(offsets, binding_count))
+        if None not in call[3:] and self._last_calls.get('vertex_buffers') == call:
+            self.elided['CmdBindVertexBuffers'] += 1
+            return
+        self._record_range('CmdBindVertexBuffers', 'vertex_buffers', call, (first_binding, binding_count, buffers, offsets))
+
+    def CmdBindIndexBuffer(self, buffer, offset, index_type):
+        key = (state_key(buffer), state_key(offset), state_key(index_type))
+        if self._index_buffer == key:
+            self.elided['CmdBindIndexBuffer'] += 1
+            return
+        self._index_buffer = key
+        self.issued['CmdBindIndexBuffer'] += 1
+        self.device_functions.CmdBindIndexBuffer(self.command_buffer, buffer, offset, index_type)
+
+    def CmdSetViewport(self, first_viewport, viewport_count, viewports):
+        call = (first_viewport, viewport_count, None, items_data(viewports, viewport_count))
+        if call[3] is not None and self._last_calls.get('viewports') == call:
+            self.elided['CmdSetViewport'] += 1
+            return
+        self._record_range('CmdSetViewport', 'viewports', call, (first_viewport, viewport_count, viewports))
+
+    def CmdSetScissor(self, first_scissor, scissor_count, scissors):
+        call = (first_scissor, scissor_count, None, items_data(scissors, scissor_count))
+        if call[3] is not None and self._last_calls.get('scissors') == call:
+            self.elided['CmdSetScissor'] += 1
+            return
+        self._record_range('CmdSetScissor', 'scissors', call, (first_scissor, scissor_count, scissors))
+
+
+def _handles(values):
+    return (c_uint64 * len(values))(*[state_key(value) for value in values])
+
+class DrawList(object):
+    """
+    Draws sorted by state before they are recorded. Every state (pipeline, descriptor sets, vertex buffers and index
+    buffer) gets a small id the first time it is used, and every draw a 64-bit sort key made of its state ids, the
+    pipeline id first. The draws with the same state keep their order.
+    """
+
+    def __init__(self, bind_point=0):
+        self.bind_point = bind_point    # VK_PIPELINE_BIND_POINT_GRAPHICS
+        self.keys = array('Q')
+        self.draws = array('q')         # 5 arguments per draw, the arguments of CmdDraw are followed by a 0
+        self.indexed = array('B')
+
+        # Per instance data of the draws (see `merge_instances`): the records of the instances, and the index of the first
+        # record of every draw (-1 for a draw without instance data)
+        self.instance_size = None
+        self.instances = bytearray()
+        self.instance_starts = array('q')
+        self.instance_binding = None
+
+        # For every state of DRAW_KEY_STATES: the ids of the states, and the key and the arguments of the bind command of
+        # every id. The id 0 is a draw without the state.
+        self._clear_states()
+
+    def _clear_states(self):
+        self._ids = tuple({} for _ in DRAW_KEY_STATES)
+        self._state_keys = tuple([None] for _ in DRAW_KEY_STATES)
+        self._binds = tuple([None] for _ in DRAW_KEY_STATES)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        "Remove the draws and their states. The states of the next draws get new ids."
+        # The dynamic offsets and the vertex buffer offsets are part of the states and often change every frame: keeping
+        # the ids would grow the states without bound, up to the limit of DRAW_KEY_BITS.
+        self._clear_states()
+        del self.keys[:]
+        del self.draws[:]
+        del self.indexed[:]
+        del self.instances[:]
+        del self.instance_starts[:]
+        self.instance_binding = None
+
+    def _state_id(self, state, key, value):
+        ids = self._ids[state]
+        state_id = ids.get(key)
+        if state_id is None:
+            binds = self._binds[state]
+            state_id = len(binds)
+            if state_id >> DRAW_KEY_BITS:
+                raise ValueError("Too many different {} in the draw list".format(DRAW_KEY_STATES[state]))
+
+            if state == 0:
+                arguments = (self.bind_point, value)
+            elif state == 1:
+                layout, first_set, sets, dynamic_offsets = value
+                offsets = (c_uint32 * len(dynamic_offsets))(*dynamic_offsets) if dynamic_offsets else None
+                arguments = (self.bind_point, layout, first_set, len(sets), _handles(sets), len(dynamic_offsets), offsets)
+            elif state == 2:
+                first_binding, buffers, offsets = value
+                arguments = (first_binding, len(buffers), _handles(buffers), _handles(offsets))
+            else:
+                arguments = tuple(value)
+
+            ids[key] = state_id
+            self._state_keys[state].append(key)
+            binds.append(arguments)
+        return state_id
+
+    def add(self, pipeline, draw, descriptor_sets=None, vertex_buffers=None, index_buffer=None, instances=None):
+        """
+        Add a draw. `draw` are the arguments of `CmdDraw` (4 values) or `CmdDrawIndexed` (5 values), without the command buffer.
+        `descriptor_sets` is `(layout, first_set, sets, dynamic_offsets)`, `vertex_buffers` is `(first_binding, buffers, offsets)`
+        and `index_buffer` is `(buffer, offset, index_type)`, with sequences of handles and integers. `instances` are the
+        bytes of the per instance data of the instances of the draw (any buffer: bytes, ctypes or NumPy array).
+        """
+        key = self._state_id(0, state_key(pipeline), pipeline) << (3 * DRAW_KEY_BITS)
+        if descriptor_sets is not None:
+            layout, first_set, sets, dynamic_offsets = descriptor_sets
+            state = (state_key(layout), first_set, tuple(map(state_key, sets)), tuple(dynamic_offsets))
+            key |= self._state_id(1, state, descriptor_sets) << (2 * DRAW_KEY_BITS)
+        if vertex_buffers is not None:
+            first_binding, buffers, offsets = vertex_buffers
+            state = (first_binding, tuple(map(state_key, buffers)), tuple(map(state_key, offsets)))
+            key |= self._state_id(2, state, vertex_buffers) << DRAW_KEY_BITS
+        if index_buffer is not None:
+            key |= self._state_id(3, tuple(map(state_key, index_buffer)), index_buffer)
+
+        if len(draw) not in (4, 5):
+            raise ValueError("A draw has the 4 arguments of CmdDraw or the 5 arguments of CmdDrawIndexed")
+        self.keys.append(key)
+        self.draws.extend(draw)
+        if len(draw) == 4:
+            self.draws.append(0)
+        self.indexed.append(len(draw) == 5)
+
+        if instances is None:
+            self.instance_starts.append(-1)
+        else:
+            instances = memoryview(instances).cast('B')
+            instance_count = draw[1]
+            if self.instance_size is None and instance_count:
+                self.instance_size = len(instances) // instance_count
+            if len(instances) != instance_count * (self.instance_size or 0):
+                raise ValueError("The instance data of a draw must have {} bytes per instance".format(self.instance_size))
+            self.instance_starts.append(len(self.instances) // self.instance_size if self.instance_size else 0)
+            self.instances += instances
+
+    def content_key(self):
+        "Digest of the draws and of their states. Two draw lists with the same content key record the same commands."
+        digest = hashlib.blake2b(digest_size=16)
+        for data in (self.draws, self.indexed):
+            digest.update(data)
+
+        # The states of the draws are hashed instead of their ids, which depend on the order the states were first used:
+        # the distinct keys are numbered in the order of their first draw, and every number is hashed with its states
+        numbers = {key: number for number, key in enumerate(dict.fromkeys(self.keys))}
+        digest.update(array('Q', map(numbers.__getitem__, self.keys)))
+        mask = (1 << DRAW_KEY_BITS) - 1
+        states = []
+        for key in numbers:
+            for state, state_keys in enumerate(self._state_keys):
+                states.append(state_keys[(key >> ((len(DRAW_KEY_STATES) - 1 - state) * DRAW_KEY_BITS)) & mask])
+        instance_binding = None if self.instance_binding is None else tuple(map(state_key, self.instance_binding))
+        digest.update(repr((self.bind_point, instance_binding, states)).encode())
+        return digest.digest()
+
+    def _order(self):
+        if numpy is not None:
+            return numpy.argsort(numpy.frombuffer(self.keys, dtype=numpy.uint64), kind='stable')
+        keys = self.keys
+        return sorted(range(len(keys)), key=keys.__getitem__)
+
+    def order(self):
+        "Indices of the draws sorted by state"
+        order = self._order()
+        return order.tolist() if numpy is not None else order
+
+    def _bind(self, commands, command_buffer, bound, key):
+        "Record the bind commands of the states of `key` that are not in `bound`. Return the number of bind commands."
+        binds = 0
+        mask = (1 << DRAW_KEY_BITS) - 1
+        for state in range(len(DRAW_KEY_STATES)):
+            # A draw without the state keeps the bound state
+            state_id = (key >> ((len(DRAW_KEY_STATES) - 1 - state) * DRAW_KEY_BITS)) & mask
+            if state_id and state_id != bound[state]:
+                commands[state](command_buffer, *self._binds[state][state_id])
+                bound[state] = state_id
+                binds += 1
+        return binds
+
+    def _bind_commands(self, device_functions):
+        return (device_functions.CmdBindPipeline, device_functions.CmdBindDescriptorSets,
+                device_functions.CmdBindVertexBuffers, device_functions.CmdBindIndexBuffer)
+
+    def _bind_instances(self, device_functions, command_buffer):
+        if self.instance_binding is not None:
+            binding, buffer, offset = self.instance_binding
+            device_functions.CmdBindVertexBuffers(command_buffer, binding, 1, _handles([buffer]), _handles([offset]))
+
+    def merge_instances(self, buffer, mapped, offset=0, binding=1):
+        """
+        Merge the draws with instance data that have the same state and the same mesh (the arguments of the draw, except
+        the instances) in a single instanced draw, and sort the draws by state. The instance data is written at `offset`
+        in `buffer`, whose first byte is mapped at the host address `mapped`, and the buffer is bound at the vertex
+        `binding` when the draws are recorded. Return the number of bytes written.
+        """
+        keys, draws, indexed, starts = self.keys, self.draws, self.indexed, self.instance_starts
+        merged_keys, merged_draws, merged_indexed = array('Q'), array('q'), array('B')
+        records = []        # Source record of every instance, in the order of the instance buffer
+
+        # The draws of a mesh are moved after the first draw with the same state and mesh, the draws to merge are adjacent
+        meshes = {}
+        first_positions = {}
+        positions = []
+        for position, index in enumerate(self.order()):
+            if starts[index] >= 0:
+                arguments = draws[index * 5:index * 5 + 5]
+                mesh = meshes[index] = (keys[index], indexed[index], arguments[0], arguments[2], arguments[3] if indexed[index] else None)
+                position = first_positions.setdefault(mesh, position)
+            positions.append((position, index))
+        positions.sort(key=itemgetter(0))
+
+        previous = None
+        for _, index in positions:
+            key, arguments = keys[index], draws[index * 5:index * 5 + 5]
+            if starts[index] < 0:
+                previous = None
+            else:
+                # The first instance is the 5th argument of CmdDrawIndexed and the 4th of CmdDraw
+                first_instance = 4 if indexed[index] else 3
+                mesh = meshes[index]
+                instance_count = arguments[1]
+                if mesh == previous:
+                    merged_draws[-4] += instance_count
+                    records.extend(range(starts[index], starts[index] + instance_count))
+                    continue
+                arguments[first_instance] = len(records)
+                records.extend(range(starts[index], starts[index] + instance_count))
+                previous = mesh
+            merged_keys.append(key)
+            merged_draws.extend(arguments)
+            merged_indexed.append(indexed[index])
+
+        size = self.instance_size or 0
+        if numpy is not None and records:
+            data = numpy.frombuffer(self.instances, dtype=numpy.uint8).reshape(-1, size)[records].tobytes()
+        else:
+            data = b''.join([bytes(self.instances[record * size:(record + 1) * size]) for record in records])
+        memmove(state_key(mapped) + offset, data, len(data))
+
+        self.keys, self.draws, self.indexed = merged_keys, merged_draws, merged_indexed
+        self.instance_starts = array('q', [-1] * len(merged_keys))
+        del self.instances[:]
+        self.instance_binding = (binding, buffer, offset)
+        return len(data)
+
+    def record(self, device_functions, command_buffer, sort=True):
+        """
+        Record the draws in a command buffer, with the bind commands of the states that change between two draws.
+        Without `sort`, the draws are recorded in the order they were added. Return the number of bind commands.
+        """
+        keys, draws, indexed = self.keys, self.draws, self.indexed
+        commands = self._bind_commands(device_functions)
+        draw, draw_indexed = device_functions.CmdDraw, device_functions.CmdDrawIndexed
+
+        self._bind_instances(device_functions, command_buffer)
+        binds = 0
+        bound = [0] * len(DRAW_KEY_STATES)
+        previous = None
+        for index in (self.order() if sort else range(len(keys))):
+            key = keys[index]
+            if key != previous:
+                binds += self._bind(commands, command_buffer, bound, key)
+                previous = key
+
+            start = index * 5
+            if indexed[index]:
+                draw_indexed(command_buffer, draws[start], draws[start + 1], draws[start + 2], draws[start + 3], draws[start + 4])
+            else:
+                draw(command_buffer, draws[start], draws[start + 1], draws[start + 2], draws[start + 3])
+        return binds
+
+    def indirect_records(self, order=None):
+        """
+        Bytes of the VkDrawIndexedIndirectCommand and VkDrawIndirectCommand records of the draws, in `order`
+        (default: sorted by state), with a stride of DRAW_INDIRECT_STRIDE.
+        """
+        if order is None:
+            order = self._order()
+        if numpy is not None:
+            # The negative vertex offsets wrap to their two's complement
+            draws = numpy.frombuffer(self.draws, dtype=numpy.int64).reshape(-1, 5)
+            return draws[order].astype(numpy.uint32).tobytes()
+
+        draws = self.draws
+        records = array('I')
+        for index in order:
+            records.extend([value & 0xFFFFFFFF for value in draws[index * 5:index * 5 + 5]])
+        return records.tobytes()
+
+    def _runs(self, order):
+        "Start and end positions in `order` of the runs of draws with the same state and draw command"
+        keys, indexed = self.keys, self.indexed
+        if numpy is not None:
+            sorted_keys = numpy.frombuffer(keys, dtype=numpy.uint64)[order]
+            sorted_indexed = numpy.frombuffer(indexed, dtype=numpy.uint8)[order]
+            changes = (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_indexed[1:] != sorted_indexed[:-1])
+            starts = [0] + (numpy.flatnonzero(changes) + 1).tolist()
+            return list(zip(starts, starts[1:] + [len(order)]))
+
+        runs = []
+        start = 0
+        for position in range(1, len(order) + 1):
+            if position == len(order) or keys[order[position]] != keys[order[start]] or indexed[order[position]] != indexed[order[start]]:
+                runs.append((start, position))
+                start = position
+        return runs
+
+    def record_indirect(self, device_functions, command_buffer, buffer, mapped, offset=0, max_draw_count=None, count_buffer=None, count_offset=0, count_mapped=None):
+        """
+        Record the draws sorted by state with one `CmdDrawIndirect` or `CmdDrawIndexedIndirect` per run of draws with the
+        same state (split in commands of `max_draw_count` draws, ex: 1 without the multiDrawIndirect feature).
+        The draw records are written at `offset` in `buffer`, whose first byte is mapped at the host address `mapped`.
+        With a `count_buffer`, the commands are `CmdDrawIndirectCount` and `CmdDrawIndexedIndirectCount` (or their KHR or
+        AMD aliases) when the dispatch table has them: the draw count of the n-th command is the uint32 at
+        `count_offset + 4 * n` in `count_buffer`, and its number of draws is the maximum. The draw counts are written
+        there when the buffer is mapped at the host address `count_mapped`.
+        Return the number of bytes written: `len(self) * DRAW_INDIRECT_STRIDE`.
+        """
+        if not len(self):
+            return 0
+
+        order = self._order()
+        records = self.indirect_records(order)
+        memmove(state_key(mapped) + offset, records, len(records))
+
+        keys, indexed = self.keys, self.indexed
+        commands = self._bind_commands(device_functions)
+        draw_indirect, draw_indexed_indirect = device_functions.CmdDrawIndirect, device_functions.CmdDrawIndexedIndirect
+        draw_count = draw_indexed_count = None
+        if count_buffer is not None:
+            for suffix in INDIRECT_COUNT_SUFFIXES:
+                draw_count = getattr(device_functions, 'CmdDrawIndirectCount' + suffix, None)
+                draw_indexed_count = getattr(device_functions, 'CmdDrawIndexedIndirectCount' + suffix, None)
+                if draw_count is not None and draw_indexed_count is not None:
+                    break
+            else:
+                # Without the count commands, the commands draw their number of draws
+                draw_count = draw_indexed_count = None
+
+        self._bind_instances(device_functions, command_buffer)
+        bound = [0] * len(DRAW_KEY_STATES)
+        counts = []
+        for start, end in self._runs(order):
+            first = order[start]
+            self._bind(commands, command_buffer, bound, keys[first])
+            draw = draw_indexed_indirect if indexed[first] else draw_indirect
+            draw_with_count = draw_indexed_count if indexed[first] else draw_count
+            step = max_draw_count or end - start
+            for position in range(start, end, step):
+                # The offsets are 64-bit arguments, passed as ctypes values for the unchecked functions
+                draw_offset = c_uint64(offset + position * DRAW_INDIRECT_STRIDE)
+                count = min(step, end - position)
+                if draw_with_count is None:
+                    draw(command_buffer, buffer, draw_offset, count, DRAW_INDIRECT_STRIDE)
+                else:
+                    draw_with_count(command_buffer, buffer, draw_offset, count_buffer, c_uint64(count_offset + 4 * len(counts)), count, DRAW_INDIRECT_STRIDE)
+                counts.append(count)
+
+        if count_buffer is not None and count_mapped is not None:
+            memmove(state_key(count_mapped) + count_offset, (c_uint32 * len(counts))(*counts), 4 * len(counts))
+        return len(records)
+
+
+class SecondaryCommandCache(object):
+    """
+    Secondary command buffers recording draw lists, recorded again only when the draws or the render pass change.
+    `vk` is the generated wrapper module, used to create the structures of the commands.
+    """
+
+    def __init__(self, vk, device_functions, device, command_pool):
+        self.vk = vk
+        self.device_functions = device_functions
+        self.device = device
+        self.command_pool = command_pool
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}      # {name: [secondary command buffer, key of the recorded commands]}
+
+    def _check(self, name, result):
+        if result != self.vk.SUCCESS:
+            raise RuntimeError("vk{} failed with the result {}".format(name, result))
+
+    def _allocate(self):
+        vk = self.vk
+        info = vk.CommandBufferAllocateInfo(
+            type=vk.STRUCTURE_TYPE_COMMAND_BUFFER_ALLOCATE_INFO, command_pool=state_key(self.command_pool),
+            level=vk.COMMAND_BUFFER_LEVEL_SECONDARY, command_buffer_count=1
+        )
+        command_buffer = vk.CommandBuffer()
+        self._check('AllocateCommandBuffers', self.device_functions.AllocateCommandBuffers(self.device, byref(info), byref(command_buffer)))
+        return command_buffer
+
+    def _record(self, command_buffer, draw_list, render_pass, subpass, framebuffer):
+        vk, functions = self.vk, self.device_functions
+        inheritance = vk.CommandBufferInheritanceInfo(
+            type=vk.STRUCTURE_TYPE_COMMAND_BUFFER_INHERITANCE_INFO, render_pass=state_key(render_pass),
+            subpass=subpass, framebuffer=state_key(framebuffer) or 0
+        )
+        begin_info = vk.CommandBufferBeginInfo(
+            type=vk.STRUCTURE_TYPE_COMMAND_BUFFER_BEGIN_INFO, flags=vk.COMMAND_BUFFER_USAGE_RENDER_PASS_CONTINUE_BIT,
+            inheritance_info=pointer(inheritance)
+        )
+        self._check('BeginCommandBuffer', functions.BeginCommandBuffer(command_buffer, byref(begin_info)))
+        draw_list.record(functions, command_buffer)
+        self._check('EndCommandBuffer', functions.EndCommandBuffer(command_buffer))
+
+    def execute(self, command_buffer, name, draw_list, render_pass, subpass=0, framebuffer=None):
+        """
+        Execute the draws of `draw_list` in the render pass instance of `command_buffer`, with the secondary command buffer
+        `name`. It is recorded again when the content of the draw list (see `DrawList.content_key`) or the inheritance
+        (render pass, subpass and framebuffer) changed since it was recorded. Return True when the commands were reused.
+        """
+        key = (draw_list.content_key(), state_key(render_pass), subpass, state_key(framebuffer))
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = [self._allocate(), None]
+
+        hit = entry[1] == key
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry[1] = None
+            self._record(entry[0], draw_list, render_pass, subpass, framebuffer)
+            entry[1] = key
+
+        self.device_functions.CmdExecuteCommands(command_buffer, 1, byref(entry[0]))
+        return hit
+
+    def invalidate(self, name=None):
+        "Record the secondary command buffer `name` (default: every command buffer) again on its next execution"
+        for entry_name, entry in self._entries.items():
+            if name is None or entry_name == name:
+                entry[1] = None
+
+    def free(self):
+        "Free the secondary command buffers. They must not be used by pending command buffers."
+        if self._entries:
+            command_buffers = (self.vk.CommandBuffer * len(self._entries))(*[entry[0].value for entry in self._entries.values()])
+            self.device_functions.FreeCommandBuffers(self.device, self.command_pool, len(command_buffers), command_buffers)
+            self._entries = {}